@@ -20,4 +20,24 @@ def glInitCreateContextNoErrorKHR():
     return extensions.hasGLExtension( _EXTENSION_NAME )
 
 
-### END AUTOGENERATED SECTION
\ No newline at end of file
+### END AUTOGENERATED SECTION
+def noErrorContextAttributes( display, attributes=() ):
+    """Attribute list for eglCreateContext requesting a no-error context when available
+
+    attributes -- other context attributes as a flat name, value, ...
+        sequence (without EGL_NONE)
+
+    Adds EGL_CONTEXT_OPENGL_NO_ERROR_KHR=EGL_TRUE if display supports
+    EGL_KHR_create_context_no_error.  GL errors are undefined behaviour
+    in such a context and glGetError reports nothing, so it only makes
+    sense for code already clean under (deferred) error checking; set
+    OpenGL.ERROR_CHECKING = False before importing OpenGL.GL to skip
+    the checks altogether.
+    """
+    from OpenGL.EGL import eglQueryString, EGL_EXTENSIONS, EGL_TRUE, EGL_NONE
+    from OpenGL._bytes import as_8_bit
+    attributes = list( attributes )
+    if as_8_bit( _EXTENSION_NAME ) in (eglQueryString( display, EGL_EXTENSIONS ) or b'').split():
+        attributes += [ EGL_CONTEXT_OPENGL_NO_ERROR_KHR, EGL_TRUE ]
+    attributes.append( EGL_NONE )
+    return (_types.EGLint * len(attributes))( *attributes )
@@ -0,0 +1,56 @@
+"""Headless rendering contexts on an EGL pbuffer
+
+Benchmarks and offline tools need a current context without a window.
+The platform has to be chosen before OpenGL.platform is imported, so run
+them with PYOPENGL_PLATFORM=egl; on Mesa without a display server also set
+EGL_PLATFORM=surfaceless (read when the display is opened, so setting it
+in os.environ before calling pbufferContext() is enough).
+"""
+import ctypes
+from OpenGL import EGL
+
+__all__ = ('pbufferContext','releasePbufferContext')
+
+def pbufferContext( width=64, height=64, api=EGL.EGL_OPENGL_API, contextAttributes=() ):
+    """Create a pbuffer surface and a context for api, make them current
+
+    contextAttributes -- flat (name, value, ...) EGL context attributes,
+        e.g. to request a version or a core profile
+
+    returns (display, surface, context)
+    """
+    display = EGL.eglGetDisplay( EGL.EGL_DEFAULT_DISPLAY )
+    major, minor = EGL.EGLint(), EGL.EGLint()
+    if not EGL.eglInitialize( display, major, minor ):
+        raise RuntimeError( 'Unable to initialise the default EGL display' )
+    renderable = {
+        EGL.EGL_OPENGL_API: EGL.EGL_OPENGL_BIT,
+        EGL.EGL_OPENGL_ES_API: EGL.EGL_OPENGL_ES2_BIT,
+    }[api]
+    attributes = (EGL.EGLint * 9)(
+        EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RENDERABLE_TYPE, renderable,
+        EGL.EGL_DEPTH_SIZE, 24,
+        EGL.EGL_NONE, EGL.EGL_NONE, EGL.EGL_NONE,
+    )
+    config, count = EGL.EGLConfig(), EGL.EGLint()
+    EGL.eglChooseConfig( display, attributes, ctypes.pointer( config ), 1, ctypes.pointer( count ))
+    if not count.value:
+        raise RuntimeError( 'No pbuffer-capable EGL config for this API' )
+    surface = EGL.eglCreatePbufferSurface(
+        display, config, (EGL.EGLint * 5)( EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE ),
+    )
+    EGL.eglBindAPI( api )
+    contextAttributes = list( contextAttributes ) + [EGL.EGL_NONE]
+    context = EGL.eglCreateContext(
+        display, config, EGL.EGL_NO_CONTEXT,
+        (EGL.EGLint * len( contextAttributes ))( *contextAttributes ),
+    )
+    EGL.eglMakeCurrent( display, surface, surface, context )
+    return display, surface, context
+
+def releasePbufferContext( display, surface, context ):
+    """Release and destroy a context made by pbufferContext"""
+    EGL.eglMakeCurrent( display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT )
+    EGL.eglDestroySurface( display, surface )
+    EGL.eglDestroyContext( display, context )
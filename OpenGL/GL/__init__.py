@@ -1,49 +1,65 @@
-"""OpenGL.GL, the core GL library and extensions to it"""
+"""OpenGL.GL, the core GL library and extensions to it
+
+Names are resolved on first access: _lazyindex.INDEX maps each name to
+the VERSION/pointers/images/... module it comes from, which is imported
+then and only then, so programs pay for the entry points they use.
+``from OpenGL.GL import *`` still binds everything, via __all__.
+"""
 # early import of our modules to prevent import loops...
 from OpenGL import error as _error
-from OpenGL.GL.VERSION.GL_1_1 import *
-from OpenGL.GL.pointers import *
-from OpenGL.GL.images import *
-
-from OpenGL.GL.exceptional import *
-
-from OpenGL.GL.glget import *
-
-from OpenGL.GL.VERSION.GL_1_2 import *
-from OpenGL.GL.VERSION.GL_1_3 import *
-from OpenGL.GL.VERSION.GL_1_4 import *
-from OpenGL.GL.VERSION.GL_1_5 import *
-from OpenGL.GL.VERSION.GL_2_0 import *
-from OpenGL.GL.VERSION.GL_2_1 import *
-from OpenGL.GL.VERSION.GL_3_0 import *
-from OpenGL.GL.VERSION.GL_3_1 import *
-from OpenGL.GL.VERSION.GL_3_2 import *
-from OpenGL.GL.VERSION.GL_3_3 import *
-from OpenGL.GL.VERSION.GL_4_0 import *
-from OpenGL.GL.VERSION.GL_4_1 import *
-from OpenGL.GL.VERSION.GL_4_2 import *
-from OpenGL.GL.VERSION.GL_4_3 import *
-from OpenGL.GL.VERSION.GL_4_4 import *
-from OpenGL.GL.VERSION.GL_4_5 import *
-from OpenGL.GL.VERSION.GL_4_6 import *
-
-from OpenGL.error import *
-GLerror = GLError
+from OpenGL import _configflags
+import importlib as _importlib
+from OpenGL.GL._lazyindex import INDEX as _INDEX
+
+_MODULE_FOR = {}
+for _module, _names in _INDEX:
+    for _name in _names.split():
+        _MODULE_FOR[_name] = _module
+del _module, _names, _name
 
 # Now the aliases...
-glRotate = glRotated
-glTranslate = glTranslated
-glLight = glLightfv
-glTexCoord = glTexCoord2d
-glScale = glScaled
-#glColor = glColor3f
-glNormal = glNormal3d
-
-glGetBoolean = glGetBooleanv
-glGetDouble = glGetDoublev
-glGetFloat = glGetFloatv
-glGetInteger = glGetIntegerv 
-glGetPolygonStippleub = glGetPolygonStipple
-
-from OpenGL.GL import vboimplementation as _core_implementation
-from OpenGL.GL.ARB import vboimplementation as _arb_implementation
+_ALIASES = {
+    'GLerror': 'GLError',
+    'glRotate': 'glRotated',
+    'glTranslate': 'glTranslated',
+    'glLight': 'glLightfv',
+    'glTexCoord': 'glTexCoord2d',
+    'glScale': 'glScaled',
+    #'glColor': 'glColor3f',
+    'glNormal': 'glNormal3d',
+
+    'glGetBoolean': 'glGetBooleanv',
+    'glGetDouble': 'glGetDoublev',
+    'glGetFloat': 'glGetFloatv',
+    'glGetInteger': 'glGetIntegerv',
+    'glGetPolygonStippleub': 'glGetPolygonStipple',
+}
+
+__all__ = sorted( list(_MODULE_FOR) + list(_ALIASES) )
+
+def __getattr__( name ):
+    """Import the module defining name (or the submodule name), bind and return it"""
+    module = _MODULE_FOR.get( name )
+    if module is not None:
+        value = getattr( _importlib.import_module( module ), name )
+    elif name in _ALIASES:
+        value = __getattr__( _ALIASES[name] )
+    else:
+        # subpackages (ARB, VERSION, images...) the eager imports used to load
+        try:
+            value = _importlib.import_module( __name__ + '.' + name )
+        except ModuleNotFoundError as err:
+            if err.name != __name__ + '.' + name:
+                raise
+            raise AttributeError( """module %r has no attribute %r"""%( __name__, name ))
+    globals()[name] = value
+    return value
+
+if _configflags.IMMEDIATE_EMULATION:
+    # glBegin/glVertex/... batched into buffer draws, see OpenGL.GL.immediate
+    for _name in _importlib.import_module( 'OpenGL.GL.immediate' ).EMULATED:
+        _MODULE_FOR[_name] = 'OpenGL.GL.immediate'
+    del _name
+
+def __dir__( ):
+    return sorted( set( globals() ) | set( __all__ ) )
@@ -0,0 +1,1233 @@
+"""Name -> defining module index for the lazily-loaded OpenGL.GL namespace
+
+OpenGL.GL used to star-import each of MODULES in turn; INDEX records, for
+every public name that sequence bound, the module it came from (the last
+one to export it) so OpenGL.GL.__getattr__ can import just that module.
+
+INDEX is generated, rebuild it with ``python -m OpenGL.GL._lazyindex``
+after changing MODULES or the modules' exports.
+"""
+MODULES = (
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+    'OpenGL.GL.VERSION.GL_1_2',
+    'OpenGL.GL.VERSION.GL_1_3',
+    'OpenGL.GL.VERSION.GL_1_4',
+    'OpenGL.GL.VERSION.GL_1_5',
+    'OpenGL.GL.VERSION.GL_2_0',
+    'OpenGL.GL.VERSION.GL_2_1',
+    'OpenGL.GL.VERSION.GL_3_0',
+    'OpenGL.GL.VERSION.GL_3_1',
+    'OpenGL.GL.VERSION.GL_3_2',
+    'OpenGL.GL.VERSION.GL_3_3',
+    'OpenGL.GL.VERSION.GL_4_0',
+    'OpenGL.GL.VERSION.GL_4_1',
+    'OpenGL.GL.VERSION.GL_4_2',
+    'OpenGL.GL.VERSION.GL_4_3',
+    'OpenGL.GL.VERSION.GL_4_4',
+    'OpenGL.GL.VERSION.GL_4_5',
+    'OpenGL.GL.VERSION.GL_4_6',
+    'OpenGL.error',
+)
+
+def build( ):
+    """Star-import MODULES in order, returning [(module, [names])] of final bindings"""
+    import importlib, types
+    owners = {}
+    for name in MODULES:
+        module = importlib.import_module( name )
+        exported = getattr( module, '__all__', None )
+        if exported is None:
+            exported = [ key for key in vars( module ) if not key.startswith( '_' ) ]
+        for key in exported:
+            # submodules are left to the import system
+            if not isinstance( getattr( module, key ), types.ModuleType ):
+                owners[key] = name
+    return [
+        (name, sorted([ key for key,owner in owners.items() if owner == name ]))
+        for name in MODULES
+    ]
+
+def _source( index ):
+    lines = [ 'INDEX = (' ]
+    for module, names in index:
+        if not names:
+            continue
+        lines.append( '    (%r, """'%( module, ) )
+        line = '       '
+        for name in names:
+            if len( line ) + len( name ) >= 79:
+                lines.append( line )
+                line = '       '
+            line += ' ' + name
+        lines.append( line )
+        lines.append( '    """),' )
+    lines.append( ')' )
+    return '\n'.join( lines ) + '\n'
+
+MARKER = '### INDEX, generated by build(), do not edit below\n'
+
+if __name__ == '__main__':
+    with open( __file__ ) as f:
+        text = f.read()
+    text = text[:text.rindex( MARKER ) + len( MARKER )] + _source( build() )
+    with open( __file__, 'w' ) as f:
+        f.write( text )
+
+### INDEX, generated by build(), do not edit below
+INDEX = (
+    ('OpenGL.GL.VERSION.GL_1_1', """
+        GL_2D GL_2_BYTES GL_3D GL_3D_COLOR GL_3D_COLOR_TEXTURE GL_3_BYTES
+        GL_4D_COLOR_TEXTURE GL_4_BYTES GL_ACCUM GL_ACCUM_ALPHA_BITS
+        GL_ACCUM_BLUE_BITS GL_ACCUM_BUFFER_BIT GL_ACCUM_CLEAR_VALUE
+        GL_ACCUM_GREEN_BITS GL_ACCUM_RED_BITS GL_ADD GL_ALL_ATTRIB_BITS
+        GL_ALPHA GL_ALPHA12 GL_ALPHA16 GL_ALPHA4 GL_ALPHA8 GL_ALPHA_BIAS
+        GL_ALPHA_BITS GL_ALPHA_SCALE GL_ALPHA_TEST GL_ALPHA_TEST_FUNC
+        GL_ALPHA_TEST_REF GL_ALWAYS GL_AMBIENT GL_AMBIENT_AND_DIFFUSE GL_AND
+        GL_AND_INVERTED GL_AND_REVERSE GL_ATTRIB_STACK_DEPTH GL_AUTO_NORMAL
+        GL_AUX0 GL_AUX1 GL_AUX2 GL_AUX3 GL_AUX_BUFFERS GL_BACK_LEFT
+        GL_BACK_RIGHT GL_BITMAP GL_BITMAP_TOKEN GL_BLEND GL_BLEND_DST
+        GL_BLEND_SRC GL_BLUE GL_BLUE_BIAS GL_BLUE_BITS GL_BLUE_SCALE GL_C3F_V3F
+        GL_C4F_N3F_V3F GL_C4UB_V2F GL_C4UB_V3F GL_CCW GL_CLAMP GL_CLEAR
+        GL_CLIENT_ALL_ATTRIB_BITS GL_CLIENT_ATTRIB_STACK_DEPTH
+        GL_CLIENT_PIXEL_STORE_BIT GL_CLIENT_VERTEX_ARRAY_BIT GL_CLIP_PLANE0
+        GL_CLIP_PLANE1 GL_CLIP_PLANE2 GL_CLIP_PLANE3 GL_CLIP_PLANE4
+        GL_CLIP_PLANE5 GL_COEFF GL_COLOR GL_COLOR_ARRAY GL_COLOR_ARRAY_POINTER
+        GL_COLOR_ARRAY_SIZE GL_COLOR_ARRAY_STRIDE GL_COLOR_ARRAY_TYPE
+        GL_COLOR_BUFFER_BIT GL_COLOR_CLEAR_VALUE GL_COLOR_INDEX
+        GL_COLOR_INDEXES GL_COLOR_LOGIC_OP GL_COLOR_MATERIAL
+        GL_COLOR_MATERIAL_FACE GL_COLOR_MATERIAL_PARAMETER GL_COLOR_WRITEMASK
+        GL_COMPILE GL_COMPILE_AND_EXECUTE GL_CONSTANT_ATTENUATION GL_COPY
+        GL_COPY_INVERTED GL_COPY_PIXEL_TOKEN GL_CULL_FACE GL_CULL_FACE_MODE
+        GL_CURRENT_BIT GL_CURRENT_COLOR GL_CURRENT_INDEX GL_CURRENT_NORMAL
+        GL_CURRENT_RASTER_COLOR GL_CURRENT_RASTER_DISTANCE
+        GL_CURRENT_RASTER_INDEX GL_CURRENT_RASTER_POSITION
+        GL_CURRENT_RASTER_POSITION_VALID GL_CURRENT_RASTER_TEXTURE_COORDS
+        GL_CURRENT_TEXTURE_COORDS GL_CW GL_DECAL GL_DECR GL_DEPTH GL_DEPTH_BIAS
+        GL_DEPTH_BITS GL_DEPTH_BUFFER GL_DEPTH_BUFFER_BIT GL_DEPTH_CLEAR_VALUE
+        GL_DEPTH_COMPONENT GL_DEPTH_FUNC GL_DEPTH_SCALE GL_DEPTH_TEST
+        GL_DEPTH_WRITEMASK GL_DIFFUSE GL_DITHER GL_DOMAIN GL_DONT_CARE
+        GL_DOUBLEBUFFER GL_DRAW_BUFFER GL_DRAW_PIXEL_TOKEN GL_DST_ALPHA
+        GL_DST_COLOR GL_EDGE_FLAG GL_EDGE_FLAG_ARRAY GL_EDGE_FLAG_ARRAY_POINTER
+        GL_EDGE_FLAG_ARRAY_STRIDE GL_EMISSION GL_ENABLE_BIT GL_EQUAL GL_EQUIV
+        GL_EVAL_BIT GL_EXP GL_EXP2 GL_EXTENSIONS GL_EYE_LINEAR GL_EYE_PLANE
+        GL_FASTEST GL_FEEDBACK GL_FEEDBACK_BUFFER_POINTER
+        GL_FEEDBACK_BUFFER_SIZE GL_FEEDBACK_BUFFER_TYPE GL_FILL GL_FLAT GL_FOG
+        GL_FOG_BIT GL_FOG_COLOR GL_FOG_DENSITY GL_FOG_END GL_FOG_HINT
+        GL_FOG_INDEX GL_FOG_MODE GL_FOG_START GL_FRONT GL_FRONT_AND_BACK
+        GL_FRONT_FACE GL_FRONT_LEFT GL_FRONT_RIGHT GL_GEQUAL GL_GREATER
+        GL_GREEN GL_GREEN_BIAS GL_GREEN_BITS GL_GREEN_SCALE GL_HINT_BIT GL_INCR
+        GL_INDEX_ARRAY GL_INDEX_ARRAY_POINTER GL_INDEX_ARRAY_STRIDE
+        GL_INDEX_ARRAY_TYPE GL_INDEX_BITS GL_INDEX_CLEAR_VALUE
+        GL_INDEX_LOGIC_OP GL_INDEX_MODE GL_INDEX_OFFSET GL_INDEX_SHIFT
+        GL_INDEX_WRITEMASK GL_INTENSITY GL_INTENSITY12 GL_INTENSITY16
+        GL_INTENSITY4 GL_INTENSITY8 GL_INVALID_ENUM GL_INVALID_OPERATION
+        GL_INVALID_VALUE GL_INVERT GL_KEEP GL_LEFT GL_LEQUAL GL_LESS GL_LIGHT0
+        GL_LIGHT1 GL_LIGHT2 GL_LIGHT3 GL_LIGHT4 GL_LIGHT5 GL_LIGHT6 GL_LIGHT7
+        GL_LIGHTING GL_LIGHTING_BIT GL_LIGHT_MODEL_AMBIENT
+        GL_LIGHT_MODEL_LOCAL_VIEWER GL_LIGHT_MODEL_TWO_SIDE GL_LINE GL_LINEAR
+        GL_LINEAR_ATTENUATION GL_LINEAR_MIPMAP_LINEAR GL_LINEAR_MIPMAP_NEAREST
+        GL_LINES GL_LINE_BIT GL_LINE_LOOP GL_LINE_RESET_TOKEN GL_LINE_SMOOTH
+        GL_LINE_SMOOTH_HINT GL_LINE_STIPPLE GL_LINE_STIPPLE_PATTERN
+        GL_LINE_STIPPLE_REPEAT GL_LINE_STRIP GL_LINE_TOKEN GL_LINE_WIDTH
+        GL_LIST_BASE GL_LIST_BIT GL_LIST_INDEX GL_LIST_MODE GL_LOAD GL_LOGIC_OP
+        GL_LOGIC_OP_MODE GL_LUMINANCE GL_LUMINANCE12 GL_LUMINANCE12_ALPHA12
+        GL_LUMINANCE12_ALPHA4 GL_LUMINANCE16 GL_LUMINANCE16_ALPHA16
+        GL_LUMINANCE4 GL_LUMINANCE4_ALPHA4 GL_LUMINANCE6_ALPHA2 GL_LUMINANCE8
+        GL_LUMINANCE8_ALPHA8 GL_LUMINANCE_ALPHA GL_MAP1_COLOR_4
+        GL_MAP1_GRID_DOMAIN GL_MAP1_GRID_SEGMENTS GL_MAP1_INDEX GL_MAP1_NORMAL
+        GL_MAP1_TEXTURE_COORD_1 GL_MAP1_TEXTURE_COORD_2 GL_MAP1_TEXTURE_COORD_3
+        GL_MAP1_TEXTURE_COORD_4 GL_MAP1_VERTEX_3 GL_MAP1_VERTEX_4
+        GL_MAP2_COLOR_4 GL_MAP2_GRID_DOMAIN GL_MAP2_GRID_SEGMENTS GL_MAP2_INDEX
+        GL_MAP2_NORMAL GL_MAP2_TEXTURE_COORD_1 GL_MAP2_TEXTURE_COORD_2
+        GL_MAP2_TEXTURE_COORD_3 GL_MAP2_TEXTURE_COORD_4 GL_MAP2_VERTEX_3
+        GL_MAP2_VERTEX_4 GL_MAP_COLOR GL_MAP_STENCIL GL_MATRIX_MODE
+        GL_MAX_ATTRIB_STACK_DEPTH GL_MAX_CLIENT_ATTRIB_STACK_DEPTH
+        GL_MAX_CLIP_PLANES GL_MAX_EVAL_ORDER GL_MAX_LIGHTS GL_MAX_LIST_NESTING
+        GL_MAX_MODELVIEW_STACK_DEPTH GL_MAX_NAME_STACK_DEPTH
+        GL_MAX_PIXEL_MAP_TABLE GL_MAX_PROJECTION_STACK_DEPTH
+        GL_MAX_TEXTURE_SIZE GL_MAX_TEXTURE_STACK_DEPTH GL_MAX_VIEWPORT_DIMS
+        GL_MODELVIEW GL_MODELVIEW0_EXT GL_MODELVIEW0_MATRIX_EXT
+        GL_MODELVIEW0_STACK_DEPTH_EXT GL_MODELVIEW_MATRIX
+        GL_MODELVIEW_STACK_DEPTH GL_MODULATE GL_MULT GL_N3F_V3F
+        GL_NAME_STACK_DEPTH GL_NAND GL_NEAREST GL_NEAREST_MIPMAP_LINEAR
+        GL_NEAREST_MIPMAP_NEAREST GL_NEVER GL_NICEST GL_NOOP GL_NOR
+        GL_NORMALIZE GL_NORMAL_ARRAY GL_NORMAL_ARRAY_POINTER
+        GL_NORMAL_ARRAY_STRIDE GL_NORMAL_ARRAY_TYPE GL_NOTEQUAL
+        GL_OBJECT_LINEAR GL_OBJECT_PLANE GL_ONE GL_ONE_MINUS_DST_ALPHA
+        GL_ONE_MINUS_DST_COLOR GL_ONE_MINUS_SRC_ALPHA GL_ONE_MINUS_SRC_COLOR
+        GL_OR GL_ORDER GL_OR_INVERTED GL_OR_REVERSE GL_OUT_OF_MEMORY
+        GL_PACK_ALIGNMENT GL_PACK_LSB_FIRST GL_PACK_ROW_LENGTH
+        GL_PACK_SKIP_PIXELS GL_PACK_SKIP_ROWS GL_PACK_SWAP_BYTES
+        GL_PASS_THROUGH_TOKEN GL_PERSPECTIVE_CORRECTION_HINT
+        GL_PIXEL_MAP_A_TO_A GL_PIXEL_MAP_A_TO_A_SIZE GL_PIXEL_MAP_B_TO_B
+        GL_PIXEL_MAP_B_TO_B_SIZE GL_PIXEL_MAP_G_TO_G GL_PIXEL_MAP_G_TO_G_SIZE
+        GL_PIXEL_MAP_I_TO_A GL_PIXEL_MAP_I_TO_A_SIZE GL_PIXEL_MAP_I_TO_B
+        GL_PIXEL_MAP_I_TO_B_SIZE GL_PIXEL_MAP_I_TO_G GL_PIXEL_MAP_I_TO_G_SIZE
+        GL_PIXEL_MAP_I_TO_I GL_PIXEL_MAP_I_TO_I_SIZE GL_PIXEL_MAP_I_TO_R
+        GL_PIXEL_MAP_I_TO_R_SIZE GL_PIXEL_MAP_R_TO_R GL_PIXEL_MAP_R_TO_R_SIZE
+        GL_PIXEL_MAP_S_TO_S GL_PIXEL_MAP_S_TO_S_SIZE GL_PIXEL_MODE_BIT GL_POINT
+        GL_POINTS GL_POINT_BIT GL_POINT_SIZE GL_POINT_SMOOTH
+        GL_POINT_SMOOTH_HINT GL_POINT_TOKEN GL_POLYGON GL_POLYGON_BIT
+        GL_POLYGON_MODE GL_POLYGON_OFFSET_FACTOR GL_POLYGON_OFFSET_FILL
+        GL_POLYGON_OFFSET_LINE GL_POLYGON_OFFSET_POINT GL_POLYGON_OFFSET_UNITS
+        GL_POLYGON_SMOOTH GL_POLYGON_SMOOTH_HINT GL_POLYGON_STIPPLE
+        GL_POLYGON_STIPPLE_BIT GL_POLYGON_TOKEN GL_POSITION GL_PROJECTION
+        GL_PROJECTION_MATRIX GL_PROJECTION_STACK_DEPTH GL_PROXY_TEXTURE_1D
+        GL_PROXY_TEXTURE_2D GL_Q GL_QUADRATIC_ATTENUATION GL_QUAD_STRIP GL_R
+        GL_R3_G3_B2 GL_READ_BUFFER GL_RED GL_RED_BIAS GL_RED_BITS GL_RED_SCALE
+        GL_RENDER GL_RENDERER GL_RENDER_MODE GL_REPEAT GL_REPLACE GL_RETURN
+        GL_RGB GL_RGB10 GL_RGB10_A2 GL_RGB12 GL_RGB16 GL_RGB4 GL_RGB5
+        GL_RGB5_A1 GL_RGB8 GL_RGBA GL_RGBA12 GL_RGBA16 GL_RGBA2 GL_RGBA4
+        GL_RGBA8 GL_RGBA_MODE GL_RIGHT GL_S GL_SCISSOR_BIT GL_SELECT
+        GL_SELECTION_BUFFER_POINTER GL_SELECTION_BUFFER_SIZE GL_SET
+        GL_SHADE_MODEL GL_SHININESS GL_SMOOTH GL_SPECULAR GL_SPHERE_MAP
+        GL_SPOT_CUTOFF GL_SPOT_DIRECTION GL_SPOT_EXPONENT GL_SRC_ALPHA
+        GL_SRC_ALPHA_SATURATE GL_SRC_COLOR GL_STENCIL GL_STENCIL_BITS
+        GL_STENCIL_BUFFER GL_STENCIL_BUFFER_BIT GL_STENCIL_CLEAR_VALUE
+        GL_STENCIL_FAIL GL_STENCIL_FUNC GL_STENCIL_PASS_DEPTH_FAIL
+        GL_STENCIL_PASS_DEPTH_PASS GL_STENCIL_REF GL_STENCIL_TEST
+        GL_STENCIL_VALUE_MASK GL_STENCIL_WRITEMASK GL_STEREO GL_SUBPIXEL_BITS
+        GL_T GL_T2F_C3F_V3F GL_T2F_C4F_N3F_V3F GL_T2F_C4UB_V3F GL_T2F_N3F_V3F
+        GL_T2F_V3F GL_T4F_C4F_N3F_V4F GL_T4F_V4F GL_TEXTURE
+        GL_TEXTURE_ALPHA_SIZE GL_TEXTURE_BIT GL_TEXTURE_BLUE_SIZE
+        GL_TEXTURE_BORDER GL_TEXTURE_BORDER_COLOR GL_TEXTURE_COMPONENTS
+        GL_TEXTURE_COORD_ARRAY GL_TEXTURE_COORD_ARRAY_POINTER
+        GL_TEXTURE_COORD_ARRAY_SIZE GL_TEXTURE_COORD_ARRAY_STRIDE
+        GL_TEXTURE_COORD_ARRAY_TYPE GL_TEXTURE_ENV GL_TEXTURE_ENV_COLOR
+        GL_TEXTURE_ENV_MODE GL_TEXTURE_GEN_MODE GL_TEXTURE_GEN_Q
+        GL_TEXTURE_GEN_R GL_TEXTURE_GEN_S GL_TEXTURE_GEN_T
+        GL_TEXTURE_GREEN_SIZE GL_TEXTURE_HEIGHT GL_TEXTURE_INTENSITY_SIZE
+        GL_TEXTURE_INTERNAL_FORMAT GL_TEXTURE_LUMINANCE_SIZE
+        GL_TEXTURE_MAG_FILTER GL_TEXTURE_MATRIX GL_TEXTURE_MIN_FILTER
+        GL_TEXTURE_PRIORITY GL_TEXTURE_RED_SIZE GL_TEXTURE_RESIDENT
+        GL_TEXTURE_STACK_DEPTH GL_TEXTURE_WIDTH GL_TEXTURE_WRAP_S
+        GL_TEXTURE_WRAP_T GL_TRANSFORM_BIT GL_TRIANGLES GL_TRIANGLE_FAN
+        GL_TRIANGLE_STRIP GL_UNPACK_ALIGNMENT GL_UNPACK_LSB_FIRST
+        GL_UNPACK_ROW_LENGTH GL_UNPACK_SKIP_PIXELS GL_UNPACK_SKIP_ROWS
+        GL_UNPACK_SWAP_BYTES GL_V2F GL_V3F GL_VENDOR GL_VERSION
+        GL_VERTEX_ARRAY_POINTER GL_VERTEX_ARRAY_SIZE GL_VERTEX_ARRAY_STRIDE
+        GL_VERTEX_ARRAY_TYPE GL_VIEWPORT_BIT GL_XOR GL_ZERO GL_ZOOM_X GL_ZOOM_Y
+        glAccum glAlphaFunc glArrayElement glBindTexture glBitmap glBlendFunc
+        glCallList glClear glClearAccum glClearColor glClearDepth glClearIndex
+        glClearStencil glClipPlane glColor3b glColor3bv glColor3d glColor3dv
+        glColor3f glColor3fv glColor3i glColor3iv glColor3s glColor3sv
+        glColor3ub glColor3ubv glColor3ui glColor3uiv glColor3us glColor3usv
+        glColor4b glColor4bv glColor4d glColor4dv glColor4f glColor4fv
+        glColor4i glColor4iv glColor4s glColor4sv glColor4ub glColor4ubv
+        glColor4ui glColor4uiv glColor4us glColor4usv glColorMask
+        glColorMaterial glCopyPixels glCopyTexImage1D glCopyTexImage2D
+        glCopyTexSubImage1D glCopyTexSubImage2D glCullFace glDeleteLists
+        glDepthFunc glDepthMask glDepthRange glDisable glDisableClientState
+        glDrawArrays glDrawBuffer glEdgeFlag glEdgeFlagv glEnable
+        glEnableClientState glEndList glEvalCoord1d glEvalCoord1dv
+        glEvalCoord1f glEvalCoord1fv glEvalCoord2d glEvalCoord2dv glEvalCoord2f
+        glEvalCoord2fv glEvalMesh1 glEvalMesh2 glEvalPoint1 glEvalPoint2
+        glFinish glFlush glFogf glFogfv glFogi glFogiv glFrontFace glFrustum
+        glGenLists glGenTextures glGetBooleanv glGetClipPlane glGetDoublev
+        glGetError glGetFloatv glGetIntegerv glGetLightfv glGetLightiv
+        glGetMapdv glGetMapfv glGetMapiv glGetMaterialfv glGetMaterialiv
+        glGetPixelMapfv glGetPixelMapuiv glGetPixelMapusv glGetPolygonStipple
+        glGetTexEnvfv glGetTexEnviv glGetTexGendv glGetTexGenfv glGetTexGeniv
+        glGetTexLevelParameterfv glGetTexLevelParameteriv glGetTexParameterfv
+        glGetTexParameteriv glHint glIndexMask glIndexd glIndexdv glIndexf
+        glIndexfv glIndexi glIndexiv glIndexs glIndexsv glIndexub glIndexubv
+        glInitGl10VERSION glInitGl11VERSION glInitNames glIsEnabled glIsList
+        glIsTexture glLightModelf glLightModelfv glLightModeli glLightModeliv
+        glLightf glLightfv glLighti glLightiv glLineStipple glLineWidth
+        glListBase glLoadIdentity glLoadMatrixd glLoadMatrixf glLoadName
+        glLogicOp glMapGrid1d glMapGrid1f glMapGrid2d glMapGrid2f glMaterialf
+        glMaterialfv glMateriali glMaterialiv glMatrixMode glMultMatrixd
+        glMultMatrixf glNewList glNormal3b glNormal3bv glNormal3d glNormal3dv
+        glNormal3f glNormal3fv glNormal3i glNormal3iv glNormal3s glNormal3sv
+        glOrtho glPassThrough glPixelMapfv glPixelMapuiv glPixelMapusv
+        glPixelStoref glPixelStorei glPixelTransferf glPixelTransferi
+        glPixelZoom glPointSize glPolygonMode glPolygonOffset glPolygonStipple
+        glPopAttrib glPopClientAttrib glPopMatrix glPopName
+        glPrioritizeTextures glPushAttrib glPushClientAttrib glPushMatrix
+        glPushName glRasterPos2d glRasterPos2dv glRasterPos2f glRasterPos2fv
+        glRasterPos2i glRasterPos2iv glRasterPos2s glRasterPos2sv glRasterPos3d
+        glRasterPos3dv glRasterPos3f glRasterPos3fv glRasterPos3i
+        glRasterPos3iv glRasterPos3s glRasterPos3sv glRasterPos4d
+        glRasterPos4dv glRasterPos4f glRasterPos4fv glRasterPos4i
+        glRasterPos4iv glRasterPos4s glRasterPos4sv glReadBuffer glRectd
+        glRectdv glRectf glRectfv glRecti glRectiv glRects glRectsv glRotated
+        glRotatef glScaled glScalef glScissor glShadeModel glStencilFunc
+        glStencilMask glStencilOp glTexCoord1d glTexCoord1dv glTexCoord1f
+        glTexCoord1fv glTexCoord1i glTexCoord1iv glTexCoord1s glTexCoord1sv
+        glTexCoord2d glTexCoord2dv glTexCoord2f glTexCoord2fv glTexCoord2i
+        glTexCoord2iv glTexCoord2s glTexCoord2sv glTexCoord3d glTexCoord3dv
+        glTexCoord3f glTexCoord3fv glTexCoord3i glTexCoord3iv glTexCoord3s
+        glTexCoord3sv glTexCoord4d glTexCoord4dv glTexCoord4f glTexCoord4fv
+        glTexCoord4i glTexCoord4iv glTexCoord4s glTexCoord4sv glTexEnvf
+        glTexEnvfv glTexEnvi glTexEnviv glTexGend glTexGendv glTexGenf
+        glTexGenfv glTexGeni glTexGeniv glTexParameterf glTexParameterfv
+        glTexParameteri glTexParameteriv glTranslated glTranslatef glVertex2d
+        glVertex2dv glVertex2f glVertex2fv glVertex2i glVertex2iv glVertex2s
+        glVertex2sv glVertex3d glVertex3dv glVertex3f glVertex3fv glVertex3i
+        glVertex3iv glVertex3s glVertex3sv glVertex4d glVertex4dv glVertex4f
+        glVertex4fv glVertex4i glVertex4iv glVertex4s glVertex4sv glViewport
+    """),
+    ('OpenGL.GL.pointers', """
+        GL_INTERLEAVED_ARRAY_POINTER glColorPointer glColorPointerb
+        glColorPointerd glColorPointerf glColorPointeri glColorPointers
+        glColorPointerub glColorPointerui glColorPointerus glDrawElements
+        glDrawElementsub glDrawElementsui glDrawElementsus glEdgeFlagPointer
+        glEdgeFlagPointerb glFeedbackBuffer glIndexPointer glIndexPointerb
+        glIndexPointerd glIndexPointerf glIndexPointeri glIndexPointers
+        glIndexPointerub glInterleavedArrays glNormalPointer glNormalPointerb
+        glNormalPointerd glNormalPointerf glNormalPointeri glNormalPointers
+        glRenderMode glSelectBuffer glTexCoordPointer glTexCoordPointerb
+        glTexCoordPointerd glTexCoordPointerf glTexCoordPointeri
+        glTexCoordPointers glVertexPointer glVertexPointerb glVertexPointerd
+        glVertexPointerf glVertexPointeri glVertexPointers
+    """),
+    ('OpenGL.GL.images', """
+        glDrawPixels glDrawPixelsb glDrawPixelsf glDrawPixelsi glDrawPixelss
+        glDrawPixelsub glDrawPixelsui glDrawPixelsus glGetTexImage
+        glGetTexImageb glGetTexImaged glGetTexImagef glGetTexImagei
+        glGetTexImages glGetTexImageub glGetTexImageui glGetTexImageus
+        glReadPixels glReadPixelsb glReadPixelsd glReadPixelsf glReadPixelsi
+        glReadPixelss glReadPixelsub glReadPixelsui glReadPixelsus glTexImage1D
+        glTexImage1Db glTexImage1Df glTexImage1Di glTexImage1Ds glTexImage1Dub
+        glTexImage1Dui glTexImage1Dus glTexImage2D glTexImage2Db glTexImage2Df
+        glTexImage2Di glTexImage2Ds glTexImage2Dub glTexImage2Dui
+        glTexImage2Dus glTexSubImage1D glTexSubImage1Db glTexSubImage1Df
+        glTexSubImage1Di glTexSubImage1Ds glTexSubImage1Dub glTexSubImage1Dui
+        glTexSubImage1Dus glTexSubImage2D glTexSubImage2Db glTexSubImage2Df
+        glTexSubImage2Di glTexSubImage2Ds glTexSubImage2Dub glTexSubImage2Dui
+        glTexSubImage2Dus
+    """),
+    ('OpenGL.GL.exceptional', """
+        glAreTexturesResident glBegin glCallLists glColor glDeleteTextures
+        glEnd glMap1d glMap1f glMap2d glMap2f glMaterial glRasterPos
+        glTexParameter glVertex
+    """),
+    ('OpenGL.GL.glget', """
+        glGetString
+    """),
+    ('OpenGL.GL.VERSION.GL_1_2', """
+        GL_ALIASED_LINE_WIDTH_RANGE GL_ALIASED_POINT_SIZE_RANGE GL_BGR GL_BGRA
+        GL_CLAMP_TO_EDGE GL_COLOR_MATRIX GL_COLOR_MATRIX_STACK_DEPTH
+        GL_COLOR_TABLE GL_COLOR_TABLE_ALPHA_SIZE GL_COLOR_TABLE_BIAS
+        GL_COLOR_TABLE_BLUE_SIZE GL_COLOR_TABLE_FORMAT
+        GL_COLOR_TABLE_GREEN_SIZE GL_COLOR_TABLE_INTENSITY_SIZE
+        GL_COLOR_TABLE_LUMINANCE_SIZE GL_COLOR_TABLE_RED_SIZE
+        GL_COLOR_TABLE_SCALE GL_COLOR_TABLE_WIDTH GL_CONSTANT_BORDER
+        GL_CONVOLUTION_1D GL_CONVOLUTION_2D GL_CONVOLUTION_BORDER_COLOR
+        GL_CONVOLUTION_BORDER_MODE GL_CONVOLUTION_FILTER_BIAS
+        GL_CONVOLUTION_FILTER_SCALE GL_CONVOLUTION_FORMAT GL_CONVOLUTION_HEIGHT
+        GL_CONVOLUTION_WIDTH GL_HISTOGRAM GL_HISTOGRAM_ALPHA_SIZE
+        GL_HISTOGRAM_BLUE_SIZE GL_HISTOGRAM_FORMAT GL_HISTOGRAM_GREEN_SIZE
+        GL_HISTOGRAM_LUMINANCE_SIZE GL_HISTOGRAM_RED_SIZE GL_HISTOGRAM_SINK
+        GL_HISTOGRAM_WIDTH GL_LIGHT_MODEL_COLOR_CONTROL
+        GL_LINE_WIDTH_GRANULARITY GL_LINE_WIDTH_RANGE GL_MAX_3D_TEXTURE_SIZE
+        GL_MAX_COLOR_MATRIX_STACK_DEPTH GL_MAX_CONVOLUTION_HEIGHT
+        GL_MAX_CONVOLUTION_WIDTH GL_MAX_ELEMENTS_INDICES
+        GL_MAX_ELEMENTS_VERTICES GL_MINMAX GL_MINMAX_FORMAT GL_MINMAX_SINK
+        GL_PACK_IMAGE_HEIGHT GL_PACK_SKIP_IMAGES GL_POINT_SIZE_GRANULARITY
+        GL_POINT_SIZE_RANGE GL_POST_COLOR_MATRIX_ALPHA_BIAS
+        GL_POST_COLOR_MATRIX_ALPHA_SCALE GL_POST_COLOR_MATRIX_BLUE_BIAS
+        GL_POST_COLOR_MATRIX_BLUE_SCALE GL_POST_COLOR_MATRIX_COLOR_TABLE
+        GL_POST_COLOR_MATRIX_GREEN_BIAS GL_POST_COLOR_MATRIX_GREEN_SCALE
+        GL_POST_COLOR_MATRIX_RED_BIAS GL_POST_COLOR_MATRIX_RED_SCALE
+        GL_POST_CONVOLUTION_ALPHA_BIAS GL_POST_CONVOLUTION_ALPHA_SCALE
+        GL_POST_CONVOLUTION_BLUE_BIAS GL_POST_CONVOLUTION_BLUE_SCALE
+        GL_POST_CONVOLUTION_COLOR_TABLE GL_POST_CONVOLUTION_GREEN_BIAS
+        GL_POST_CONVOLUTION_GREEN_SCALE GL_POST_CONVOLUTION_RED_BIAS
+        GL_POST_CONVOLUTION_RED_SCALE GL_PROXY_COLOR_TABLE GL_PROXY_HISTOGRAM
+        GL_PROXY_POST_COLOR_MATRIX_COLOR_TABLE
+        GL_PROXY_POST_CONVOLUTION_COLOR_TABLE GL_PROXY_TEXTURE_3D GL_REDUCE
+        GL_REPLICATE_BORDER GL_RESCALE_NORMAL GL_SEPARABLE_2D
+        GL_SEPARATE_SPECULAR_COLOR GL_SINGLE_COLOR
+        GL_SMOOTH_LINE_WIDTH_GRANULARITY GL_SMOOTH_LINE_WIDTH_RANGE
+        GL_SMOOTH_POINT_SIZE_GRANULARITY GL_SMOOTH_POINT_SIZE_RANGE
+        GL_TABLE_TOO_LARGE GL_TEXTURE_BASE_LEVEL GL_TEXTURE_DEPTH
+        GL_TEXTURE_MAX_LEVEL GL_TEXTURE_MAX_LOD GL_TEXTURE_MIN_LOD
+        GL_TEXTURE_WRAP_R GL_UNPACK_IMAGE_HEIGHT GL_UNPACK_SKIP_IMAGES
+        GL_UNSIGNED_BYTE_2_3_3_REV GL_UNSIGNED_BYTE_3_3_2
+        GL_UNSIGNED_INT_10_10_10_2 GL_UNSIGNED_INT_2_10_10_10_REV
+        GL_UNSIGNED_INT_8_8_8_8 GL_UNSIGNED_INT_8_8_8_8_REV
+        GL_UNSIGNED_SHORT_1_5_5_5_REV GL_UNSIGNED_SHORT_4_4_4_4
+        GL_UNSIGNED_SHORT_4_4_4_4_REV GL_UNSIGNED_SHORT_5_5_5_1
+        GL_UNSIGNED_SHORT_5_6_5 GL_UNSIGNED_SHORT_5_6_5_REV glColorSubTable
+        glColorTable glColorTableParameterfv glColorTableParameteriv
+        glConvolutionFilter1D glConvolutionFilter2D glConvolutionParameterf
+        glConvolutionParameterfv glConvolutionParameteri
+        glConvolutionParameteriv glCopyColorSubTable glCopyColorTable
+        glCopyConvolutionFilter1D glCopyConvolutionFilter2D glCopyTexSubImage3D
+        glDrawRangeElements glGetColorTable glGetColorTableParameterfv
+        glGetColorTableParameteriv glGetConvolutionFilter
+        glGetConvolutionParameterfv glGetConvolutionParameteriv glGetHistogram
+        glGetHistogramParameterfv glGetHistogramParameteriv glGetMinmax
+        glGetMinmaxParameterfv glGetMinmaxParameteriv glGetSeparableFilter
+        glHistogram glInitGl12VERSION glInitImagingARB glMinmax
+        glResetHistogram glResetMinmax glSeparableFilter2D glTexImage3D
+        glTexImage3Db glTexImage3Df glTexImage3Di glTexImage3Ds glTexImage3Dub
+        glTexImage3Dui glTexImage3Dus glTexSubImage3D glTexSubImage3Db
+        glTexSubImage3Df glTexSubImage3Di glTexSubImage3Ds glTexSubImage3Dub
+        glTexSubImage3Dui glTexSubImage3Dus
+    """),
+    ('OpenGL.GL.VERSION.GL_1_3', """
+        GL_ACTIVE_TEXTURE GL_ADD_SIGNED GL_CLAMP_TO_BORDER
+        GL_CLIENT_ACTIVE_TEXTURE GL_COMBINE GL_COMBINE_ALPHA GL_COMBINE_RGB
+        GL_COMPRESSED_ALPHA GL_COMPRESSED_INTENSITY GL_COMPRESSED_LUMINANCE
+        GL_COMPRESSED_LUMINANCE_ALPHA GL_COMPRESSED_RGB GL_COMPRESSED_RGBA
+        GL_COMPRESSED_TEXTURE_FORMATS GL_CONSTANT GL_DOT3_RGB GL_DOT3_RGBA
+        GL_INTERPOLATE GL_MAX_CUBE_MAP_TEXTURE_SIZE GL_MAX_TEXTURE_UNITS
+        GL_MULTISAMPLE GL_MULTISAMPLE_BIT GL_NORMAL_MAP
+        GL_NUM_COMPRESSED_TEXTURE_FORMATS GL_OPERAND0_ALPHA GL_OPERAND0_RGB
+        GL_OPERAND1_ALPHA GL_OPERAND1_RGB GL_OPERAND2_ALPHA GL_OPERAND2_RGB
+        GL_PREVIOUS GL_PRIMARY_COLOR GL_PROXY_TEXTURE_CUBE_MAP
+        GL_REFLECTION_MAP GL_RGB_SCALE GL_SAMPLE_ALPHA_TO_COVERAGE
+        GL_SAMPLE_ALPHA_TO_ONE GL_SAMPLE_BUFFERS GL_SAMPLE_COVERAGE
+        GL_SAMPLE_COVERAGE_INVERT GL_SAMPLE_COVERAGE_VALUE GL_SOURCE0_ALPHA
+        GL_SOURCE0_RGB GL_SOURCE1_ALPHA GL_SOURCE1_RGB GL_SOURCE2_ALPHA
+        GL_SOURCE2_RGB GL_SUBTRACT GL_TEXTURE0 GL_TEXTURE1 GL_TEXTURE10
+        GL_TEXTURE11 GL_TEXTURE12 GL_TEXTURE13 GL_TEXTURE14 GL_TEXTURE15
+        GL_TEXTURE16 GL_TEXTURE17 GL_TEXTURE18 GL_TEXTURE19 GL_TEXTURE2
+        GL_TEXTURE20 GL_TEXTURE21 GL_TEXTURE22 GL_TEXTURE23 GL_TEXTURE24
+        GL_TEXTURE25 GL_TEXTURE26 GL_TEXTURE27 GL_TEXTURE28 GL_TEXTURE29
+        GL_TEXTURE3 GL_TEXTURE30 GL_TEXTURE31 GL_TEXTURE4 GL_TEXTURE5
+        GL_TEXTURE6 GL_TEXTURE7 GL_TEXTURE8 GL_TEXTURE9
+        GL_TEXTURE_COMPRESSED_IMAGE_SIZE GL_TEXTURE_COMPRESSION_HINT
+        GL_TEXTURE_CUBE_MAP_NEGATIVE_X GL_TEXTURE_CUBE_MAP_NEGATIVE_Y
+        GL_TEXTURE_CUBE_MAP_NEGATIVE_Z GL_TEXTURE_CUBE_MAP_POSITIVE_X
+        GL_TEXTURE_CUBE_MAP_POSITIVE_Y GL_TEXTURE_CUBE_MAP_POSITIVE_Z
+        GL_TRANSPOSE_COLOR_MATRIX GL_TRANSPOSE_MODELVIEW_MATRIX
+        GL_TRANSPOSE_PROJECTION_MATRIX GL_TRANSPOSE_TEXTURE_MATRIX
+        glActiveTexture glClientActiveTexture glCompressedTexImage1D
+        glCompressedTexImage2D glCompressedTexImage3D glCompressedTexSubImage1D
+        glCompressedTexSubImage2D glCompressedTexSubImage3D
+        glGetCompressedTexImage glInitGl13VERSION glLoadTransposeMatrixd
+        glLoadTransposeMatrixf glMultTransposeMatrixd glMultTransposeMatrixf
+        glMultiTexCoord1d glMultiTexCoord1dv glMultiTexCoord1f
+        glMultiTexCoord1fv glMultiTexCoord1i glMultiTexCoord1iv
+        glMultiTexCoord1s glMultiTexCoord1sv glMultiTexCoord2d
+        glMultiTexCoord2dv glMultiTexCoord2f glMultiTexCoord2fv
+        glMultiTexCoord2i glMultiTexCoord2iv glMultiTexCoord2s
+        glMultiTexCoord2sv glMultiTexCoord3d glMultiTexCoord3dv
+        glMultiTexCoord3f glMultiTexCoord3fv glMultiTexCoord3i
+        glMultiTexCoord3iv glMultiTexCoord3s glMultiTexCoord3sv
+        glMultiTexCoord4d glMultiTexCoord4dv glMultiTexCoord4f
+        glMultiTexCoord4fv glMultiTexCoord4i glMultiTexCoord4iv
+        glMultiTexCoord4s glMultiTexCoord4sv glSampleCoverage
+    """),
+    ('OpenGL.GL.VERSION.GL_1_4', """
+        GL_BLEND_COLOR GL_BLEND_DST_ALPHA GL_BLEND_DST_RGB GL_BLEND_EQUATION
+        GL_BLEND_SRC_ALPHA GL_BLEND_SRC_RGB GL_COLOR_SUM
+        GL_COMPARE_R_TO_TEXTURE GL_CONSTANT_ALPHA GL_CONSTANT_COLOR
+        GL_CURRENT_FOG_COORDINATE GL_CURRENT_SECONDARY_COLOR GL_DECR_WRAP
+        GL_DEPTH_COMPONENT16 GL_DEPTH_COMPONENT24 GL_DEPTH_COMPONENT32
+        GL_DEPTH_TEXTURE_MODE GL_FOG_COORDINATE GL_FOG_COORDINATE_ARRAY
+        GL_FOG_COORDINATE_ARRAY_POINTER GL_FOG_COORDINATE_ARRAY_STRIDE
+        GL_FOG_COORDINATE_ARRAY_TYPE GL_FOG_COORDINATE_SOURCE GL_FRAGMENT_DEPTH
+        GL_FUNC_ADD GL_FUNC_REVERSE_SUBTRACT GL_FUNC_SUBTRACT
+        GL_GENERATE_MIPMAP GL_GENERATE_MIPMAP_HINT GL_INCR_WRAP GL_MAX
+        GL_MAX_TEXTURE_LOD_BIAS GL_MIN GL_MIRRORED_REPEAT
+        GL_ONE_MINUS_CONSTANT_ALPHA GL_ONE_MINUS_CONSTANT_COLOR
+        GL_POINT_DISTANCE_ATTENUATION GL_POINT_FADE_THRESHOLD_SIZE
+        GL_POINT_SIZE_MAX GL_POINT_SIZE_MIN GL_SECONDARY_COLOR_ARRAY
+        GL_SECONDARY_COLOR_ARRAY_POINTER GL_SECONDARY_COLOR_ARRAY_SIZE
+        GL_SECONDARY_COLOR_ARRAY_STRIDE GL_SECONDARY_COLOR_ARRAY_TYPE
+        GL_TEXTURE_COMPARE_FUNC GL_TEXTURE_COMPARE_MODE GL_TEXTURE_DEPTH_SIZE
+        GL_TEXTURE_FILTER_CONTROL GL_TEXTURE_LOD_BIAS glBlendColor
+        glBlendEquation glBlendFuncSeparate glFogCoordPointer glFogCoordd
+        glFogCoorddv glFogCoordf glFogCoordfv glInitGl14VERSION
+        glMultiDrawArrays glMultiDrawElements glPointParameterf
+        glPointParameterfv glPointParameteri glPointParameteriv
+        glSecondaryColor3b glSecondaryColor3bv glSecondaryColor3d
+        glSecondaryColor3dv glSecondaryColor3f glSecondaryColor3fv
+        glSecondaryColor3i glSecondaryColor3iv glSecondaryColor3s
+        glSecondaryColor3sv glSecondaryColor3ub glSecondaryColor3ubv
+        glSecondaryColor3ui glSecondaryColor3uiv glSecondaryColor3us
+        glSecondaryColor3usv glSecondaryColorPointer glWindowPos2d
+        glWindowPos2dv glWindowPos2f glWindowPos2fv glWindowPos2i
+        glWindowPos2iv glWindowPos2s glWindowPos2sv glWindowPos3d
+        glWindowPos3dv glWindowPos3f glWindowPos3fv glWindowPos3i
+        glWindowPos3iv glWindowPos3s glWindowPos3sv
+    """),
+    ('OpenGL.GL.VERSION.GL_1_5', """
+        GL_ARRAY_BUFFER GL_ARRAY_BUFFER_BINDING GL_BUFFER_ACCESS
+        GL_BUFFER_MAPPED GL_BUFFER_MAP_POINTER GL_BUFFER_SIZE GL_BUFFER_USAGE
+        GL_COLOR_ARRAY_BUFFER_BINDING GL_CURRENT_FOG_COORD GL_CURRENT_QUERY
+        GL_DYNAMIC_COPY GL_DYNAMIC_DRAW GL_DYNAMIC_READ
+        GL_EDGE_FLAG_ARRAY_BUFFER_BINDING GL_ELEMENT_ARRAY_BUFFER
+        GL_ELEMENT_ARRAY_BUFFER_BINDING GL_FOG_COORD
+        GL_FOG_COORDINATE_ARRAY_BUFFER_BINDING GL_FOG_COORD_ARRAY
+        GL_FOG_COORD_ARRAY_BUFFER_BINDING GL_FOG_COORD_ARRAY_POINTER
+        GL_FOG_COORD_ARRAY_STRIDE GL_FOG_COORD_ARRAY_TYPE GL_FOG_COORD_SRC
+        GL_INDEX_ARRAY_BUFFER_BINDING GL_NORMAL_ARRAY_BUFFER_BINDING
+        GL_QUERY_COUNTER_BITS GL_QUERY_RESULT GL_QUERY_RESULT_AVAILABLE
+        GL_READ_ONLY GL_READ_WRITE GL_SAMPLES_PASSED
+        GL_SECONDARY_COLOR_ARRAY_BUFFER_BINDING GL_SRC0_ALPHA GL_SRC0_RGB
+        GL_SRC1_ALPHA GL_SRC1_RGB GL_SRC2_ALPHA GL_SRC2_RGB GL_STATIC_COPY
+        GL_STATIC_DRAW GL_STATIC_READ GL_STREAM_COPY GL_STREAM_DRAW
+        GL_STREAM_READ GL_TEXTURE_COORD_ARRAY_BUFFER_BINDING
+        GL_VERTEX_ARRAY_BUFFER_BINDING GL_VERTEX_ATTRIB_ARRAY_BUFFER_BINDING
+        GL_WEIGHT_ARRAY_BUFFER_BINDING GL_WRITE_ONLY glBeginQuery glBindBuffer
+        glBufferData glBufferSubData glDeleteBuffers glDeleteQueries glEndQuery
+        glGenBuffers glGenQueries glGetBufferParameteriv glGetBufferPointerv
+        glGetBufferSubData glGetQueryObjectiv glGetQueryObjectuiv glGetQueryiv
+        glInitGl15VERSION glIsBuffer glIsQuery glMapBuffer glUnmapBuffer
+        integer_types
+    """),
+    ('OpenGL.GL.VERSION.GL_2_0', """
+        ArrayDatatype GL_ACTIVE_ATTRIBUTES GL_ACTIVE_ATTRIBUTE_MAX_LENGTH
+        GL_ACTIVE_UNIFORMS GL_ACTIVE_UNIFORM_MAX_LENGTH GL_ATTACHED_SHADERS
+        GL_BLEND_EQUATION_ALPHA GL_BLEND_EQUATION_RGB GL_BOOL GL_BOOL_VEC2
+        GL_BOOL_VEC3 GL_BOOL_VEC4 GL_COMPILE_STATUS GL_COORD_REPLACE
+        GL_CURRENT_PROGRAM GL_CURRENT_VERTEX_ATTRIB GL_DELETE_STATUS
+        GL_DRAW_BUFFER0 GL_DRAW_BUFFER1 GL_DRAW_BUFFER10 GL_DRAW_BUFFER11
+        GL_DRAW_BUFFER12 GL_DRAW_BUFFER13 GL_DRAW_BUFFER14 GL_DRAW_BUFFER15
+        GL_DRAW_BUFFER2 GL_DRAW_BUFFER3 GL_DRAW_BUFFER4 GL_DRAW_BUFFER5
+        GL_DRAW_BUFFER6 GL_DRAW_BUFFER7 GL_DRAW_BUFFER8 GL_DRAW_BUFFER9
+        GL_FLOAT_MAT2 GL_FLOAT_MAT3 GL_FLOAT_MAT4 GL_FLOAT_VEC2 GL_FLOAT_VEC3
+        GL_FLOAT_VEC4 GL_FRAGMENT_SHADER GL_FRAGMENT_SHADER_DERIVATIVE_HINT
+        GL_INFO_LOG_LENGTH GL_INT_VEC2 GL_INT_VEC3 GL_INT_VEC4 GL_LINK_STATUS
+        GL_MAX_COMBINED_TEXTURE_IMAGE_UNITS GL_MAX_DRAW_BUFFERS
+        GL_MAX_FRAGMENT_UNIFORM_COMPONENTS GL_MAX_TEXTURE_COORDS
+        GL_MAX_TEXTURE_IMAGE_UNITS GL_MAX_VARYING_FLOATS GL_MAX_VERTEX_ATTRIBS
+        GL_MAX_VERTEX_TEXTURE_IMAGE_UNITS GL_MAX_VERTEX_UNIFORM_COMPONENTS
+        GL_OBJECT_ACTIVE_UNIFORMS GL_OBJECT_ACTIVE_UNIFORM_MAX_LENGTH
+        GL_OBJECT_COMPILE_STATUS GL_OBJECT_LINK_STATUS GL_POINT_SPRITE
+        GL_POINT_SPRITE_COORD_ORIGIN GL_SAMPLER_1D GL_SAMPLER_1D_SHADOW
+        GL_SAMPLER_2D GL_SAMPLER_2D_SHADOW GL_SAMPLER_3D GL_SAMPLER_CUBE
+        GL_SHADER_SOURCE_LENGTH GL_SHADER_TYPE GL_SHADING_LANGUAGE_VERSION
+        GL_STENCIL_BACK_FAIL GL_STENCIL_BACK_FUNC
+        GL_STENCIL_BACK_PASS_DEPTH_FAIL GL_STENCIL_BACK_PASS_DEPTH_PASS
+        GL_STENCIL_BACK_REF GL_STENCIL_BACK_VALUE_MASK
+        GL_STENCIL_BACK_WRITEMASK GL_VALIDATE_STATUS
+        GL_VERTEX_ATTRIB_ARRAY_ENABLED GL_VERTEX_ATTRIB_ARRAY_NORMALIZED
+        GL_VERTEX_ATTRIB_ARRAY_POINTER GL_VERTEX_ATTRIB_ARRAY_SIZE
+        GL_VERTEX_ATTRIB_ARRAY_STRIDE GL_VERTEX_ATTRIB_ARRAY_TYPE
+        GL_VERTEX_PROGRAM_POINT_SIZE GL_VERTEX_PROGRAM_TWO_SIDE
+        GL_VERTEX_SHADER GLenumArray glAttachShader glBindAttribLocation
+        glBlendEquationSeparate glCompileShader glCreateProgram glCreateShader
+        glDeleteProgram glDeleteShader glDetachShader
+        glDisableVertexAttribArray glDrawBuffers glEnableVertexAttribArray
+        glGetActiveAttrib glGetActiveUniform glGetAttachedShaders
+        glGetAttribLocation glGetProgramInfoLog glGetProgramiv
+        glGetShaderInfoLog glGetShaderSource glGetShaderiv glGetUniformLocation
+        glGetUniformfv glGetUniformiv glGetVertexAttribPointerv
+        glGetVertexAttribdv glGetVertexAttribfv glGetVertexAttribiv
+        glInitGl20VERSION glIsProgram glIsShader glLinkProgram glShaderSource
+        glStencilFuncSeparate glStencilMaskSeparate glStencilOpSeparate
+        glUniform1f glUniform1fv glUniform1i glUniform1iv glUniform2f
+        glUniform2fv glUniform2i glUniform2iv glUniform3f glUniform3fv
+        glUniform3i glUniform3iv glUniform4f glUniform4fv glUniform4i
+        glUniform4iv glUniformMatrix2fv glUniformMatrix3fv glUniformMatrix4fv
+        glUseProgram glValidateProgram glVertexAttrib1d glVertexAttrib1dv
+        glVertexAttrib1f glVertexAttrib1fv glVertexAttrib1s glVertexAttrib1sv
+        glVertexAttrib2d glVertexAttrib2dv glVertexAttrib2f glVertexAttrib2fv
+        glVertexAttrib2s glVertexAttrib2sv glVertexAttrib3d glVertexAttrib3dv
+        glVertexAttrib3f glVertexAttrib3fv glVertexAttrib3s glVertexAttrib3sv
+        glVertexAttrib4Nbv glVertexAttrib4Niv glVertexAttrib4Nsv
+        glVertexAttrib4Nub glVertexAttrib4Nubv glVertexAttrib4Nuiv
+        glVertexAttrib4Nusv glVertexAttrib4bv glVertexAttrib4d
+        glVertexAttrib4dv glVertexAttrib4f glVertexAttrib4fv glVertexAttrib4iv
+        glVertexAttrib4s glVertexAttrib4sv glVertexAttrib4ubv
+        glVertexAttrib4uiv glVertexAttrib4usv glVertexAttribPointer
+    """),
+    ('OpenGL.GL.VERSION.GL_2_1', """
+        GL_COMPRESSED_SLUMINANCE GL_COMPRESSED_SLUMINANCE_ALPHA
+        GL_COMPRESSED_SRGB GL_COMPRESSED_SRGB_ALPHA
+        GL_CURRENT_RASTER_SECONDARY_COLOR GL_FLOAT_MAT2x3 GL_FLOAT_MAT2x4
+        GL_FLOAT_MAT3x2 GL_FLOAT_MAT3x4 GL_FLOAT_MAT4x2 GL_FLOAT_MAT4x3
+        GL_PIXEL_PACK_BUFFER GL_PIXEL_PACK_BUFFER_BINDING
+        GL_PIXEL_UNPACK_BUFFER GL_PIXEL_UNPACK_BUFFER_BINDING GL_SLUMINANCE
+        GL_SLUMINANCE8 GL_SLUMINANCE8_ALPHA8 GL_SLUMINANCE_ALPHA GL_SRGB
+        GL_SRGB8 GL_SRGB8_ALPHA8 GL_SRGB_ALPHA glInitGl21VERSION
+        glUniformMatrix2x3fv glUniformMatrix2x4fv glUniformMatrix3x2fv
+        glUniformMatrix3x4fv glUniformMatrix4x2fv glUniformMatrix4x3fv
+    """),
+    ('OpenGL.GL.VERSION.GL_3_0', """
+        GL_ALPHA_INTEGER GL_BGRA_INTEGER GL_BGR_INTEGER GL_BLUE_INTEGER
+        GL_BUFFER_ACCESS_FLAGS GL_BUFFER_MAP_LENGTH GL_BUFFER_MAP_OFFSET
+        GL_CLAMP_FRAGMENT_COLOR GL_CLAMP_READ_COLOR GL_CLAMP_VERTEX_COLOR
+        GL_CLIP_DISTANCE0 GL_CLIP_DISTANCE1 GL_CLIP_DISTANCE2 GL_CLIP_DISTANCE3
+        GL_CLIP_DISTANCE4 GL_CLIP_DISTANCE5 GL_CLIP_DISTANCE6 GL_CLIP_DISTANCE7
+        GL_COLOR_ATTACHMENT0 GL_COLOR_ATTACHMENT1 GL_COLOR_ATTACHMENT10
+        GL_COLOR_ATTACHMENT11 GL_COLOR_ATTACHMENT12 GL_COLOR_ATTACHMENT13
+        GL_COLOR_ATTACHMENT14 GL_COLOR_ATTACHMENT15 GL_COLOR_ATTACHMENT16
+        GL_COLOR_ATTACHMENT17 GL_COLOR_ATTACHMENT18 GL_COLOR_ATTACHMENT19
+        GL_COLOR_ATTACHMENT2 GL_COLOR_ATTACHMENT20 GL_COLOR_ATTACHMENT21
+        GL_COLOR_ATTACHMENT22 GL_COLOR_ATTACHMENT23 GL_COLOR_ATTACHMENT24
+        GL_COLOR_ATTACHMENT25 GL_COLOR_ATTACHMENT26 GL_COLOR_ATTACHMENT27
+        GL_COLOR_ATTACHMENT28 GL_COLOR_ATTACHMENT29 GL_COLOR_ATTACHMENT3
+        GL_COLOR_ATTACHMENT30 GL_COLOR_ATTACHMENT31 GL_COLOR_ATTACHMENT4
+        GL_COLOR_ATTACHMENT5 GL_COLOR_ATTACHMENT6 GL_COLOR_ATTACHMENT7
+        GL_COLOR_ATTACHMENT8 GL_COLOR_ATTACHMENT9 GL_COMPARE_REF_TO_TEXTURE
+        GL_COMPRESSED_RED GL_COMPRESSED_RED_RGTC1 GL_COMPRESSED_RG
+        GL_COMPRESSED_RG_RGTC2 GL_COMPRESSED_SIGNED_RED_RGTC1
+        GL_COMPRESSED_SIGNED_RG_RGTC2 GL_CONTEXT_FLAGS
+        GL_CONTEXT_FLAG_FORWARD_COMPATIBLE_BIT GL_DEPTH24_STENCIL8
+        GL_DEPTH32F_STENCIL8 GL_DEPTH_ATTACHMENT GL_DEPTH_COMPONENT32F
+        GL_DEPTH_STENCIL GL_DEPTH_STENCIL_ATTACHMENT GL_DRAW_FRAMEBUFFER
+        GL_DRAW_FRAMEBUFFER_BINDING GL_FIXED_ONLY
+        GL_FLOAT_32_UNSIGNED_INT_24_8_REV GL_FRAMEBUFFER
+        GL_FRAMEBUFFER_ATTACHMENT_ALPHA_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_BLUE_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_COLOR_ENCODING
+        GL_FRAMEBUFFER_ATTACHMENT_COMPONENT_TYPE
+        GL_FRAMEBUFFER_ATTACHMENT_DEPTH_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_GREEN_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_OBJECT_NAME
+        GL_FRAMEBUFFER_ATTACHMENT_OBJECT_TYPE
+        GL_FRAMEBUFFER_ATTACHMENT_RED_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_STENCIL_SIZE
+        GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_CUBE_MAP_FACE
+        GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_LAYER
+        GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_LEVEL GL_FRAMEBUFFER_BINDING
+        GL_FRAMEBUFFER_COMPLETE GL_FRAMEBUFFER_DEFAULT
+        GL_FRAMEBUFFER_INCOMPLETE_ATTACHMENT
+        GL_FRAMEBUFFER_INCOMPLETE_DRAW_BUFFER
+        GL_FRAMEBUFFER_INCOMPLETE_MISSING_ATTACHMENT
+        GL_FRAMEBUFFER_INCOMPLETE_MULTISAMPLE
+        GL_FRAMEBUFFER_INCOMPLETE_READ_BUFFER GL_FRAMEBUFFER_SRGB
+        GL_FRAMEBUFFER_UNDEFINED GL_FRAMEBUFFER_UNSUPPORTED GL_GREEN_INTEGER
+        GL_INDEX GL_INTERLEAVED_ATTRIBS GL_INT_SAMPLER_1D
+        GL_INT_SAMPLER_1D_ARRAY GL_INT_SAMPLER_2D GL_INT_SAMPLER_2D_ARRAY
+        GL_INT_SAMPLER_3D GL_INT_SAMPLER_CUBE GL_INVALID_FRAMEBUFFER_OPERATION
+        GL_MAJOR_VERSION GL_MAP_FLUSH_EXPLICIT_BIT GL_MAP_INVALIDATE_BUFFER_BIT
+        GL_MAP_INVALIDATE_RANGE_BIT GL_MAP_UNSYNCHRONIZED_BIT
+        GL_MAX_ARRAY_TEXTURE_LAYERS GL_MAX_CLIP_DISTANCES
+        GL_MAX_COLOR_ATTACHMENTS GL_MAX_PROGRAM_TEXEL_OFFSET
+        GL_MAX_RENDERBUFFER_SIZE GL_MAX_SAMPLES
+        GL_MAX_TRANSFORM_FEEDBACK_INTERLEAVED_COMPONENTS
+        GL_MAX_TRANSFORM_FEEDBACK_SEPARATE_ATTRIBS
+        GL_MAX_TRANSFORM_FEEDBACK_SEPARATE_COMPONENTS GL_MAX_VARYING_COMPONENTS
+        GL_MINOR_VERSION GL_MIN_PROGRAM_TEXEL_OFFSET GL_NUM_EXTENSIONS
+        GL_PRIMITIVES_GENERATED GL_PROXY_TEXTURE_1D_ARRAY
+        GL_PROXY_TEXTURE_2D_ARRAY GL_QUERY_BY_REGION_NO_WAIT
+        GL_QUERY_BY_REGION_WAIT GL_QUERY_NO_WAIT GL_QUERY_WAIT
+        GL_R11F_G11F_B10F GL_R16 GL_R16F GL_R16I GL_R16UI GL_R32F GL_R32I
+        GL_R32UI GL_R8 GL_R8I GL_R8UI GL_RASTERIZER_DISCARD GL_READ_FRAMEBUFFER
+        GL_READ_FRAMEBUFFER_BINDING GL_RED_INTEGER GL_RENDERBUFFER_ALPHA_SIZE
+        GL_RENDERBUFFER_BINDING GL_RENDERBUFFER_BLUE_SIZE
+        GL_RENDERBUFFER_DEPTH_SIZE GL_RENDERBUFFER_GREEN_SIZE
+        GL_RENDERBUFFER_HEIGHT GL_RENDERBUFFER_INTERNAL_FORMAT
+        GL_RENDERBUFFER_RED_SIZE GL_RENDERBUFFER_SAMPLES
+        GL_RENDERBUFFER_STENCIL_SIZE GL_RENDERBUFFER_WIDTH GL_RG GL_RG16
+        GL_RG16F GL_RG16I GL_RG16UI GL_RG32F GL_RG32I GL_RG32UI GL_RG8 GL_RG8I
+        GL_RG8UI GL_RGB16F GL_RGB16I GL_RGB16UI GL_RGB32F GL_RGB32UI GL_RGB8I
+        GL_RGB8UI GL_RGB9_E5 GL_RGBA16F GL_RGBA16I GL_RGBA16UI GL_RGBA32F
+        GL_RGBA32I GL_RGBA32UI GL_RGBA8I GL_RGBA8UI GL_RGBA_INTEGER
+        GL_RGB_INTEGER GL_RG_INTEGER GL_SAMPLER_1D_ARRAY
+        GL_SAMPLER_1D_ARRAY_SHADOW GL_SAMPLER_2D_ARRAY
+        GL_SAMPLER_2D_ARRAY_SHADOW GL_SAMPLER_CUBE_SHADOW GL_SEPARATE_ATTRIBS
+        GL_STENCIL_ATTACHMENT GL_STENCIL_INDEX1 GL_STENCIL_INDEX16
+        GL_STENCIL_INDEX4 GL_TEXTURE_ALPHA_TYPE GL_TEXTURE_BLUE_TYPE
+        GL_TEXTURE_DEPTH_TYPE GL_TEXTURE_GREEN_TYPE GL_TEXTURE_INTENSITY_TYPE
+        GL_TEXTURE_LUMINANCE_TYPE GL_TEXTURE_RED_TYPE GL_TEXTURE_SHARED_SIZE
+        GL_TEXTURE_STENCIL_SIZE GL_TRANSFORM_FEEDBACK_BUFFER_BINDING
+        GL_TRANSFORM_FEEDBACK_BUFFER_MODE GL_TRANSFORM_FEEDBACK_BUFFER_SIZE
+        GL_TRANSFORM_FEEDBACK_BUFFER_START
+        GL_TRANSFORM_FEEDBACK_PRIMITIVES_WRITTEN GL_TRANSFORM_FEEDBACK_VARYINGS
+        GL_TRANSFORM_FEEDBACK_VARYING_MAX_LENGTH GL_UNSIGNED_INT_24_8
+        GL_UNSIGNED_INT_5_9_9_9_REV GL_UNSIGNED_INT_SAMPLER_1D
+        GL_UNSIGNED_INT_SAMPLER_1D_ARRAY GL_UNSIGNED_INT_SAMPLER_2D
+        GL_UNSIGNED_INT_SAMPLER_2D_ARRAY GL_UNSIGNED_INT_SAMPLER_3D
+        GL_UNSIGNED_INT_SAMPLER_CUBE GL_UNSIGNED_INT_VEC2 GL_UNSIGNED_INT_VEC3
+        GL_UNSIGNED_INT_VEC4 GL_UNSIGNED_NORMALIZED GL_VERTEX_ARRAY_BINDING
+        GL_VERTEX_ATTRIB_ARRAY_INTEGER c_char_p glBeginConditionalRender
+        glBeginTransformFeedback glBindFragDataLocation glBindFramebuffer
+        glBindRenderbuffer glBindVertexArray glBlitFramebuffer
+        glCheckFramebufferStatus glClampColor glClearBufferfi glClearBufferfv
+        glClearBufferiv glClearBufferuiv glColorMaski glDeleteFramebuffers
+        glDeleteRenderbuffers glDeleteVertexArrays glDisablei glEnablei
+        glEndConditionalRender glEndTransformFeedback glFlushMappedBufferRange
+        glFramebufferRenderbuffer glFramebufferTexture1D glFramebufferTexture2D
+        glFramebufferTexture3D glFramebufferTextureLayer glGenFramebuffers
+        glGenRenderbuffers glGenVertexArrays glGenerateMipmap glGetBooleani_v
+        glGetFragDataLocation glGetFramebufferAttachmentParameteriv
+        glGetRenderbufferParameteriv glGetStringi glGetTexParameterIiv
+        glGetTexParameterIuiv glGetTransformFeedbackVarying glGetUniformuiv
+        glGetVertexAttribIiv glGetVertexAttribIuiv glInitGl30VERSION
+        glIsEnabledi glIsFramebuffer glIsRenderbuffer glIsVertexArray
+        glMapBufferRange glRenderbufferStorage glRenderbufferStorageMultisample
+        glTexParameterIiv glTexParameterIuiv glTransformFeedbackVaryings
+        glUniform1ui glUniform1uiv glUniform2ui glUniform2uiv glUniform3ui
+        glUniform3uiv glUniform4ui glUniform4uiv glVertexAttribI1i
+        glVertexAttribI1iv glVertexAttribI1ui glVertexAttribI1uiv
+        glVertexAttribI2i glVertexAttribI2iv glVertexAttribI2ui
+        glVertexAttribI2uiv glVertexAttribI3i glVertexAttribI3iv
+        glVertexAttribI3ui glVertexAttribI3uiv glVertexAttribI4bv
+        glVertexAttribI4i glVertexAttribI4iv glVertexAttribI4sv
+        glVertexAttribI4ubv glVertexAttribI4ui glVertexAttribI4uiv
+        glVertexAttribI4usv glVertexAttribIPointer
+    """),
+    ('OpenGL.GL.VERSION.GL_3_1', """
+        GL_ACTIVE_UNIFORM_BLOCKS GL_ACTIVE_UNIFORM_BLOCK_MAX_NAME_LENGTH
+        GL_COPY_READ_BUFFER GL_COPY_WRITE_BUFFER GL_INT_SAMPLER_2D_RECT
+        GL_INT_SAMPLER_BUFFER GL_INVALID_INDEX
+        GL_MAX_COMBINED_FRAGMENT_UNIFORM_COMPONENTS
+        GL_MAX_COMBINED_GEOMETRY_UNIFORM_COMPONENTS
+        GL_MAX_COMBINED_UNIFORM_BLOCKS
+        GL_MAX_COMBINED_VERTEX_UNIFORM_COMPONENTS
+        GL_MAX_FRAGMENT_UNIFORM_BLOCKS GL_MAX_GEOMETRY_UNIFORM_BLOCKS
+        GL_MAX_RECTANGLE_TEXTURE_SIZE GL_MAX_TEXTURE_BUFFER_SIZE
+        GL_MAX_UNIFORM_BLOCK_SIZE GL_MAX_UNIFORM_BUFFER_BINDINGS
+        GL_MAX_VERTEX_UNIFORM_BLOCKS GL_PRIMITIVE_RESTART
+        GL_PRIMITIVE_RESTART_INDEX GL_PROXY_TEXTURE_RECTANGLE GL_R16_SNORM
+        GL_R8_SNORM GL_RG16_SNORM GL_RG8_SNORM GL_RGB16_SNORM GL_RGB8_SNORM
+        GL_RGBA16_SNORM GL_RGBA8_SNORM GL_SAMPLER_2D_RECT
+        GL_SAMPLER_2D_RECT_SHADOW GL_SAMPLER_BUFFER GL_SIGNED_NORMALIZED
+        GL_TEXTURE_BUFFER_DATA_STORE_BINDING GL_UNIFORM_ARRAY_STRIDE
+        GL_UNIFORM_BLOCK_ACTIVE_UNIFORMS
+        GL_UNIFORM_BLOCK_ACTIVE_UNIFORM_INDICES GL_UNIFORM_BLOCK_BINDING
+        GL_UNIFORM_BLOCK_DATA_SIZE GL_UNIFORM_BLOCK_INDEX
+        GL_UNIFORM_BLOCK_NAME_LENGTH
+        GL_UNIFORM_BLOCK_REFERENCED_BY_FRAGMENT_SHADER
+        GL_UNIFORM_BLOCK_REFERENCED_BY_GEOMETRY_SHADER
+        GL_UNIFORM_BLOCK_REFERENCED_BY_VERTEX_SHADER GL_UNIFORM_BUFFER
+        GL_UNIFORM_BUFFER_BINDING GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT
+        GL_UNIFORM_BUFFER_SIZE GL_UNIFORM_BUFFER_START GL_UNIFORM_IS_ROW_MAJOR
+        GL_UNIFORM_MATRIX_STRIDE GL_UNIFORM_NAME_LENGTH GL_UNIFORM_OFFSET
+        GL_UNIFORM_SIZE GL_UNIFORM_TYPE GL_UNSIGNED_INT_SAMPLER_2D_RECT
+        GL_UNSIGNED_INT_SAMPLER_BUFFER glBindBufferBase glBindBufferRange
+        glCopyBufferSubData glDrawArraysInstanced glDrawElementsInstanced
+        glGetActiveUniformBlockName glGetActiveUniformBlockiv
+        glGetActiveUniformName glGetActiveUniformsiv glGetIntegeri_v
+        glGetUniformBlockIndex glGetUniformIndices glInitGl31VERSION
+        glPrimitiveRestartIndex glTexBuffer glUniformBlockBinding
+    """),
+    ('OpenGL.GL.VERSION.GL_3_2', """
+        GL_ALREADY_SIGNALED GL_CONDITION_SATISFIED
+        GL_CONTEXT_COMPATIBILITY_PROFILE_BIT GL_CONTEXT_CORE_PROFILE_BIT
+        GL_CONTEXT_PROFILE_MASK GL_DEPTH_CLAMP
+        GL_FRAMEBUFFER_ATTACHMENT_LAYERED
+        GL_FRAMEBUFFER_INCOMPLETE_LAYER_TARGETS GL_GEOMETRY_INPUT_TYPE
+        GL_GEOMETRY_OUTPUT_TYPE GL_GEOMETRY_SHADER GL_GEOMETRY_VERTICES_OUT
+        GL_INT_SAMPLER_2D_MULTISAMPLE GL_INT_SAMPLER_2D_MULTISAMPLE_ARRAY
+        GL_LINES_ADJACENCY GL_LINE_STRIP_ADJACENCY GL_MAX_COLOR_TEXTURE_SAMPLES
+        GL_MAX_DEPTH_TEXTURE_SAMPLES GL_MAX_FRAGMENT_INPUT_COMPONENTS
+        GL_MAX_GEOMETRY_INPUT_COMPONENTS GL_MAX_GEOMETRY_OUTPUT_COMPONENTS
+        GL_MAX_GEOMETRY_OUTPUT_VERTICES GL_MAX_GEOMETRY_TEXTURE_IMAGE_UNITS
+        GL_MAX_GEOMETRY_TOTAL_OUTPUT_COMPONENTS
+        GL_MAX_GEOMETRY_UNIFORM_COMPONENTS GL_MAX_INTEGER_SAMPLES
+        GL_MAX_SAMPLE_MASK_WORDS GL_MAX_SERVER_WAIT_TIMEOUT
+        GL_MAX_VERTEX_OUTPUT_COMPONENTS GL_OBJECT_TYPE GL_PROGRAM_POINT_SIZE
+        GL_PROXY_TEXTURE_2D_MULTISAMPLE GL_PROXY_TEXTURE_2D_MULTISAMPLE_ARRAY
+        GL_QUADS_FOLLOW_PROVOKING_VERTEX_CONVENTION GL_SAMPLER_2D_MULTISAMPLE
+        GL_SAMPLER_2D_MULTISAMPLE_ARRAY GL_SAMPLE_MASK GL_SAMPLE_MASK_VALUE
+        GL_SAMPLE_POSITION GL_SIGNALED GL_SYNC_CONDITION GL_SYNC_FENCE
+        GL_SYNC_FLAGS GL_SYNC_FLUSH_COMMANDS_BIT GL_SYNC_GPU_COMMANDS_COMPLETE
+        GL_SYNC_STATUS GL_TEXTURE_CUBE_MAP_SEAMLESS
+        GL_TEXTURE_FIXED_SAMPLE_LOCATIONS GL_TEXTURE_SAMPLES GL_TIMEOUT_EXPIRED
+        GL_TIMEOUT_IGNORED GL_TRIANGLES_ADJACENCY GL_TRIANGLE_STRIP_ADJACENCY
+        GL_UNSIGNALED GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE
+        GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE_ARRAY GL_WAIT_FAILED
+        glClientWaitSync glDeleteSync glDrawElementsBaseVertex
+        glDrawElementsInstancedBaseVertex glDrawRangeElementsBaseVertex
+        glFenceSync glFramebufferTexture glGetBufferParameteri64v
+        glGetInteger64i_v glGetInteger64v glGetMultisamplefv glGetSynciv
+        glInitGl32VERSION glIsSync glMultiDrawElementsBaseVertex
+        glProvokingVertex glSampleMaski glTexImage2DMultisample
+        glTexImage3DMultisample glWaitSync
+    """),
+    ('OpenGL.GL.VERSION.GL_3_3', """
+        GL_ANY_SAMPLES_PASSED GL_INT_2_10_10_10_REV
+        GL_MAX_DUAL_SOURCE_DRAW_BUFFERS GL_ONE_MINUS_SRC1_ALPHA
+        GL_ONE_MINUS_SRC1_COLOR GL_RGB10_A2UI GL_SAMPLER_BINDING GL_SRC1_COLOR
+        GL_TEXTURE_SWIZZLE_A GL_TEXTURE_SWIZZLE_B GL_TEXTURE_SWIZZLE_G
+        GL_TEXTURE_SWIZZLE_R GL_TEXTURE_SWIZZLE_RGBA GL_TIMESTAMP
+        GL_TIME_ELAPSED GL_VERTEX_ATTRIB_ARRAY_DIVISOR
+        glBindFragDataLocationIndexed glBindSampler glColorP3ui glColorP3uiv
+        glColorP4ui glColorP4uiv glDeleteSamplers glGenSamplers
+        glGetFragDataIndex glGetQueryObjecti64v glGetQueryObjectui64v
+        glGetSamplerParameterIiv glGetSamplerParameterIuiv
+        glGetSamplerParameterfv glGetSamplerParameteriv glInitGl33VERSION
+        glIsSampler glMultiTexCoordP1ui glMultiTexCoordP1uiv
+        glMultiTexCoordP2ui glMultiTexCoordP2uiv glMultiTexCoordP3ui
+        glMultiTexCoordP3uiv glMultiTexCoordP4ui glMultiTexCoordP4uiv
+        glNormalP3ui glNormalP3uiv glQueryCounter glSamplerParameterIiv
+        glSamplerParameterIuiv glSamplerParameterf glSamplerParameterfv
+        glSamplerParameteri glSamplerParameteriv glSecondaryColorP3ui
+        glSecondaryColorP3uiv glTexCoordP1ui glTexCoordP1uiv glTexCoordP2ui
+        glTexCoordP2uiv glTexCoordP3ui glTexCoordP3uiv glTexCoordP4ui
+        glTexCoordP4uiv glVertexAttribDivisor glVertexAttribP1ui
+        glVertexAttribP1uiv glVertexAttribP2ui glVertexAttribP2uiv
+        glVertexAttribP3ui glVertexAttribP3uiv glVertexAttribP4ui
+        glVertexAttribP4uiv glVertexP2ui glVertexP2uiv glVertexP3ui
+        glVertexP3uiv glVertexP4ui glVertexP4uiv
+    """),
+    ('OpenGL.GL.VERSION.GL_4_0', """
+        GL_ACTIVE_SUBROUTINES GL_ACTIVE_SUBROUTINE_MAX_LENGTH
+        GL_ACTIVE_SUBROUTINE_UNIFORMS GL_ACTIVE_SUBROUTINE_UNIFORM_LOCATIONS
+        GL_ACTIVE_SUBROUTINE_UNIFORM_MAX_LENGTH GL_DRAW_INDIRECT_BUFFER
+        GL_DRAW_INDIRECT_BUFFER_BINDING GL_FRACTIONAL_EVEN GL_FRACTIONAL_ODD
+        GL_FRAGMENT_INTERPOLATION_OFFSET_BITS GL_INT_SAMPLER_CUBE_MAP_ARRAY
+        GL_ISOLINES GL_MAX_COMBINED_TESS_CONTROL_UNIFORM_COMPONENTS
+        GL_MAX_COMBINED_TESS_EVALUATION_UNIFORM_COMPONENTS
+        GL_MAX_FRAGMENT_INTERPOLATION_OFFSET GL_MAX_GEOMETRY_SHADER_INVOCATIONS
+        GL_MAX_PATCH_VERTICES GL_MAX_PROGRAM_TEXTURE_GATHER_OFFSET
+        GL_MAX_SUBROUTINES GL_MAX_SUBROUTINE_UNIFORM_LOCATIONS
+        GL_MAX_TESS_CONTROL_INPUT_COMPONENTS
+        GL_MAX_TESS_CONTROL_OUTPUT_COMPONENTS
+        GL_MAX_TESS_CONTROL_TEXTURE_IMAGE_UNITS
+        GL_MAX_TESS_CONTROL_TOTAL_OUTPUT_COMPONENTS
+        GL_MAX_TESS_CONTROL_UNIFORM_BLOCKS
+        GL_MAX_TESS_CONTROL_UNIFORM_COMPONENTS
+        GL_MAX_TESS_EVALUATION_INPUT_COMPONENTS
+        GL_MAX_TESS_EVALUATION_OUTPUT_COMPONENTS
+        GL_MAX_TESS_EVALUATION_TEXTURE_IMAGE_UNITS
+        GL_MAX_TESS_EVALUATION_UNIFORM_BLOCKS
+        GL_MAX_TESS_EVALUATION_UNIFORM_COMPONENTS GL_MAX_TESS_GEN_LEVEL
+        GL_MAX_TESS_PATCH_COMPONENTS GL_MAX_TRANSFORM_FEEDBACK_BUFFERS
+        GL_MAX_VERTEX_STREAMS GL_MIN_FRAGMENT_INTERPOLATION_OFFSET
+        GL_MIN_PROGRAM_TEXTURE_GATHER_OFFSET GL_MIN_SAMPLE_SHADING_VALUE
+        GL_PATCHES GL_PATCH_DEFAULT_INNER_LEVEL GL_PATCH_DEFAULT_OUTER_LEVEL
+        GL_PATCH_VERTICES GL_PROXY_TEXTURE_CUBE_MAP_ARRAY GL_QUADS
+        GL_SAMPLER_CUBE_MAP_ARRAY GL_SAMPLER_CUBE_MAP_ARRAY_SHADOW
+        GL_SAMPLE_SHADING GL_TESS_CONTROL_OUTPUT_VERTICES
+        GL_TESS_CONTROL_SHADER GL_TESS_EVALUATION_SHADER GL_TESS_GEN_MODE
+        GL_TESS_GEN_POINT_MODE GL_TESS_GEN_SPACING GL_TESS_GEN_VERTEX_ORDER
+        GL_TRANSFORM_FEEDBACK GL_TRANSFORM_FEEDBACK_BINDING
+        GL_TRANSFORM_FEEDBACK_BUFFER_ACTIVE GL_TRANSFORM_FEEDBACK_BUFFER_PAUSED
+        GL_UNIFORM_BLOCK_REFERENCED_BY_TESS_CONTROL_SHADER
+        GL_UNIFORM_BLOCK_REFERENCED_BY_TESS_EVALUATION_SHADER
+        GL_UNSIGNED_INT_SAMPLER_CUBE_MAP_ARRAY glBeginQueryIndexed
+        glBindTransformFeedback glBlendEquationSeparatei glBlendEquationi
+        glBlendFuncSeparatei glBlendFunci glDeleteTransformFeedbacks
+        glDrawArraysIndirect glDrawElementsIndirect glDrawTransformFeedback
+        glDrawTransformFeedbackStream glEndQueryIndexed glGenTransformFeedbacks
+        glGetActiveSubroutineName glGetActiveSubroutineUniformName
+        glGetActiveSubroutineUniformiv glGetProgramStageiv glGetQueryIndexediv
+        glGetSubroutineIndex glGetSubroutineUniformLocation
+        glGetUniformSubroutineuiv glGetUniformdv glInitGl40VERSION
+        glIsTransformFeedback glMinSampleShading glPatchParameterfv
+        glPatchParameteri glPauseTransformFeedback glResumeTransformFeedback
+        glUniform1d glUniform1dv glUniform2d glUniform2dv glUniform3d
+        glUniform3dv glUniform4d glUniform4dv glUniformMatrix2dv
+        glUniformMatrix2x3dv glUniformMatrix2x4dv glUniformMatrix3dv
+        glUniformMatrix3x2dv glUniformMatrix3x4dv glUniformMatrix4dv
+        glUniformMatrix4x2dv glUniformMatrix4x3dv glUniformSubroutinesuiv
+    """),
+    ('OpenGL.GL.VERSION.GL_4_1', """
+        GL_ACTIVE_PROGRAM GL_ALL_SHADER_BITS GL_DEPTH_RANGE GL_DOUBLE_MAT2
+        GL_DOUBLE_MAT2x3 GL_DOUBLE_MAT2x4 GL_DOUBLE_MAT3 GL_DOUBLE_MAT3x2
+        GL_DOUBLE_MAT3x4 GL_DOUBLE_MAT4 GL_DOUBLE_MAT4x2 GL_DOUBLE_MAT4x3
+        GL_DOUBLE_VEC2 GL_DOUBLE_VEC3 GL_DOUBLE_VEC4 GL_FIRST_VERTEX_CONVENTION
+        GL_FRAGMENT_SHADER_BIT GL_GEOMETRY_SHADER_BIT GL_HIGH_FLOAT GL_HIGH_INT
+        GL_IMPLEMENTATION_COLOR_READ_FORMAT GL_IMPLEMENTATION_COLOR_READ_TYPE
+        GL_LAST_VERTEX_CONVENTION GL_LAYER_PROVOKING_VERTEX GL_LOW_FLOAT
+        GL_LOW_INT GL_MAX_FRAGMENT_UNIFORM_VECTORS GL_MAX_VARYING_VECTORS
+        GL_MAX_VERTEX_UNIFORM_VECTORS GL_MAX_VIEWPORTS GL_MEDIUM_FLOAT
+        GL_MEDIUM_INT GL_NUM_PROGRAM_BINARY_FORMATS
+        GL_NUM_SHADER_BINARY_FORMATS GL_PROGRAM_BINARY_FORMATS
+        GL_PROGRAM_BINARY_LENGTH GL_PROGRAM_BINARY_RETRIEVABLE_HINT
+        GL_PROGRAM_PIPELINE_BINDING GL_PROGRAM_SEPARABLE GL_PROVOKING_VERTEX
+        GL_RGB32I GL_RGB565 GL_SCISSOR_BOX GL_SCISSOR_TEST
+        GL_SHADER_BINARY_FORMATS GL_SHADER_COMPILER GL_TESS_CONTROL_SHADER_BIT
+        GL_TESS_EVALUATION_SHADER_BIT GL_UNDEFINED_VERTEX GL_VERTEX_SHADER_BIT
+        GL_VIEWPORT GL_VIEWPORT_BOUNDS_RANGE GL_VIEWPORT_INDEX_PROVOKING_VERTEX
+        GL_VIEWPORT_SUBPIXEL_BITS GLintArray glActiveShaderProgram
+        glBindProgramPipeline glClearDepthf glCreateShaderProgramv
+        glDeleteProgramPipelines glDepthRangeArrayv glDepthRangeIndexed
+        glDepthRangef glGenProgramPipelines glGetDoublei_v glGetFloati_v
+        glGetProgramBinary glGetProgramPipelineInfoLog glGetProgramPipelineiv
+        glGetShaderPrecisionFormat glGetVertexAttribLdv
+        glInitEs2CompatibilityARB glInitGetProgramBinaryARB glInitGl41VERSION
+        glInitSeparateShaderObjectsARB glInitShaderPrecisionARB
+        glInitVertexAttrib64BitARB glInitViewportArrayARB glIsProgramPipeline
+        glProgramBinary glProgramParameteri glProgramUniform1d
+        glProgramUniform1dv glProgramUniform1f glProgramUniform1fv
+        glProgramUniform1i glProgramUniform1iv glProgramUniform1ui
+        glProgramUniform1uiv glProgramUniform2d glProgramUniform2dv
+        glProgramUniform2f glProgramUniform2fv glProgramUniform2i
+        glProgramUniform2iv glProgramUniform2ui glProgramUniform2uiv
+        glProgramUniform3d glProgramUniform3dv glProgramUniform3f
+        glProgramUniform3fv glProgramUniform3i glProgramUniform3iv
+        glProgramUniform3ui glProgramUniform3uiv glProgramUniform4d
+        glProgramUniform4dv glProgramUniform4f glProgramUniform4fv
+        glProgramUniform4i glProgramUniform4iv glProgramUniform4ui
+        glProgramUniform4uiv glProgramUniformMatrix2dv
+        glProgramUniformMatrix2fv glProgramUniformMatrix2x3dv
+        glProgramUniformMatrix2x3fv glProgramUniformMatrix2x4dv
+        glProgramUniformMatrix2x4fv glProgramUniformMatrix3dv
+        glProgramUniformMatrix3fv glProgramUniformMatrix3x2dv
+        glProgramUniformMatrix3x2fv glProgramUniformMatrix3x4dv
+        glProgramUniformMatrix3x4fv glProgramUniformMatrix4dv
+        glProgramUniformMatrix4fv glProgramUniformMatrix4x2dv
+        glProgramUniformMatrix4x2fv glProgramUniformMatrix4x3dv
+        glProgramUniformMatrix4x3fv glReleaseShaderCompiler glScissorArrayv
+        glScissorIndexed glScissorIndexedv glShaderBinary glUseProgramStages
+        glValidateProgramPipeline glVertexAttribL1d glVertexAttribL1dv
+        glVertexAttribL2d glVertexAttribL2dv glVertexAttribL3d
+        glVertexAttribL3dv glVertexAttribL4d glVertexAttribL4dv
+        glVertexAttribLPointer glViewportArrayv glViewportIndexedf
+        glViewportIndexedfv
+    """),
+    ('OpenGL.GL.VERSION.GL_4_2', """
+        GL_ACTIVE_ATOMIC_COUNTER_BUFFERS GL_ALL_BARRIER_BITS
+        GL_ATOMIC_COUNTER_BARRIER_BIT
+        GL_ATOMIC_COUNTER_BUFFER_ACTIVE_ATOMIC_COUNTERS
+        GL_ATOMIC_COUNTER_BUFFER_ACTIVE_ATOMIC_COUNTER_INDICES
+        GL_ATOMIC_COUNTER_BUFFER_BINDING GL_ATOMIC_COUNTER_BUFFER_DATA_SIZE
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_FRAGMENT_SHADER
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_GEOMETRY_SHADER
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_TESS_CONTROL_SHADER
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_TESS_EVALUATION_SHADER
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_VERTEX_SHADER
+        GL_ATOMIC_COUNTER_BUFFER_SIZE GL_ATOMIC_COUNTER_BUFFER_START
+        GL_BUFFER_UPDATE_BARRIER_BIT GL_COMMAND_BARRIER_BIT
+        GL_COMPRESSED_RGBA_BPTC_UNORM GL_COMPRESSED_RGB_BPTC_SIGNED_FLOAT
+        GL_COMPRESSED_RGB_BPTC_UNSIGNED_FLOAT
+        GL_COMPRESSED_SRGB_ALPHA_BPTC_UNORM GL_COPY_READ_BUFFER_BINDING
+        GL_COPY_WRITE_BUFFER_BINDING GL_ELEMENT_ARRAY_BARRIER_BIT
+        GL_FRAMEBUFFER_BARRIER_BIT GL_IMAGE_1D GL_IMAGE_1D_ARRAY GL_IMAGE_2D
+        GL_IMAGE_2D_ARRAY GL_IMAGE_2D_MULTISAMPLE GL_IMAGE_2D_MULTISAMPLE_ARRAY
+        GL_IMAGE_2D_RECT GL_IMAGE_3D GL_IMAGE_BINDING_ACCESS
+        GL_IMAGE_BINDING_FORMAT GL_IMAGE_BINDING_LAYER GL_IMAGE_BINDING_LAYERED
+        GL_IMAGE_BINDING_LEVEL GL_IMAGE_BINDING_NAME GL_IMAGE_BUFFER
+        GL_IMAGE_CUBE GL_IMAGE_CUBE_MAP_ARRAY
+        GL_IMAGE_FORMAT_COMPATIBILITY_BY_CLASS
+        GL_IMAGE_FORMAT_COMPATIBILITY_BY_SIZE GL_INT_IMAGE_1D
+        GL_INT_IMAGE_1D_ARRAY GL_INT_IMAGE_2D GL_INT_IMAGE_2D_ARRAY
+        GL_INT_IMAGE_2D_MULTISAMPLE GL_INT_IMAGE_2D_MULTISAMPLE_ARRAY
+        GL_INT_IMAGE_2D_RECT GL_INT_IMAGE_3D GL_INT_IMAGE_BUFFER
+        GL_INT_IMAGE_CUBE GL_INT_IMAGE_CUBE_MAP_ARRAY
+        GL_MAX_ATOMIC_COUNTER_BUFFER_BINDINGS GL_MAX_ATOMIC_COUNTER_BUFFER_SIZE
+        GL_MAX_COMBINED_ATOMIC_COUNTERS GL_MAX_COMBINED_ATOMIC_COUNTER_BUFFERS
+        GL_MAX_COMBINED_IMAGE_UNIFORMS GL_MAX_FRAGMENT_ATOMIC_COUNTERS
+        GL_MAX_FRAGMENT_ATOMIC_COUNTER_BUFFERS GL_MAX_FRAGMENT_IMAGE_UNIFORMS
+        GL_MAX_GEOMETRY_ATOMIC_COUNTERS GL_MAX_GEOMETRY_ATOMIC_COUNTER_BUFFERS
+        GL_MAX_GEOMETRY_IMAGE_UNIFORMS GL_MAX_IMAGE_SAMPLES GL_MAX_IMAGE_UNITS
+        GL_MAX_TESS_CONTROL_ATOMIC_COUNTERS
+        GL_MAX_TESS_CONTROL_ATOMIC_COUNTER_BUFFERS
+        GL_MAX_TESS_CONTROL_IMAGE_UNIFORMS
+        GL_MAX_TESS_EVALUATION_ATOMIC_COUNTERS
+        GL_MAX_TESS_EVALUATION_ATOMIC_COUNTER_BUFFERS
+        GL_MAX_TESS_EVALUATION_IMAGE_UNIFORMS GL_MAX_VERTEX_ATOMIC_COUNTERS
+        GL_MAX_VERTEX_ATOMIC_COUNTER_BUFFERS GL_MAX_VERTEX_IMAGE_UNIFORMS
+        GL_MIN_MAP_BUFFER_ALIGNMENT GL_PACK_COMPRESSED_BLOCK_DEPTH
+        GL_PACK_COMPRESSED_BLOCK_HEIGHT GL_PACK_COMPRESSED_BLOCK_SIZE
+        GL_PACK_COMPRESSED_BLOCK_WIDTH GL_PIXEL_BUFFER_BARRIER_BIT
+        GL_SHADER_IMAGE_ACCESS_BARRIER_BIT GL_TEXTURE_FETCH_BARRIER_BIT
+        GL_TEXTURE_IMMUTABLE_FORMAT GL_TEXTURE_UPDATE_BARRIER_BIT
+        GL_TRANSFORM_FEEDBACK_ACTIVE GL_TRANSFORM_FEEDBACK_BARRIER_BIT
+        GL_TRANSFORM_FEEDBACK_PAUSED GL_UNIFORM_ATOMIC_COUNTER_BUFFER_INDEX
+        GL_UNIFORM_BARRIER_BIT GL_UNPACK_COMPRESSED_BLOCK_DEPTH
+        GL_UNPACK_COMPRESSED_BLOCK_HEIGHT GL_UNPACK_COMPRESSED_BLOCK_SIZE
+        GL_UNPACK_COMPRESSED_BLOCK_WIDTH GL_UNSIGNED_INT_ATOMIC_COUNTER
+        GL_UNSIGNED_INT_IMAGE_1D GL_UNSIGNED_INT_IMAGE_1D_ARRAY
+        GL_UNSIGNED_INT_IMAGE_2D GL_UNSIGNED_INT_IMAGE_2D_ARRAY
+        GL_UNSIGNED_INT_IMAGE_2D_MULTISAMPLE
+        GL_UNSIGNED_INT_IMAGE_2D_MULTISAMPLE_ARRAY
+        GL_UNSIGNED_INT_IMAGE_2D_RECT GL_UNSIGNED_INT_IMAGE_3D
+        GL_UNSIGNED_INT_IMAGE_BUFFER GL_UNSIGNED_INT_IMAGE_CUBE
+        GL_UNSIGNED_INT_IMAGE_CUBE_MAP_ARRAY GL_VERTEX_ATTRIB_ARRAY_BARRIER_BIT
+        glBindImageTexture glDrawArraysInstancedBaseInstance
+        glDrawElementsInstancedBaseInstance
+        glDrawElementsInstancedBaseVertexBaseInstance
+        glDrawTransformFeedbackInstanced glDrawTransformFeedbackStreamInstanced
+        glGetActiveAtomicCounterBufferiv glGetInternalformativ
+        glInitBaseInstanceARB glInitCompressedTexturePixelStorageARB
+        glInitConservativeDepthARB glInitGl42VERSION
+        glInitInternalformatQueryARB glInitMapBufferAlignmentARB
+        glInitShaderAtomicCountersARB glInitShaderImageLoadStoreARB
+        glInitShadingLanguage420PackARB glInitShadingLanguagePackingARB
+        glInitTextureStorageARB glInitTransformFeedbackInstancedARB
+        glMemoryBarrier glTexStorage1D glTexStorage2D glTexStorage3D
+    """),
+    ('OpenGL.GL.VERSION.GL_4_3', """
+        GL_ACTIVE_RESOURCES GL_ACTIVE_VARIABLES
+        GL_ANY_SAMPLES_PASSED_CONSERVATIVE GL_ARRAY_SIZE GL_ARRAY_STRIDE
+        GL_ATOMIC_COUNTER_BUFFER GL_ATOMIC_COUNTER_BUFFER_INDEX
+        GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_COMPUTE_SHADER
+        GL_AUTO_GENERATE_MIPMAP GL_BLOCK_INDEX GL_BUFFER GL_BUFFER_BINDING
+        GL_BUFFER_DATA_SIZE GL_BUFFER_KHR GL_BUFFER_VARIABLE GL_CAVEAT_SUPPORT
+        GL_CLEAR_BUFFER GL_COLOR_COMPONENTS GL_COLOR_ENCODING
+        GL_COLOR_RENDERABLE GL_COMPATIBLE_SUBROUTINES GL_COMPRESSED_R11_EAC
+        GL_COMPRESSED_RG11_EAC GL_COMPRESSED_RGB8_ETC2
+        GL_COMPRESSED_RGB8_PUNCHTHROUGH_ALPHA1_ETC2
+        GL_COMPRESSED_RGBA8_ETC2_EAC GL_COMPRESSED_SIGNED_R11_EAC
+        GL_COMPRESSED_SIGNED_RG11_EAC GL_COMPRESSED_SRGB8_ALPHA8_ETC2_EAC
+        GL_COMPRESSED_SRGB8_ETC2 GL_COMPRESSED_SRGB8_PUNCHTHROUGH_ALPHA1_ETC2
+        GL_COMPUTE_SHADER GL_COMPUTE_SHADER_BIT GL_COMPUTE_SUBROUTINE
+        GL_COMPUTE_SUBROUTINE_UNIFORM GL_COMPUTE_TEXTURE
+        GL_COMPUTE_WORK_GROUP_SIZE GL_CONTEXT_FLAG_DEBUG_BIT
+        GL_CONTEXT_FLAG_DEBUG_BIT_KHR GL_DEBUG_CALLBACK_FUNCTION
+        GL_DEBUG_CALLBACK_FUNCTION_KHR GL_DEBUG_CALLBACK_USER_PARAM
+        GL_DEBUG_CALLBACK_USER_PARAM_KHR GL_DEBUG_GROUP_STACK_DEPTH
+        GL_DEBUG_GROUP_STACK_DEPTH_KHR GL_DEBUG_LOGGED_MESSAGES
+        GL_DEBUG_LOGGED_MESSAGES_KHR GL_DEBUG_NEXT_LOGGED_MESSAGE_LENGTH
+        GL_DEBUG_NEXT_LOGGED_MESSAGE_LENGTH_KHR GL_DEBUG_OUTPUT
+        GL_DEBUG_OUTPUT_KHR GL_DEBUG_OUTPUT_SYNCHRONOUS
+        GL_DEBUG_OUTPUT_SYNCHRONOUS_KHR GL_DEBUG_SEVERITY_HIGH
+        GL_DEBUG_SEVERITY_HIGH_KHR GL_DEBUG_SEVERITY_LOW
+        GL_DEBUG_SEVERITY_LOW_KHR GL_DEBUG_SEVERITY_MEDIUM
+        GL_DEBUG_SEVERITY_MEDIUM_KHR GL_DEBUG_SEVERITY_NOTIFICATION
+        GL_DEBUG_SEVERITY_NOTIFICATION_KHR GL_DEBUG_SOURCE_API
+        GL_DEBUG_SOURCE_API_KHR GL_DEBUG_SOURCE_APPLICATION
+        GL_DEBUG_SOURCE_APPLICATION_KHR GL_DEBUG_SOURCE_OTHER
+        GL_DEBUG_SOURCE_OTHER_KHR GL_DEBUG_SOURCE_SHADER_COMPILER
+        GL_DEBUG_SOURCE_SHADER_COMPILER_KHR GL_DEBUG_SOURCE_THIRD_PARTY
+        GL_DEBUG_SOURCE_THIRD_PARTY_KHR GL_DEBUG_SOURCE_WINDOW_SYSTEM
+        GL_DEBUG_SOURCE_WINDOW_SYSTEM_KHR GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR
+        GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR_KHR GL_DEBUG_TYPE_ERROR
+        GL_DEBUG_TYPE_ERROR_KHR GL_DEBUG_TYPE_MARKER GL_DEBUG_TYPE_MARKER_KHR
+        GL_DEBUG_TYPE_OTHER GL_DEBUG_TYPE_OTHER_KHR GL_DEBUG_TYPE_PERFORMANCE
+        GL_DEBUG_TYPE_PERFORMANCE_KHR GL_DEBUG_TYPE_POP_GROUP
+        GL_DEBUG_TYPE_POP_GROUP_KHR GL_DEBUG_TYPE_PORTABILITY
+        GL_DEBUG_TYPE_PORTABILITY_KHR GL_DEBUG_TYPE_PUSH_GROUP
+        GL_DEBUG_TYPE_PUSH_GROUP_KHR GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR
+        GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR_KHR GL_DEPTH_COMPONENTS
+        GL_DEPTH_RENDERABLE GL_DEPTH_STENCIL_TEXTURE_MODE
+        GL_DISPATCH_INDIRECT_BUFFER GL_DISPATCH_INDIRECT_BUFFER_BINDING
+        GL_DISPLAY_LIST GL_FILTER GL_FRAGMENT_SUBROUTINE
+        GL_FRAGMENT_SUBROUTINE_UNIFORM GL_FRAGMENT_TEXTURE GL_FRAMEBUFFER_BLEND
+        GL_FRAMEBUFFER_DEFAULT_FIXED_SAMPLE_LOCATIONS
+        GL_FRAMEBUFFER_DEFAULT_HEIGHT GL_FRAMEBUFFER_DEFAULT_LAYERS
+        GL_FRAMEBUFFER_DEFAULT_SAMPLES GL_FRAMEBUFFER_DEFAULT_WIDTH
+        GL_FRAMEBUFFER_RENDERABLE GL_FRAMEBUFFER_RENDERABLE_LAYERED
+        GL_FULL_SUPPORT GL_GEOMETRY_SUBROUTINE GL_GEOMETRY_SUBROUTINE_UNIFORM
+        GL_GEOMETRY_TEXTURE GL_GET_TEXTURE_IMAGE_FORMAT
+        GL_GET_TEXTURE_IMAGE_TYPE GL_IMAGE_CLASS_10_10_10_2
+        GL_IMAGE_CLASS_11_11_10 GL_IMAGE_CLASS_1_X_16 GL_IMAGE_CLASS_1_X_32
+        GL_IMAGE_CLASS_1_X_8 GL_IMAGE_CLASS_2_X_16 GL_IMAGE_CLASS_2_X_32
+        GL_IMAGE_CLASS_2_X_8 GL_IMAGE_CLASS_4_X_16 GL_IMAGE_CLASS_4_X_32
+        GL_IMAGE_CLASS_4_X_8 GL_IMAGE_COMPATIBILITY_CLASS
+        GL_IMAGE_FORMAT_COMPATIBILITY_TYPE GL_IMAGE_PIXEL_FORMAT
+        GL_IMAGE_PIXEL_TYPE GL_IMAGE_TEXEL_SIZE GL_INTERNALFORMAT_ALPHA_SIZE
+        GL_INTERNALFORMAT_ALPHA_TYPE GL_INTERNALFORMAT_BLUE_SIZE
+        GL_INTERNALFORMAT_BLUE_TYPE GL_INTERNALFORMAT_DEPTH_SIZE
+        GL_INTERNALFORMAT_DEPTH_TYPE GL_INTERNALFORMAT_GREEN_SIZE
+        GL_INTERNALFORMAT_GREEN_TYPE GL_INTERNALFORMAT_PREFERRED
+        GL_INTERNALFORMAT_RED_SIZE GL_INTERNALFORMAT_RED_TYPE
+        GL_INTERNALFORMAT_SHARED_SIZE GL_INTERNALFORMAT_STENCIL_SIZE
+        GL_INTERNALFORMAT_STENCIL_TYPE GL_INTERNALFORMAT_SUPPORTED
+        GL_IS_PER_PATCH GL_IS_ROW_MAJOR GL_LOCATION GL_LOCATION_INDEX
+        GL_MANUAL_GENERATE_MIPMAP GL_MATRIX_STRIDE
+        GL_MAX_COMBINED_COMPUTE_UNIFORM_COMPONENTS GL_MAX_COMBINED_DIMENSIONS
+        GL_MAX_COMBINED_IMAGE_UNITS_AND_FRAGMENT_OUTPUTS
+        GL_MAX_COMBINED_SHADER_OUTPUT_RESOURCES
+        GL_MAX_COMBINED_SHADER_STORAGE_BLOCKS GL_MAX_COMPUTE_ATOMIC_COUNTERS
+        GL_MAX_COMPUTE_ATOMIC_COUNTER_BUFFERS GL_MAX_COMPUTE_IMAGE_UNIFORMS
+        GL_MAX_COMPUTE_SHADER_STORAGE_BLOCKS GL_MAX_COMPUTE_SHARED_MEMORY_SIZE
+        GL_MAX_COMPUTE_TEXTURE_IMAGE_UNITS GL_MAX_COMPUTE_UNIFORM_BLOCKS
+        GL_MAX_COMPUTE_UNIFORM_COMPONENTS GL_MAX_COMPUTE_WORK_GROUP_COUNT
+        GL_MAX_COMPUTE_WORK_GROUP_INVOCATIONS GL_MAX_COMPUTE_WORK_GROUP_SIZE
+        GL_MAX_DEBUG_GROUP_STACK_DEPTH GL_MAX_DEBUG_GROUP_STACK_DEPTH_KHR
+        GL_MAX_DEBUG_LOGGED_MESSAGES GL_MAX_DEBUG_LOGGED_MESSAGES_KHR
+        GL_MAX_DEBUG_MESSAGE_LENGTH GL_MAX_DEBUG_MESSAGE_LENGTH_KHR
+        GL_MAX_DEPTH GL_MAX_ELEMENT_INDEX GL_MAX_FRAGMENT_SHADER_STORAGE_BLOCKS
+        GL_MAX_FRAMEBUFFER_HEIGHT GL_MAX_FRAMEBUFFER_LAYERS
+        GL_MAX_FRAMEBUFFER_SAMPLES GL_MAX_FRAMEBUFFER_WIDTH
+        GL_MAX_GEOMETRY_SHADER_STORAGE_BLOCKS GL_MAX_HEIGHT GL_MAX_LABEL_LENGTH
+        GL_MAX_LABEL_LENGTH_KHR GL_MAX_LAYERS GL_MAX_NAME_LENGTH
+        GL_MAX_NUM_ACTIVE_VARIABLES GL_MAX_NUM_COMPATIBLE_SUBROUTINES
+        GL_MAX_SHADER_STORAGE_BLOCK_SIZE GL_MAX_SHADER_STORAGE_BUFFER_BINDINGS
+        GL_MAX_TESS_CONTROL_SHADER_STORAGE_BLOCKS
+        GL_MAX_TESS_EVALUATION_SHADER_STORAGE_BLOCKS GL_MAX_UNIFORM_LOCATIONS
+        GL_MAX_VERTEX_ATTRIB_BINDINGS GL_MAX_VERTEX_ATTRIB_RELATIVE_OFFSET
+        GL_MAX_VERTEX_SHADER_STORAGE_BLOCKS GL_MAX_WIDTH GL_MIPMAP
+        GL_NAME_LENGTH GL_NUM_ACTIVE_VARIABLES GL_NUM_COMPATIBLE_SUBROUTINES
+        GL_NUM_SAMPLE_COUNTS GL_NUM_SHADING_LANGUAGE_VERSIONS GL_OFFSET
+        GL_PRIMITIVE_RESTART_FIXED_INDEX GL_PROGRAM GL_PROGRAM_INPUT
+        GL_PROGRAM_KHR GL_PROGRAM_OUTPUT GL_PROGRAM_PIPELINE
+        GL_PROGRAM_PIPELINE_KHR GL_QUERY GL_QUERY_KHR GL_READ_PIXELS
+        GL_READ_PIXELS_FORMAT GL_READ_PIXELS_TYPE
+        GL_REFERENCED_BY_COMPUTE_SHADER GL_REFERENCED_BY_FRAGMENT_SHADER
+        GL_REFERENCED_BY_GEOMETRY_SHADER GL_REFERENCED_BY_TESS_CONTROL_SHADER
+        GL_REFERENCED_BY_TESS_EVALUATION_SHADER GL_REFERENCED_BY_VERTEX_SHADER
+        GL_RENDERBUFFER GL_SAMPLER GL_SAMPLER_KHR GL_SAMPLES GL_SHADER
+        GL_SHADER_IMAGE_ATOMIC GL_SHADER_IMAGE_LOAD GL_SHADER_IMAGE_STORE
+        GL_SHADER_KHR GL_SHADER_STORAGE_BARRIER_BIT GL_SHADER_STORAGE_BLOCK
+        GL_SHADER_STORAGE_BUFFER GL_SHADER_STORAGE_BUFFER_BINDING
+        GL_SHADER_STORAGE_BUFFER_OFFSET_ALIGNMENT GL_SHADER_STORAGE_BUFFER_SIZE
+        GL_SHADER_STORAGE_BUFFER_START GL_SIMULTANEOUS_TEXTURE_AND_DEPTH_TEST
+        GL_SIMULTANEOUS_TEXTURE_AND_DEPTH_WRITE
+        GL_SIMULTANEOUS_TEXTURE_AND_STENCIL_TEST
+        GL_SIMULTANEOUS_TEXTURE_AND_STENCIL_WRITE GL_SRGB_DECODE_ARB
+        GL_SRGB_READ GL_SRGB_WRITE GL_STACK_OVERFLOW GL_STACK_OVERFLOW_KHR
+        GL_STACK_UNDERFLOW GL_STACK_UNDERFLOW_KHR GL_STENCIL_COMPONENTS
+        GL_STENCIL_RENDERABLE GL_TESS_CONTROL_SUBROUTINE
+        GL_TESS_CONTROL_SUBROUTINE_UNIFORM GL_TESS_CONTROL_TEXTURE
+        GL_TESS_EVALUATION_SUBROUTINE GL_TESS_EVALUATION_SUBROUTINE_UNIFORM
+        GL_TESS_EVALUATION_TEXTURE GL_TEXTURE_1D GL_TEXTURE_1D_ARRAY
+        GL_TEXTURE_2D GL_TEXTURE_2D_ARRAY GL_TEXTURE_2D_MULTISAMPLE
+        GL_TEXTURE_2D_MULTISAMPLE_ARRAY GL_TEXTURE_3D GL_TEXTURE_BUFFER
+        GL_TEXTURE_BUFFER_OFFSET GL_TEXTURE_BUFFER_OFFSET_ALIGNMENT
+        GL_TEXTURE_BUFFER_SIZE GL_TEXTURE_COMPRESSED
+        GL_TEXTURE_COMPRESSED_BLOCK_HEIGHT GL_TEXTURE_COMPRESSED_BLOCK_SIZE
+        GL_TEXTURE_COMPRESSED_BLOCK_WIDTH GL_TEXTURE_CUBE_MAP
+        GL_TEXTURE_CUBE_MAP_ARRAY GL_TEXTURE_GATHER GL_TEXTURE_GATHER_SHADOW
+        GL_TEXTURE_IMAGE_FORMAT GL_TEXTURE_IMAGE_TYPE
+        GL_TEXTURE_IMMUTABLE_LEVELS GL_TEXTURE_RECTANGLE GL_TEXTURE_SHADOW
+        GL_TEXTURE_VIEW GL_TEXTURE_VIEW_MIN_LAYER GL_TEXTURE_VIEW_MIN_LEVEL
+        GL_TEXTURE_VIEW_NUM_LAYERS GL_TEXTURE_VIEW_NUM_LEVELS
+        GL_TOP_LEVEL_ARRAY_SIZE GL_TOP_LEVEL_ARRAY_STRIDE
+        GL_TRANSFORM_FEEDBACK_VARYING GL_TYPE GL_UNIFORM GL_UNIFORM_BLOCK
+        GL_UNIFORM_BLOCK_REFERENCED_BY_COMPUTE_SHADER GL_VERTEX_ARRAY
+        GL_VERTEX_ARRAY_KHR GL_VERTEX_ATTRIB_ARRAY_LONG
+        GL_VERTEX_ATTRIB_BINDING GL_VERTEX_ATTRIB_RELATIVE_OFFSET
+        GL_VERTEX_BINDING_BUFFER GL_VERTEX_BINDING_DIVISOR
+        GL_VERTEX_BINDING_OFFSET GL_VERTEX_BINDING_STRIDE GL_VERTEX_SUBROUTINE
+        GL_VERTEX_SUBROUTINE_UNIFORM GL_VERTEX_TEXTURE GL_VIEW_CLASS_128_BITS
+        GL_VIEW_CLASS_16_BITS GL_VIEW_CLASS_24_BITS GL_VIEW_CLASS_32_BITS
+        GL_VIEW_CLASS_48_BITS GL_VIEW_CLASS_64_BITS GL_VIEW_CLASS_8_BITS
+        GL_VIEW_CLASS_96_BITS GL_VIEW_CLASS_ASTC_10x10_RGBA
+        GL_VIEW_CLASS_ASTC_10x5_RGBA GL_VIEW_CLASS_ASTC_10x6_RGBA
+        GL_VIEW_CLASS_ASTC_10x8_RGBA GL_VIEW_CLASS_ASTC_12x10_RGBA
+        GL_VIEW_CLASS_ASTC_12x12_RGBA GL_VIEW_CLASS_ASTC_4x4_RGBA
+        GL_VIEW_CLASS_ASTC_5x4_RGBA GL_VIEW_CLASS_ASTC_5x5_RGBA
+        GL_VIEW_CLASS_ASTC_6x5_RGBA GL_VIEW_CLASS_ASTC_6x6_RGBA
+        GL_VIEW_CLASS_ASTC_8x5_RGBA GL_VIEW_CLASS_ASTC_8x6_RGBA
+        GL_VIEW_CLASS_ASTC_8x8_RGBA GL_VIEW_CLASS_BPTC_FLOAT
+        GL_VIEW_CLASS_BPTC_UNORM GL_VIEW_CLASS_EAC_R11 GL_VIEW_CLASS_EAC_RG11
+        GL_VIEW_CLASS_ETC2_EAC_RGBA GL_VIEW_CLASS_ETC2_RGB
+        GL_VIEW_CLASS_ETC2_RGBA GL_VIEW_CLASS_RGTC1_RED GL_VIEW_CLASS_RGTC2_RG
+        GL_VIEW_CLASS_S3TC_DXT1_RGB GL_VIEW_CLASS_S3TC_DXT1_RGBA
+        GL_VIEW_CLASS_S3TC_DXT3_RGBA GL_VIEW_CLASS_S3TC_DXT5_RGBA
+        GL_VIEW_COMPATIBILITY_CLASS glBindVertexBuffer glClearBufferData
+        glClearBufferSubData glCopyImageSubData glDebugMessageCallback
+        glDebugMessageCallbackKHR glDebugMessageControl
+        glDebugMessageControlKHR glDebugMessageInsert glDebugMessageInsertKHR
+        glDispatchCompute glDispatchComputeIndirect glFramebufferParameteri
+        glGetDebugMessageLog glGetDebugMessageLogKHR
+        glGetFramebufferParameteriv glGetInternalformati64v glGetObjectLabel
+        glGetObjectLabelKHR glGetObjectPtrLabel glGetObjectPtrLabelKHR
+        glGetPointerv glGetPointervKHR glGetProgramInterfaceiv
+        glGetProgramResourceIndex glGetProgramResourceLocation
+        glGetProgramResourceLocationIndex glGetProgramResourceName
+        glGetProgramResourceiv glInitArraysOfArraysARB
+        glInitClearBufferObjectARB glInitComputeShaderARB glInitCopyImageARB
+        glInitDebugKHR glInitEs3CompatibilityARB
+        glInitExplicitUniformLocationARB glInitFragmentLayerViewportARB
+        glInitFramebufferNoAttachmentsARB glInitGl43VERSION
+        glInitInternalformatQuery2ARB glInitInvalidateSubdataARB
+        glInitMultiDrawIndirectARB glInitProgramInterfaceQueryARB
+        glInitRobustBufferAccessBehaviorARB glInitShaderImageSizeARB
+        glInitShaderStorageBufferObjectARB glInitStencilTexturingARB
+        glInitTextureBufferRangeARB glInitTextureQueryLevelsARB
+        glInitTextureStorageMultisampleARB glInitTextureViewARB
+        glInitVertexAttribBindingARB glInvalidateBufferData
+        glInvalidateBufferSubData glInvalidateFramebuffer
+        glInvalidateSubFramebuffer glInvalidateTexImage glInvalidateTexSubImage
+        glMultiDrawArraysIndirect glMultiDrawElementsIndirect glObjectLabel
+        glObjectLabelKHR glObjectPtrLabel glObjectPtrLabelKHR glPopDebugGroup
+        glPopDebugGroupKHR glPushDebugGroup glPushDebugGroupKHR
+        glShaderStorageBlockBinding glTexBufferRange glTexStorage2DMultisample
+        glTexStorage3DMultisample glTextureView glVertexAttribBinding
+        glVertexAttribFormat glVertexAttribIFormat glVertexAttribLFormat
+        glVertexBindingDivisor
+    """),
+    ('OpenGL.GL.VERSION.GL_4_4', """
+        GL_BUFFER_IMMUTABLE_STORAGE GL_BUFFER_STORAGE_FLAGS GL_CLEAR_TEXTURE
+        GL_CLIENT_MAPPED_BUFFER_BARRIER_BIT GL_CLIENT_STORAGE_BIT
+        GL_DYNAMIC_STORAGE_BIT GL_LOCATION_COMPONENT GL_MAP_COHERENT_BIT
+        GL_MAP_PERSISTENT_BIT GL_MAP_READ_BIT GL_MAP_WRITE_BIT
+        GL_MAX_VERTEX_ATTRIB_STRIDE GL_MIRROR_CLAMP_TO_EDGE
+        GL_PRIMITIVE_RESTART_FOR_PATCHES_SUPPORTED GL_QUERY_BUFFER
+        GL_QUERY_BUFFER_BARRIER_BIT GL_QUERY_BUFFER_BINDING
+        GL_QUERY_RESULT_NO_WAIT GL_STENCIL_INDEX GL_STENCIL_INDEX8
+        GL_TEXTURE_BUFFER_BINDING GL_TRANSFORM_FEEDBACK_BUFFER
+        GL_TRANSFORM_FEEDBACK_BUFFER_INDEX GL_TRANSFORM_FEEDBACK_BUFFER_STRIDE
+        GL_UNSIGNED_INT_10F_11F_11F_REV glBindBuffersBase glBindBuffersRange
+        glBindImageTextures glBindSamplers glBindTextures glBindVertexBuffers
+        glBufferStorage glClearTexImage glClearTexSubImage glInitGl44VERSION
+    """),
+    ('OpenGL.GL.VERSION.GL_4_5', """
+        GL_BACK GL_CLIP_DEPTH_MODE GL_CLIP_ORIGIN
+        GL_CONTEXT_FLAG_ROBUST_ACCESS_BIT GL_CONTEXT_LOST
+        GL_GUILTY_CONTEXT_RESET GL_INNOCENT_CONTEXT_RESET
+        GL_LOSE_CONTEXT_ON_RESET GL_LOWER_LEFT
+        GL_MAX_COMBINED_CLIP_AND_CULL_DISTANCES GL_MAX_CULL_DISTANCES
+        GL_NEGATIVE_ONE_TO_ONE GL_NO_ERROR GL_NO_RESET_NOTIFICATION
+        GL_QUERY_BY_REGION_NO_WAIT_INVERTED GL_QUERY_BY_REGION_WAIT_INVERTED
+        GL_QUERY_NO_WAIT_INVERTED GL_QUERY_TARGET GL_QUERY_WAIT_INVERTED
+        GL_RESET_NOTIFICATION_STRATEGY GL_TEXTURE_BINDING_1D
+        GL_TEXTURE_BINDING_1D_ARRAY GL_TEXTURE_BINDING_2D
+        GL_TEXTURE_BINDING_2D_ARRAY GL_TEXTURE_BINDING_2D_MULTISAMPLE
+        GL_TEXTURE_BINDING_2D_MULTISAMPLE_ARRAY GL_TEXTURE_BINDING_3D
+        GL_TEXTURE_BINDING_BUFFER GL_TEXTURE_BINDING_CUBE_MAP
+        GL_TEXTURE_BINDING_CUBE_MAP_ARRAY GL_TEXTURE_BINDING_RECTANGLE
+        GL_TEXTURE_TARGET GL_UNKNOWN_CONTEXT_RESET GL_UPPER_LEFT GL_ZERO_TO_ONE
+        glBindTextureUnit glBlitNamedFramebuffer glCheckNamedFramebufferStatus
+        glClearNamedBufferData glClearNamedBufferSubData
+        glClearNamedFramebufferfi glClearNamedFramebufferfv
+        glClearNamedFramebufferiv glClearNamedFramebufferuiv glClipControl
+        glCompressedTextureSubImage1D glCompressedTextureSubImage2D
+        glCompressedTextureSubImage3D glCopyNamedBufferSubData
+        glCopyTextureSubImage1D glCopyTextureSubImage2D glCopyTextureSubImage3D
+        glCreateBuffers glCreateFramebuffers glCreateProgramPipelines
+        glCreateQueries glCreateRenderbuffers glCreateSamplers glCreateTextures
+        glCreateTransformFeedbacks glCreateVertexArrays
+        glDisableVertexArrayAttrib glEnableVertexArrayAttrib
+        glFlushMappedNamedBufferRange glGenerateTextureMipmap
+        glGetCompressedTextureImage glGetCompressedTextureSubImage
+        glGetGraphicsResetStatus glGetNamedBufferParameteri64v
+        glGetNamedBufferParameteriv glGetNamedBufferPointerv
+        glGetNamedBufferSubData glGetNamedFramebufferAttachmentParameteriv
+        glGetNamedFramebufferParameteriv glGetNamedRenderbufferParameteriv
+        glGetQueryBufferObjecti64v glGetQueryBufferObjectiv
+        glGetQueryBufferObjectui64v glGetQueryBufferObjectuiv glGetTextureImage
+        glGetTextureLevelParameterfv glGetTextureLevelParameteriv
+        glGetTextureParameterIiv glGetTextureParameterIuiv
+        glGetTextureParameterfv glGetTextureParameteriv glGetTextureSubImage
+        glGetTransformFeedbacki64_v glGetTransformFeedbacki_v
+        glGetTransformFeedbackiv glGetVertexArrayIndexed64iv
+        glGetVertexArrayIndexediv glGetVertexArrayiv glGetnColorTable
+        glGetnCompressedTexImage glGetnConvolutionFilter glGetnHistogram
+        glGetnMapdv glGetnMapfv glGetnMapiv glGetnMinmax glGetnPixelMapfv
+        glGetnPixelMapuiv glGetnPixelMapusv glGetnPolygonStipple
+        glGetnSeparableFilter glGetnTexImage glGetnUniformdv glGetnUniformfv
+        glGetnUniformiv glGetnUniformuiv glInitGl45VERSION
+        glInvalidateNamedFramebufferData glInvalidateNamedFramebufferSubData
+        glMapNamedBuffer glMapNamedBufferRange glMemoryBarrierByRegion
+        glNamedBufferData glNamedBufferStorage glNamedBufferSubData
+        glNamedFramebufferDrawBuffer glNamedFramebufferDrawBuffers
+        glNamedFramebufferParameteri glNamedFramebufferReadBuffer
+        glNamedFramebufferRenderbuffer glNamedFramebufferTexture
+        glNamedFramebufferTextureLayer glNamedRenderbufferStorage
+        glNamedRenderbufferStorageMultisample glReadnPixels glTextureBarrier
+        glTextureBuffer glTextureBufferRange glTextureParameterIiv
+        glTextureParameterIuiv glTextureParameterf glTextureParameterfv
+        glTextureParameteri glTextureParameteriv glTextureStorage1D
+        glTextureStorage2D glTextureStorage2DMultisample glTextureStorage3D
+        glTextureStorage3DMultisample glTextureSubImage1D glTextureSubImage2D
+        glTextureSubImage3D glTransformFeedbackBufferBase
+        glTransformFeedbackBufferRange glUnmapNamedBuffer
+        glVertexArrayAttribBinding glVertexArrayAttribFormat
+        glVertexArrayAttribIFormat glVertexArrayAttribLFormat
+        glVertexArrayBindingDivisor glVertexArrayElementBuffer
+        glVertexArrayVertexBuffer glVertexArrayVertexBuffers
+    """),
+    ('OpenGL.GL.VERSION.GL_4_6', """
+        ARRAY_TYPE_TO_CONSTANT Constant GLDEBUGPROC GLDEBUGPROCAMD
+        GLDEBUGPROCARB GLDEBUGPROCKHR GL_BYTE GL_CHAR
+        GL_CLIPPING_INPUT_PRIMITIVES GL_CLIPPING_OUTPUT_PRIMITIVES
+        GL_COMPUTE_SHADER_INVOCATIONS GL_CONTEXT_FLAG_NO_ERROR_BIT
+        GL_CONTEXT_RELEASE_BEHAVIOR GL_CONTEXT_RELEASE_BEHAVIOR_FLUSH GL_DOUBLE
+        GL_FALSE GL_FIXED GL_FLOAT GL_FRAGMENT_SHADER_INVOCATIONS
+        GL_GEOMETRY_SHADER_INVOCATIONS GL_GEOMETRY_SHADER_PRIMITIVES_EMITTED
+        GL_HALF_FLOAT GL_HALF_NV GL_INT GL_MAX_TEXTURE_MAX_ANISOTROPY GL_NONE
+        GL_NUM_SPIR_V_EXTENSIONS GL_PARAMETER_BUFFER
+        GL_PARAMETER_BUFFER_BINDING GL_POLYGON_OFFSET_CLAMP
+        GL_PRIMITIVES_SUBMITTED GL_SHADER_BINARY_FORMAT_SPIR_V GL_SHORT
+        GL_SPIR_V_BINARY GL_SPIR_V_EXTENSIONS GL_TESS_CONTROL_SHADER_PATCHES
+        GL_TESS_EVALUATION_SHADER_INVOCATIONS GL_TEXTURE_MAX_ANISOTROPY
+        GL_TRANSFORM_FEEDBACK_OVERFLOW GL_TRANSFORM_FEEDBACK_STREAM_OVERFLOW
+        GL_TRUE GL_UNSIGNED_BYTE GL_UNSIGNED_INT GL_UNSIGNED_INT64
+        GL_UNSIGNED_SHORT GL_VERTEX_SHADER_INVOCATIONS GL_VERTICES_SUBMITTED
+        GL_VOID_P GLbitfield GLboolean GLbyte GLchar GLcharARB GLclampd
+        GLclampf GLclampx GLdouble GLdouble_2 GLdouble_3 GLdouble_4
+        GLeglImageOES GLenum GLfixed GLfloat GLfloat_2 GLfloat_3 GLfloat_4
+        GLhalfARB GLhalfNV GLhandle GLhandleARB GLint GLint64 GLint64EXT
+        GLintptr GLintptrARB GLshort GLsizei GLsizeiptr GLsizeiptrARB GLsync
+        GLubyte GLubyte_3 GLuint GLuint64 GLuint64EXT GLulong GLushort
+        GLvdpauSurfaceNV GLvoid GLvoidp as_8_bit bytes c_int ctypes_version
+        glInitGl46VERSION glMultiDrawArraysIndirectCount
+        glMultiDrawElementsIndirectCount glPolygonOffsetClamp
+        glSpecializeShader int32_t int64_t long size_t sizeof unicode void
+    """),
+    ('OpenGL.error', """
+        ArgumentError Error GLError GLUError GLUTError GLUTerror GLUerror
+        GLerror checkpoint error_scope
+    """),
+)
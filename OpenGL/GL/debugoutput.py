@@ -0,0 +1,170 @@
+"""Routing GL debug output (KHR_debug/ARB_debug_output) into logging
+
+    from OpenGL.GL import debugoutput
+    debugoutput.installDebugOutput()
+
+registers one ctypes callback for the current context, kept alive in
+OpenGL.contextdata alongside the context's other stored pointers, and
+turns each driver message into a record on the logger
+
+    OpenGL.debug.<source>.<type>
+
+e.g. OpenGL.debug.api.performance, at a level following the message's
+severity (high: ERROR, medium: WARNING, low: INFO, notification: DEBUG),
+so the usual logging configuration picks what to see.  Notifications are
+switched off in the driver unless asked for.
+
+Repeats of one message (same source, type and id) are rate limited: the
+first ``burst`` in each ``interval`` seconds are logged, the others only
+counted, and the count is logged with the first message of the next
+interval.  GL_DEBUG_TYPE_PERFORMANCE messages (buffer stalls, shader
+recompiles, redundant state...) are also counted, unlimited, as
+"performance:<source>:<id>" events in OpenGL.counters, which
+counters.frame() lists per frame.
+
+Drivers are free to say nothing on contexts created without the debug
+flag; Mesa reports errors and performance warnings either way.
+"""
+import logging, time
+from OpenGL import contextdata, counters
+from OpenGL.extensions import alternate
+from OpenGL.raw.GL._types import GLDEBUGPROC
+from OpenGL.GL.VERSION import GL_4_3
+from OpenGL.GL.VERSION.GL_1_0 import glEnable
+from OpenGL.GL.KHR import debug as KHR_debug
+from OpenGL.GL.ARB import debug_output as ARB_debug_output
+from OpenGL.raw.GL.VERSION.GL_1_0 import GL_FALSE, GL_DONT_CARE
+from OpenGL.raw.GL.VERSION.GL_4_3 import (
+    GL_DEBUG_OUTPUT, GL_DEBUG_OUTPUT_SYNCHRONOUS,
+    GL_DEBUG_SOURCE_API, GL_DEBUG_SOURCE_WINDOW_SYSTEM, GL_DEBUG_SOURCE_SHADER_COMPILER,
+    GL_DEBUG_SOURCE_THIRD_PARTY, GL_DEBUG_SOURCE_APPLICATION, GL_DEBUG_SOURCE_OTHER,
+    GL_DEBUG_TYPE_ERROR, GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR, GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR,
+    GL_DEBUG_TYPE_PORTABILITY, GL_DEBUG_TYPE_PERFORMANCE, GL_DEBUG_TYPE_OTHER,
+    GL_DEBUG_TYPE_MARKER, GL_DEBUG_TYPE_PUSH_GROUP, GL_DEBUG_TYPE_POP_GROUP,
+    GL_DEBUG_SEVERITY_HIGH, GL_DEBUG_SEVERITY_MEDIUM, GL_DEBUG_SEVERITY_LOW,
+    GL_DEBUG_SEVERITY_NOTIFICATION,
+)
+
+__all__ = ('DebugOutput','installDebugOutput','removeDebugOutput')
+
+glDebugMessageCallback = alternate(
+    'glDebugMessageCallback', GL_4_3.glDebugMessageCallback,
+    KHR_debug.glDebugMessageCallback, ARB_debug_output.glDebugMessageCallbackARB,
+)
+glDebugMessageControl = alternate(
+    'glDebugMessageControl', GL_4_3.glDebugMessageControl,
+    KHR_debug.glDebugMessageControl, ARB_debug_output.glDebugMessageControlARB,
+)
+
+CONTEXT_KEY = 'OpenGL.GL.debugoutput'
+
+def _names( prefix, *constants ):
+    return dict( (int(constant), constant.name[len(prefix):].lower()) for constant in constants )
+
+SOURCES = _names(
+    'GL_DEBUG_SOURCE_',
+    GL_DEBUG_SOURCE_API, GL_DEBUG_SOURCE_WINDOW_SYSTEM, GL_DEBUG_SOURCE_SHADER_COMPILER,
+    GL_DEBUG_SOURCE_THIRD_PARTY, GL_DEBUG_SOURCE_APPLICATION, GL_DEBUG_SOURCE_OTHER,
+)
+TYPES = _names(
+    'GL_DEBUG_TYPE_',
+    GL_DEBUG_TYPE_ERROR, GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR, GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR,
+    GL_DEBUG_TYPE_PORTABILITY, GL_DEBUG_TYPE_PERFORMANCE, GL_DEBUG_TYPE_OTHER,
+    GL_DEBUG_TYPE_MARKER, GL_DEBUG_TYPE_PUSH_GROUP, GL_DEBUG_TYPE_POP_GROUP,
+)
+LEVELS = {
+    int(GL_DEBUG_SEVERITY_HIGH): logging.ERROR,
+    int(GL_DEBUG_SEVERITY_MEDIUM): logging.WARNING,
+    int(GL_DEBUG_SEVERITY_LOW): logging.INFO,
+    int(GL_DEBUG_SEVERITY_NOTIFICATION): logging.DEBUG,
+}
+
+class DebugOutput( object ):
+    """Debug message callback routing messages into logging
+
+    burst -- messages with the same source, type and id logged per interval
+    interval -- seconds after which a repeated message is logged again
+    """
+    def __init__( self, burst=5, interval=10.0, prefix='OpenGL.debug' ):
+        self.burst = burst
+        self.interval = interval
+        self.prefix = prefix
+        self.loggers = {}
+        self.windows = {}
+        self.callback = GLDEBUGPROC( self )
+    def logger( self, source, type ):
+        key = (source, type)
+        log = self.loggers.get( key )
+        if log is None:
+            log = self.loggers[key] = logging.getLogger( '%s.%s.%s'%(
+                self.prefix,
+                SOURCES.get( source, 'source_0x%x'%( source, )),
+                TYPES.get( type, 'type_0x%x'%( type, )),
+            ))
+        return log
+    def __call__( self, source, type, id, severity, length, message, userParam ):
+        # exceptions cannot propagate into the driver, log them instead
+        try:
+            self.handle( source, type, id, severity, (message or b'')[:length] if length >= 0 else message or b'' )
+        except Exception:
+            logging.getLogger( self.prefix ).exception( 'Failure handling debug message' )
+    def handle( self, source, type, id, severity, message ):
+        """Count and (rate-limited) log one message"""
+        if type == GL_DEBUG_TYPE_PERFORMANCE:
+            counters.event( 'performance:%s:%d'%( SOURCES.get( source, source ), id ))
+        key = (source, type, id)
+        now = time.monotonic()
+        window = self.windows.get( key )
+        suppressed = 0
+        if window is None or now - window[0] >= self.interval:
+            if window is not None:
+                suppressed = window[1] - self.burst
+            window = self.windows[key] = [now, 0]
+        window[1] += 1
+        if window[1] > self.burst:
+            return
+        text = message.decode( 'utf-8', 'replace' ) if isinstance( message, bytes ) else str( message )
+        if suppressed > 0:
+            text = '%s (%d repeats suppressed)'%( text, suppressed )
+        self.logger( source, type ).log(
+            LEVELS.get( severity, logging.WARNING ), '0x%x: %s', id, text,
+        )
+
+def installDebugOutput( burst=5, interval=10.0, synchronous=True, notifications=False ):
+    """Route the current context's debug output into logging
+
+    synchronous -- deliver messages inside the GL call that caused them,
+        so the log record's stack (and any logging.exception) points at it
+    notifications -- keep GL_DEBUG_SEVERITY_NOTIFICATION messages enabled
+
+    Installs once per context, later calls return the existing handler.
+
+    returns the DebugOutput, or None if the context has neither extension
+    """
+    handler = contextdata.getValue( CONTEXT_KEY )
+    if handler is not None:
+        return handler
+    if not glDebugMessageCallback:
+        return None
+    handler = DebugOutput( burst, interval )
+    contextdata.setValue( CONTEXT_KEY, handler )
+    glDebugMessageCallback( handler.callback, None )
+    if GL_4_3.glDebugMessageCallback or KHR_debug.glInitDebugKHR():
+        # ARB_debug_output has no enable, it is on in debug contexts
+        glEnable( GL_DEBUG_OUTPUT )
+    if synchronous:
+        glEnable( GL_DEBUG_OUTPUT_SYNCHRONOUS )
+    if not notifications:
+        glDebugMessageControl(
+            GL_DONT_CARE, GL_DONT_CARE, GL_DEBUG_SEVERITY_NOTIFICATION, 0, None, GL_FALSE,
+        )
+    return handler
+
+def removeDebugOutput( ):
+    """Unregister the current context's handler, returns whether there was one"""
+    handler = contextdata.getValue( CONTEXT_KEY )
+    if handler is None:
+        return False
+    glDebugMessageCallback( GLDEBUGPROC(), None )
+    contextdata.delValue( CONTEXT_KEY )
+    return True
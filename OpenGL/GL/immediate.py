@@ -0,0 +1,529 @@
+"""Immediate-mode emulation, glBegin/glEnd batched into buffer draws
+
+With PYOPENGL_IMMEDIATE_EMULATION=1 (OpenGL.IMMEDIATE_EMULATION) these
+names in OpenGL.GL come from this module rather than the driver:
+
+    glBegin, glEnd, glNewList, glEndList, glVertex, glColor,
+    glVertex{2,3,4}{s,i,f,d}[v], glColor{3,4}{b,s,i,f,d,ub,us,ui}[v],
+    glNormal3{b,s,i,f,d}[v], glTexCoord{1,2,3,4}{s,i,f,d}[v]
+
+Vertices are appended, with the current colour, normal and texture
+coordinate, to a client-side float array.  glEnd records the primitive
+run; nothing is sent to GL until the thread's next other GL/GLU/GLUT
+call, buffer swap or make-current (see baseplatform.deferredWork), or
+until MAXIMUM_VERTICES are waiting.  Then all runs go to one buffer
+object, quads, strips, fans and polygons are turned into indexed
+triangles (line strips and loops into lines), and each stretch of
+triangles, lines or points is one glDrawElements with a built-in shader.
+Consecutive glBegin/glEnd blocks separated only by glColor/glNormal/
+glVertex calls therefore become a single draw.  Other calls made between
+glBegin and glEnd (glMaterial*, glMultiTexCoord*, glEdgeFlag*, glIndex*,
+glArrayElement, glEvalCoord*...) go to the driver and do not affect the
+batched vertices.
+
+The shader covers the fixed-function subset legacy code mostly uses:
+per-vertex colour with smooth shading, GL_TEXTURE_2D on unit 0
+modulating the colour, and GL_LIGHTING with GL_LIGHT0 and colour
+material (ambient and diffuse from the vertex colour).  The transform,
+light and texture state are read from the compatibility context's
+built-in uniforms and glIsEnabled when the batch is drawn.  Fog, alpha
+test, flat shading, texture matrices, further lights and lights without
+colour material are not emulated; glPolygonMode(GL_LINE) shows the
+triangulation.
+
+On a core profile context, where none of that state exists, the shader
+multiplies by the matrix given to setTransform (layout as glLoadMatrixf)
+and modulates by whatever 2D texture is bound to unit 0.  OpenGL ES
+contexts are reached through OpenGL.GLES*, which this does not cover.
+
+While a display list is being compiled (glNewList ... glEndList) the
+calls go straight to the driver, so lists keep working on compatibility
+contexts.  Code importing the entry points from OpenGL.GL.VERSION.GL_1_0
+or the raw modules bypasses the emulation.
+
+Positions go through ftransform() and quads are split as Mesa does, so
+depths match the driver's own immediate mode; coplanar surfaces drawn
+partly through the emulation and partly by the driver can still differ
+by rounding.
+
+Every GL/GLU/GLUT entry point gains a Python-level check for pending work
+(about 150ns on CPython 3.11), against roughly halving the cost of each
+glVertex/glColor call and sending one draw per batch.  Needs OpenGL 3.0
+(vertex array objects); Mesa llvmpipe works.
+"""
+import ctypes, functools, itertools, operator, threading
+from array import array
+import numpy
+from OpenGL import contextdata, error
+from OpenGL.platform import baseplatform
+from OpenGL.GL import exceptional, shaders
+from OpenGL.GL.VERSION import GL_1_0
+from OpenGL.GL.VERSION.GL_1_5 import glGenBuffers
+from OpenGL.GL.VERSION.GL_2_0 import glCreateProgram, glAttachShader, glDeleteShader
+from OpenGL.GL.VERSION.GL_3_0 import glGenVertexArrays
+from OpenGL.raw.GL._types import GLint
+from OpenGL.raw.GL.VERSION.GL_1_0 import (
+    GL_POINTS, GL_LINES, GL_LINE_LOOP, GL_LINE_STRIP, GL_TRIANGLES, GL_TRIANGLE_STRIP,
+    GL_TRIANGLE_FAN, GL_QUADS, GL_QUAD_STRIP, GL_POLYGON, GL_FLOAT, GL_FALSE,
+    GL_INVALID_ENUM, GL_INVALID_OPERATION, GL_LIGHTING, GL_TEXTURE_2D, GL_VERSION,
+    glGetIntegerv, glIsEnabled,
+)
+from OpenGL.raw.GL.VERSION.GL_1_1 import GL_UNSIGNED_INT, GL_TEXTURE_BINDING_2D, glDrawElements
+from OpenGL.raw.GL.VERSION.GL_1_5 import (
+    GL_ARRAY_BUFFER, GL_ARRAY_BUFFER_BINDING, GL_ELEMENT_ARRAY_BUFFER, GL_STREAM_DRAW,
+    glBindBuffer, glBufferData,
+)
+from OpenGL.raw.GL.VERSION.GL_2_0 import (
+    GL_CURRENT_PROGRAM, GL_FRAGMENT_SHADER, GL_VERTEX_SHADER,
+    glBindAttribLocation, glEnableVertexAttribArray, glGetUniformLocation, glLinkProgram,
+    glUniform1i, glUniformMatrix4fv, glUseProgram, glVertexAttribPointer,
+)
+from OpenGL.raw.GL.VERSION.GL_3_0 import GL_VERTEX_ARRAY_BINDING, glBindVertexArray
+from OpenGL.raw.GL.VERSION.GL_3_2 import GL_CONTEXT_PROFILE_MASK, GL_CONTEXT_CORE_PROFILE_BIT
+
+__all__ = ('EMULATED','MAXIMUM_VERTICES','setTransform','flush')
+
+CONTEXT_KEY = 'OpenGL.GL.immediate'
+MAXIMUM_VERTICES = 1 << 16
+
+# floats per vertex: position 4, colour 4, normal 3, texture coordinate 4
+STRIDE = 15
+ATTRIBUTES = (('position', 4, 0), ('color', 4, 4), ('normal', 3, 8), ('texCoord', 4, 11))
+
+# what each glBegin mode is drawn as
+PRIMITIVES = {
+    int(GL_POINTS): GL_POINTS,
+    int(GL_LINES): GL_LINES,
+    int(GL_LINE_STRIP): GL_LINES,
+    int(GL_LINE_LOOP): GL_LINES,
+    int(GL_TRIANGLES): GL_TRIANGLES,
+    int(GL_TRIANGLE_STRIP): GL_TRIANGLES,
+    int(GL_TRIANGLE_FAN): GL_TRIANGLES,
+    int(GL_QUADS): GL_TRIANGLES,
+    int(GL_QUAD_STRIP): GL_TRIANGLES,
+    int(GL_POLYGON): GL_TRIANGLES,
+}
+
+# position goes to generic attribute 0, which is gl_Vertex here, so that
+# ftransform() gives the same depths as fixed-function drawing
+LEGACY_SHADERS = ("""#version 120
+attribute vec4 color;
+attribute vec3 normal;
+attribute vec4 texCoord;
+uniform bool lighting;
+varying vec4 vColor;
+varying vec4 vTexCoord;
+void main() {
+    vec4 eye = gl_ModelViewMatrix * gl_Vertex;
+    gl_Position = ftransform();
+    gl_ClipVertex = eye;
+    vTexCoord = texCoord;
+    vColor = color;
+    if (lighting) {
+        vec4 light = gl_LightSource[0].position;
+        vec3 direction = normalize( light.w == 0.0 ? light.xyz : light.xyz - eye.xyz );
+        float diffuse = max( dot( normalize( gl_NormalMatrix * normal ), direction ), 0.0 );
+        vColor.rgb = color.rgb * (
+            gl_LightModel.ambient.rgb + gl_LightSource[0].ambient.rgb
+            + diffuse * gl_LightSource[0].diffuse.rgb
+        );
+    }
+}
+""", """#version 120
+uniform bool texturing;
+uniform sampler2D texture0;
+varying vec4 vColor;
+varying vec4 vTexCoord;
+void main() {
+    gl_FragColor = texturing ? vColor * texture2DProj( texture0, vTexCoord ) : vColor;
+}
+""")
+CORE_SHADERS = ("""#version 150
+in vec4 position;
+in vec4 color;
+in vec3 normal;
+in vec4 texCoord;
+uniform mat4 transform;
+out vec4 vColor;
+out vec4 vTexCoord;
+void main() {
+    gl_Position = transform * position;
+    vColor = color;
+    vTexCoord = texCoord;
+}
+""", """#version 150
+uniform bool texturing;
+uniform sampler2D texture0;
+in vec4 vColor;
+in vec4 vTexCoord;
+out vec4 fragColor;
+void main() {
+    fragColor = texturing ? vColor * textureProj( texture0, vTexCoord ) : vColor;
+}
+""")
+
+class _Batch( object ):
+    """A thread's pending vertices and primitive runs
+
+    segments -- [(primitive, [(mode, count, first), ...]), ...], one
+        entry per stretch of runs drawn as the same primitive
+    current -- colour, normal and texture coordinate for the next vertex
+    mode -- the glBegin mode while inside glBegin/glEnd, else None
+    dirty -- current has changed since it was last given to GL
+    direct -- a display list is being compiled, pass calls through
+    """
+    __slots__ = ('vertices','segments','current','mode','first','dirty','direct','transform')
+    def __init__( self ):
+        self.vertices = array( 'f' )
+        self.segments = []
+        self.current = array( 'f', (1.0,1.0,1.0,1.0, 0.0,0.0,1.0, 0.0,0.0,0.0,1.0) )
+        self.mode = None
+        self.first = 0
+        self.dirty = False
+        self.direct = False
+        self.transform = numpy.identity( 4, dtype='f' )
+
+class _ThreadBatch( threading.local ):
+    """Holds the thread's _Batch, looked up once per call"""
+    def __init__( self ):
+        self.batch = _Batch()
+_thread = _ThreadBatch()
+
+def _pending( ):
+    """Have the thread's next GL call flush the batch"""
+    baseplatform.deferredWork.flush = flush
+
+def _changed( batch ):
+    """Current attributes changed, GL is to be told at the next flush"""
+    batch.dirty = True
+    baseplatform.deferredWork.flush = flush
+
+def _invalid( err, operation, description ):
+    return error.GLError( err=err, baseOperation=operation, description=description )
+
+@functools.lru_cache( maxsize=4096 )
+def _pattern( mode, count ):
+    """Indices, relative to the run's first vertex, drawing a glBegin run"""
+    vertices = numpy.arange( count, dtype='I' )
+    if mode in (GL_POINTS, GL_LINES, GL_TRIANGLES):
+        return vertices[:count - count % {GL_POINTS: 1, GL_LINES: 2, GL_TRIANGLES: 3}[mode]]
+    if mode in (GL_LINE_STRIP, GL_LINE_LOOP):
+        if count < 2:
+            return vertices[:0]
+        ends = numpy.append( vertices[1:], vertices[:1] ) if mode == GL_LINE_LOOP and count > 2 else vertices[1:]
+        return numpy.stack( (vertices[:len( ends )], ends), axis=1 ).ravel()
+    if mode == GL_TRIANGLE_STRIP:
+        triangles = numpy.stack( (vertices[:-2], vertices[1:-1], vertices[2:]), axis=1 )
+        # keep the winding of every other triangle
+        triangles[1::2,:2] = triangles[1::2,1::-1]
+        return triangles.ravel()
+    if mode in (GL_TRIANGLE_FAN, GL_POLYGON):
+        triangles = numpy.zeros( (max( count - 2, 0 ), 3), dtype='I' )
+        triangles[:,1] = vertices[1:-1]
+        triangles[:,2] = vertices[2:]
+        return triangles.ravel()
+    if mode == GL_QUADS:
+        corners = vertices[:count - count % 4].reshape( (-1, 4) )
+        return corners[:,(0,1,2,0,2,3)].ravel()
+    if mode == GL_QUAD_STRIP:
+        pairs = vertices[:count - count % 2].reshape( (-1, 2) )
+        quads = numpy.concatenate( (pairs[:-1], pairs[1:]), axis=1 )
+        return quads[:,(0,1,3,0,3,2)].ravel()
+    raise _invalid( GL_INVALID_ENUM, glBegin, 'unknown glBegin mode %r'%( mode, ))
+
+class _Renderer( object ):
+    """Program, vertex array and buffers drawing batches on one context"""
+    def __init__( self ):
+        version = GL_1_0.glGetString( GL_VERSION ).split( b' ' )[0].split( b'.' )
+        profile = GLint( 0 )
+        if (int( version[0] ), int( version[1] )) >= (3, 2):
+            glGetIntegerv( GL_CONTEXT_PROFILE_MASK, profile )
+        self.legacy = not (profile.value & GL_CONTEXT_CORE_PROFILE_BIT)
+        self.program = self.link( *(LEGACY_SHADERS if self.legacy else CORE_SHADERS) )
+        self.uniforms = dict(
+            (name, glGetUniformLocation( self.program, name.encode() ))
+            for name in ('lighting','texturing','texture0','transform')
+        )
+        self.values = {}
+        self.vertexArray = glGenVertexArrays( 1 )
+        self.vertexBuffer, self.indexBuffer = glGenBuffers( 2 )
+        self.saved = GLint( 0 )
+        previous = self.save()
+        glBindVertexArray( self.vertexArray )
+        glBindBuffer( GL_ARRAY_BUFFER, self.vertexBuffer )
+        glBindBuffer( GL_ELEMENT_ARRAY_BUFFER, self.indexBuffer )
+        for location, (name, size, offset) in enumerate( ATTRIBUTES ):
+            glEnableVertexAttribArray( location )
+            glVertexAttribPointer( location, size, GL_FLOAT, GL_FALSE, STRIDE * 4, ctypes.c_void_p( offset * 4 ))
+        self.restore( previous )
+    def link( self, vertex, fragment ):
+        compiled = [
+            shaders.compileShader( vertex, GL_VERTEX_SHADER ),
+            shaders.compileShader( fragment, GL_FRAGMENT_SHADER ),
+        ]
+        program = shaders.ShaderProgram( glCreateProgram() )
+        for shader in compiled:
+            glAttachShader( program, shader )
+        for location, (name, size, offset) in enumerate( ATTRIBUTES ):
+            glBindAttribLocation( program, location, name.encode() )
+        glLinkProgram( program )
+        program.check_linked()
+        for shader in compiled:
+            glDeleteShader( shader )
+        return program
+    def integer( self, pname ):
+        glGetIntegerv( pname, self.saved )
+        return self.saved.value
+    def save( self ):
+        return (
+            self.integer( GL_CURRENT_PROGRAM ),
+            self.integer( GL_VERTEX_ARRAY_BINDING ),
+            self.integer( GL_ARRAY_BUFFER_BINDING ),
+        )
+    def restore( self, previous ):
+        program, vertexArray, buffer = previous
+        glUseProgram( program )
+        glBindVertexArray( vertexArray )
+        glBindBuffer( GL_ARRAY_BUFFER, buffer )
+    def uniform( self, name, value ):
+        if self.values.get( name ) != value:
+            glUniform1i( self.uniforms[name], value )
+            self.values[name] = value
+    def draw( self, vertices, count, segments, transform ):
+        """Upload count vertices and draw the segments' runs"""
+        ranges, patterns, total = [], [], 0
+        for primitive, runs in segments:
+            start = total
+            # consecutive runs of one mode and length share an index pattern
+            for (mode, size), group in itertools.groupby( runs, operator.itemgetter( 0, 1 )):
+                pattern = _pattern( mode, size )
+                firsts = numpy.array( [run[2] for run in group], dtype='I' )
+                patterns.append( (pattern + firsts[:,None]).ravel() )
+                total += patterns[-1].size
+            ranges.append( (primitive, start, total - start) )
+        indices = numpy.concatenate( patterns )
+        previous = self.save()
+        glUseProgram( self.program )
+        if self.legacy:
+            self.uniform( 'lighting', int( bool( glIsEnabled( GL_LIGHTING ))))
+            self.uniform( 'texturing', int( bool( glIsEnabled( GL_TEXTURE_2D ))))
+        else:
+            self.uniform( 'texturing', int( bool( self.integer( GL_TEXTURE_BINDING_2D ))))
+            glUniformMatrix4fv( self.uniforms['transform'], 1, GL_FALSE, transform )
+        glBindVertexArray( self.vertexArray )
+        glBindBuffer( GL_ARRAY_BUFFER, self.vertexBuffer )
+        glBufferData( GL_ARRAY_BUFFER, count * STRIDE * 4, ctypes.c_void_p( vertices.buffer_info()[0] ), GL_STREAM_DRAW )
+        glBufferData( GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, ctypes.c_void_p( indices.ctypes.data ), GL_STREAM_DRAW )
+        for primitive, start, size in ranges:
+            if size:
+                glDrawElements( primitive, size, GL_UNSIGNED_INT, ctypes.c_void_p( start * 4 ))
+        self.restore( previous )
+
+def _renderer( ):
+    renderer = contextdata.getValue( CONTEXT_KEY )
+    if renderer is None:
+        renderer = _Renderer()
+        contextdata.setValue( CONTEXT_KEY, renderer )
+    return renderer
+
+def flush( ):
+    """Draw the thread's pending primitives and hand GL the current attributes
+
+    Called automatically before other GL calls; call it directly only
+    when drawing through entry points that bypass the emulation.
+    """
+    batch = _thread.batch
+    baseplatform.deferredWork.flush = None
+    if not (batch.segments or batch.dirty):
+        return
+    renderer = _renderer()
+    if batch.segments:
+        vertices, segments = batch.vertices, batch.segments
+        batch.segments = []
+        if batch.mode is None:
+            batch.vertices, count = array( 'f' ), len( vertices ) // STRIDE
+        else:
+            # a call between glBegin and glEnd, keep the open run
+            count = batch.first
+            batch.vertices = vertices[count * STRIDE:]
+            batch.first = 0
+        renderer.draw( vertices, count, segments, batch.transform )
+    if batch.dirty and batch.mode is None:
+        batch.dirty = False
+        if renderer.legacy:
+            current = batch.current
+            GL_1_0.glColor4f( current[0], current[1], current[2], current[3] )
+            GL_1_0.glNormal3f( current[4], current[5], current[6] )
+            GL_1_0.glTexCoord4f( current[7], current[8], current[9], current[10] )
+
+def setTransform( matrix ):
+    """Set the 4x4 clip-space transform used on core profile contexts
+
+    matrix -- 16 floats laid out as for glLoadMatrixf (projection times
+        modelview); compatibility contexts use their own matrix stacks
+    """
+    _thread.batch.transform = numpy.array( matrix, dtype='f' ).reshape( (4,4) )
+
+def glBegin( mode ):
+    """Start collecting a primitive run"""
+    batch = _thread.batch
+    if batch.direct:
+        return exceptional.glBegin( mode )
+    if batch.mode is not None:
+        raise _invalid( GL_INVALID_OPERATION, glBegin, 'glBegin inside glBegin/glEnd' )
+    if mode not in PRIMITIVES:
+        raise _invalid( GL_INVALID_ENUM, glBegin, 'unknown glBegin mode %r'%( mode, ))
+    batch.mode = mode
+    batch.first = len( batch.vertices ) // STRIDE
+
+def glEnd( ):
+    """Finish the run, queueing it to be drawn with the next flush"""
+    batch = _thread.batch
+    if batch.direct:
+        return exceptional.glEnd()
+    mode = batch.mode
+    if mode is None:
+        raise _invalid( GL_INVALID_OPERATION, glEnd, 'glEnd without glBegin' )
+    count = len( batch.vertices ) // STRIDE
+    primitive = PRIMITIVES[mode]
+    run = (int( mode ), count - batch.first, batch.first)
+    if batch.segments and batch.segments[-1][0] is primitive:
+        batch.segments[-1][1].append( run )
+    else:
+        batch.segments.append( (primitive, [run]) )
+    batch.mode = None
+    _pending()
+    if count >= MAXIMUM_VERTICES:
+        flush()
+
+def glNewList( list, mode ):
+    """Flush, then let calls through to the driver until glEndList"""
+    flush()
+    _thread.batch.direct = True
+    return GL_1_0.glNewList( list, mode )
+
+def glEndList( ):
+    """Finish the display list, back to batching"""
+    _thread.batch.direct = False
+    return GL_1_0.glEndList()
+
+# scale and bias turning each type's values into floats, integers as
+# normalised colours and normals the way the driver converts them
+NORMALIZED = {
+    'b': (2/255., 1/255.), 's': (2/65535., 1/65535.), 'i': (2/4294967295., 1/4294967295.),
+    'ub': (1/255., 0.0), 'us': (1/65535., 0.0), 'ui': (1/4294967295., 0.0),
+    'f': (1.0, 0.0), 'd': (1.0, 0.0),
+}
+
+def _vertexFunction( name, size ):
+    real = getattr( GL_1_0, name )
+    if size == 2:
+        def vertex( x, y ):
+            batch = _thread.batch
+            if batch.direct:
+                return real( x, y )
+            vertices = batch.vertices
+            vertices.extend( (x, y, 0.0, 1.0) )
+            vertices.extend( batch.current )
+    elif size == 3:
+        def vertex( x, y, z ):
+            batch = _thread.batch
+            if batch.direct:
+                return real( x, y, z )
+            vertices = batch.vertices
+            vertices.extend( (x, y, z, 1.0) )
+            vertices.extend( batch.current )
+    else:
+        def vertex( x, y, z, w ):
+            batch = _thread.batch
+            if batch.direct:
+                return real( x, y, z, w )
+            vertices = batch.vertices
+            vertices.extend( (x, y, z, w) )
+            vertices.extend( batch.current )
+    vertex.__name__ = name
+    return vertex
+
+def _vectorFunction( name, scalar ):
+    real = getattr( GL_1_0, name )
+    def vector( v ):
+        if _thread.batch.direct:
+            return real( v )
+        return scalar( *v )
+    vector.__name__ = name
+    return vector
+
+def _attributeFunction( name, offset, size, default=(), scale=1.0, bias=0.0 ):
+    """Setter for size current attributes at offset, filling in default"""
+    real = getattr( GL_1_0, name )
+    def attribute( *values ):
+        batch = _thread.batch
+        current = batch.current
+        for index, value in enumerate( values ):
+            current[offset + index] = value * scale + bias
+        for index, value in enumerate( default ):
+            current[offset + size + index] = value
+        if batch.direct:
+            return real( *values )
+        if not batch.dirty:
+            _changed( batch )
+    attribute.__name__ = name
+    return attribute
+
+EMULATED = ['glBegin', 'glEnd', 'glNewList', 'glEndList', 'glVertex', 'glColor']
+
+def _define( name, function ):
+    """Bind name and name+'v' in this module, listing both in EMULATED"""
+    globals()[name] = function
+    globals()[name + 'v'] = _vectorFunction( name + 'v', function )
+    EMULATED.extend( (name, name + 'v') )
+
+for _suffix in ('s','i','f','d'):
+    for _size in (2,3,4):
+        _name = 'glVertex%d%s'%( _size, _suffix )
+        _define( _name, _vertexFunction( _name, _size ) )
+    for _size, _default in ((1, (0.0,0.0,1.0)), (2, (0.0,1.0)), (3, (1.0,)), (4, ())):
+        _name = 'glTexCoord%d%s'%( _size, _suffix )
+        _define( _name, _attributeFunction( _name, 7, _size, _default ) )
+for _suffix, (_scale, _bias) in NORMALIZED.items():
+    for _size, _default in ((3, (1.0,)), (4, ())):
+        _name = 'glColor%d%s'%( _size, _suffix )
+        _define( _name, _attributeFunction( _name, 0, _size, _default, _scale, _bias ) )
+    if not _suffix.startswith( 'u' ):
+        _name = 'glNormal3%s'%( _suffix, )
+        _define( _name, _attributeFunction( _name, 4, 3, (), _scale, _bias ) )
+del _suffix, _size, _default, _scale, _bias, _name
+EMULATED = tuple( EMULATED )
+
+# the commonest calls, without the generic setters' loops
+def glColor3f( red, green, blue ):
+    batch = _thread.batch
+    current = batch.current
+    current[0] = red; current[1] = green; current[2] = blue; current[3] = 1.0
+    if batch.direct:
+        return GL_1_0.glColor3f( red, green, blue )
+    if not batch.dirty:
+        _changed( batch )
+glColor3fv = _vectorFunction( 'glColor3fv', glColor3f )
+
+def glNormal3f( nx, ny, nz ):
+    batch = _thread.batch
+    current = batch.current
+    current[4] = nx; current[5] = ny; current[6] = nz
+    if batch.direct:
+        return GL_1_0.glNormal3f( nx, ny, nz )
+    if not batch.dirty:
+        _changed( batch )
+glNormal3fv = _vectorFunction( 'glNormal3fv', glNormal3f )
+
+def glVertex( *args ):
+    """Choose glVertex2d/3d/4d based on number of args"""
+    if len(args) == 1:
+        args = args[0]
+    return (glVertex2d, glVertex3d, glVertex4d)[len( args ) - 2]( *args )
+
+def glColor( *args ):
+    """Choose glColor3d/4d based on number of args"""
+    if len(args) == 1:
+        args = args[0]
+    return (glColor3d, glColor4d)[len( args ) - 3]( *args )
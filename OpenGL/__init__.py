@@ -69,13 +69,80 @@ import occurs the flags should no longer be changed.
     CONTEXT_CHECKING -- if set to True, PyOpenGL will wrap
         *every* GL and GLU call with a check to see if there
         is a valid context.  If there is no valid context
-        then will throw OpenGL.errors.NoContext.  This is an
-        *extremely* slow check and is not enabled by default,
+        then will throw OpenGL.errors.NoContext.  This is a
+        slow check and is not enabled by default,
         intended to be enabled in order to track down (wrong)
         code that uses GL/GLU entry points before the context
         has been initialized (something later Linux GLs are
         very picky about).
 
+        Once a thread makes a context current through PyOpenGL's
+        GLX/EGL/OSMesa/WGL/GLUT entry points the check reads a
+        per-thread record instead of asking the driver; call
+        OpenGL.platform.forgetCurrentContext() if you then switch
+        contexts through another toolkit on that thread.
+
+        Default: False
+
+    DEFERRED_ERROR_CHECKING -- if set to True (with ERROR_CHECKING),
+        GL/GLU/GLES calls do not call glGetError after every
+        call.  They only record their names in a small ring
+        buffer, and errors are polled at checkpoints: every
+        ERROR_CHECK_INTERVAL calls (if non-zero), before each
+        glutSwapBuffers/eglSwapBuffers/glXSwapBuffers/
+        wglSwapBuffers, at the end of an OpenGL.error.error_scope()
+        block, or on OpenGL.error.checkpoint().  The GLError raised
+        lists the recent calls (recentOperations) to narrow down
+        the culprit.  Can be switched per API at run-time with
+        OpenGL.raw.GL._errors._error_checker.defer()/.immediate().
+
+        Default: False
+
+    ERROR_CHECK_INTERVAL -- number of calls between automatic
+        polls with DEFERRED_ERROR_CHECKING, 0 to poll only at
+        checkpoints.
+
+        Default: 0
+
+    EXTENSION_CACHE -- if True, remember each GL driver's extension
+        set and which extension entry points it lacks in a small file
+        under the user cache directory (PYOPENGL_CACHE_DIR to move
+        it), keyed by vendor, renderer, version and platform, so
+        later runs on the same driver skip the discovery queries.
+        See OpenGL._extensioncache.
+
+        Default: True
+
+    PROFILING -- if True, keep a call count, cumulative and maximum
+        time and array bytes for every entry point, see
+        OpenGL.counters for the snapshot, reset and per-frame report
+        functions.  Costs two clock reads per call; when False the
+        entry points are not wrapped at all.
+
+        Default: False
+
+    TRACE_FILE -- if set to a path, every GL/GLU/GLUT call is
+        recorded (entry point, time, scalar arguments, array contents
+        up to TRACE_COPY_LIMIT bytes) into a binary trace there, for
+        ``python -m OpenGL.trace summary|replay``.  Read from
+        PYOPENGL_TRACE.  See OpenGL.trace.
+
+        Default: "" (no tracing)
+
+    TRACE_COPY_LIMIT -- largest array, in bytes, whose contents
+        TRACE_FILE stores; larger arrays are only hashed.
+
+        Default: 65536
+
+    IMMEDIATE_EMULATION -- if True, OpenGL.GL's glBegin/glEnd,
+        glVertex*, glColor*, glNormal* and glTexCoord* come from
+        OpenGL.GL.immediate, which collects the vertices into client
+        side arrays and draws them with a built-in shader from a
+        buffer object, in one draw per run of primitives, before the
+        next other GL/GLU/GLUT call or buffer swap.  Read from
+        PYOPENGL_IMMEDIATE_EMULATION.  See OpenGL.GL.immediate for
+        the fixed-function subset it covers.
+
         Default: False
 
     STORE_POINTERS -- if set to True, PyOpenGL array operations
@@ -203,6 +270,13 @@ FORWARD_COMPATIBLE_ONLY = False
 SIZE_1_ARRAY_UNPACK = True
 USE_ACCELERATE = environ_key("USE_ACCELERATE", True)
 CONTEXT_CHECKING = environ_key("CONTEXT_CHECKING", False)
+DEFERRED_ERROR_CHECKING = environ_key("DEFERRED_ERROR_CHECKING", False)
+ERROR_CHECK_INTERVAL = int(os.environ.get("PYOPENGL_ERROR_CHECK_INTERVAL", 0))
+EXTENSION_CACHE = environ_key("EXTENSION_CACHE", True)
+PROFILING = environ_key("PROFILING", False)
+TRACE_FILE = os.environ.get("PYOPENGL_TRACE", "")
+TRACE_COPY_LIMIT = int(os.environ.get("PYOPENGL_TRACE_COPY_LIMIT", 65536))
+IMMEDIATE_EMULATION = environ_key("IMMEDIATE_EMULATION", False)
 
 FULL_LOGGING = environ_key("FULL_LOGGING", False)
 ALLOW_NUMPY_SCALARS = environ_key("ALLOW_NUMPY_SCALARS", False)
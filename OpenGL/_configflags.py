@@ -10,6 +10,13 @@ from OpenGL import (
     SIZE_1_ARRAY_UNPACK,
     USE_ACCELERATE,
     CONTEXT_CHECKING,
+    DEFERRED_ERROR_CHECKING,
+    ERROR_CHECK_INTERVAL,
+    EXTENSION_CACHE,
+    PROFILING,
+    TRACE_FILE,
+    TRACE_COPY_LIMIT,
+    IMMEDIATE_EMULATION,
 
     FULL_LOGGING,
     ALLOW_NUMPY_SCALARS,
@@ -0,0 +1,127 @@
+"""On-disk cache of extension availability per GL driver
+
+Finding a context's extensions means walking glGetStringi (or splitting
+glGetString( GL_EXTENSIONS )), and resolving each extension entry point
+is a GetProcAddress round trip.  Both answers are fixed for a given
+driver, so they are kept in a small JSON file under the user's cache
+directory, keyed by GL_VENDOR, GL_RENDERER, GL_VERSION and the platform.
+The key is read from the context the first time its extensions are
+queried; when a file matches, its extension set is used as-is and entry
+points it records as missing are not looked up again.
+
+Only availability is stored, never addresses, which change from run to
+run.  Set PYOPENGL_EXTENSION_CACHE=0 to disable the cache and
+PYOPENGL_CACHE_DIR to keep it somewhere else.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sys
+from OpenGL import _configflags
+from OpenGL._bytes import as_8_bit
+_log = logging.getLogger( 'OpenGL.extensions' )
+
+FORMAT = 1
+# variables that change what a driver reports without changing its strings
+ENVIRONMENT = ('MESA_EXTENSION_OVERRIDE',)
+
+class DriverEntry( object ):
+    """Extension set and entry-point availability for one driver"""
+    def __init__( self, key, extensions, procedures=None ):
+        self.key = key
+        self.extensions = frozenset( extensions )
+        self.procedures = dict( procedures or () )
+        self.dirty = False
+
+_current = None
+
+def cacheDirectory( ):
+    """Directory holding the cache files"""
+    directory = os.environ.get( 'PYOPENGL_CACHE_DIR' )
+    if directory:
+        return directory
+    if sys.platform == 'win32':
+        base = os.environ.get( 'LOCALAPPDATA' ) or os.path.expanduser( '~\\AppData\\Local' )
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser( '~/Library/Caches' )
+    else:
+        base = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.expanduser( '~/.cache' )
+    return os.path.join( base, 'pyopengl' )
+
+def driverKey( vendor, renderer, version, platform ):
+    """Key for the driver behind the current context"""
+    key = [
+        (value or b'').decode( 'latin-1' ) if isinstance( value, bytes ) else str( value or '' )
+        for value in (vendor, renderer, version)
+    ]
+    key.append( platform.__class__.__name__ )
+    key.extend( os.environ.get( name, '' ) for name in ENVIRONMENT )
+    return tuple( key )
+
+def _path( key ):
+    digest = hashlib.sha1( json.dumps( key ).encode( 'utf-8' )).hexdigest()[:16]
+    return os.path.join( cacheDirectory(), 'extensions-%s.json'%( digest, ))
+
+def load( key ):
+    """Make the cached entry for key current, None if there is none"""
+    global _current
+    _current = None
+    if not _configflags.EXTENSION_CACHE:
+        return None
+    try:
+        with open( _path( key ) ) as handle:
+            data = json.load( handle )
+        if data['format'] != FORMAT or tuple( data['key'] ) != key:
+            return None
+        _current = DriverEntry(
+            key,
+            [as_8_bit( name ) for name in data['extensions']],
+            data['procedures'],
+        )
+    except (OSError, ValueError, KeyError, TypeError) as err:
+        return None
+    return _current
+
+def store( key, extensions ):
+    """Record the extension set found for key and make it current"""
+    global _current
+    _current = DriverEntry( key, extensions )
+    if _configflags.EXTENSION_CACHE:
+        _save( _current )
+    return _current
+
+def available( name ):
+    """Whether the current driver has entry point name, None if unknown"""
+    if _current is not None:
+        return _current.procedures.get( name )
+    return None
+
+def record( name, found ):
+    """Note whether entry point name resolved; written out at exit"""
+    entry = _current
+    if entry is None or entry.procedures.get( name ) is found:
+        return
+    entry.procedures[name] = found
+    if not entry.dirty and _configflags.EXTENSION_CACHE:
+        entry.dirty = True
+        atexit.register( _save, entry )
+
+def _save( entry ):
+    """Write entry atomically, a failure only costs the next start-up"""
+    entry.dirty = False
+    path = _path( entry.key )
+    temporary = '%s.%d'%( path, os.getpid() )
+    try:
+        os.makedirs( os.path.dirname( path ), exist_ok=True )
+        with open( temporary, 'w' ) as handle:
+            json.dump( {
+                'format': FORMAT,
+                'key': entry.key,
+                'extensions': sorted( name.decode( 'latin-1' ) for name in entry.extensions ),
+                'procedures': entry.procedures,
+            }, handle, indent=0, sort_keys=True )
+        os.replace( temporary, path )
+    except OSError as err:
+        _log.debug( 'Unable to write extension cache %s: %s', path, err )
@@ -54,6 +54,9 @@ class Implementation( object ):
     @classmethod 
     def get_implementation( cls, *args ):
         if cls.CHOSEN is None:
+            # registered on import, which OpenGL.GL no longer does eagerly
+            from OpenGL.GL import vboimplementation as _core_implementation
+            from OpenGL.GL.ARB import vboimplementation as _arb_implementation
             for possible in cls.IMPLEMENTATION_CLASSES:
                 implementation = possible()
                 if possible:
@@ -0,0 +1,171 @@
+"""Calling one entry point many times over rows of arguments
+
+    callMany( glVertex3f, rows )
+
+does what
+
+    for row in rows:
+        glVertex3f( *row )
+
+does, but pays for the wrapper once per batch rather than once per call:
+the first row goes through the entry point as usual (context check,
+argument converters, size checks, error check), the remaining rows call
+the bare ctypes function, and glGetError is polled once at the end.  A
+GLError raised at the end names the entry point but cannot name the row.
+
+Two kinds of entry point are batched:
+
+    scalar entry points (glVertex3f, glColor4f, glTranslatef,
+        glUniform1f...) -- rows is a sequence of argument sequences or a
+        2D array, turned into Python tuples once
+
+    single-array wrappers (glVertex3fv, glColor3fv, glNormal3fv,
+        glLoadMatrixf, glMultMatrixf...) -- rows is an (n, size) array, or
+        anything the array handlers accept, converted once; each call is
+        passed a pointer to its row
+
+Anything else (output arguments, returned or stored values) is called
+per row.  Run ``PYOPENGL_PLATFORM=egl python -m OpenGL.batch`` for the
+benchmark against the per-call loop.
+"""
+import collections, ctypes, itertools
+from OpenGL import platform, wrapper
+from OpenGL.platform import baseplatform
+
+__all__ = ('callMany',)
+
+_PREPARED = {}
+
+class _Batch( object ):
+    """Bare ctypes function and error checker for one entry point"""
+    __slots__ = ('bare','errcheck','base','arrayType')
+    def __init__( self, bare, errcheck, base, arrayType=None ):
+        self.bare = bare
+        self.errcheck = errcheck
+        self.base = base
+        self.arrayType = arrayType
+
+def _base( function ):
+    """The ctypes function behind function's null-pointer and context-check layers"""
+    while True:
+        if isinstance( function, baseplatform._NullFunctionPointer ):
+            if isinstance( function, baseplatform._DeprecatedFunctionPointer ):
+                return None
+            if not function.resolved and not function.load():
+                return None
+            function = function._call
+        elif isinstance( function, baseplatform._CheckContext ):
+            function = function.func
+        elif isinstance( function, ctypes._CFuncPtr ):
+            return function
+        else:
+            return None
+
+def _bare( base, argTypes ):
+    """A second ctypes function on base's address, without errcheck"""
+    prototype = platform.PLATFORM.functionTypeFor( getattr( base, 'DLL', None ))( base.restype, *argTypes )
+    return prototype( ctypes.cast( base, ctypes.c_void_p ).value )
+
+def _prepare( function ):
+    """Build the _Batch for function, None if it has to be called per row"""
+    if isinstance( function, wrapper.Wrapper ):
+        if getattr( function, 'storeValues', None ) or getattr( function, 'returnValues', None ):
+            return None
+        base = _base( function.wrappedOperation )
+        if base is None or len( base.argtypes or () ) != 1:
+            return None
+        arrayType = base.argtypes[0]
+        if not hasattr( arrayType, 'asArray' ):
+            return None
+        return _Batch( _bare( base, (ctypes.c_void_p,) ), base.errcheck, base, arrayType )
+    base = _base( function )
+    if base is None:
+        return None
+    for argType in base.argtypes or ():
+        if not (isinstance( argType, type ) and issubclass( argType, ctypes._SimpleCData )):
+            return None
+        if argType in (ctypes.c_void_p, ctypes.c_char_p, ctypes.c_wchar_p):
+            return None
+    return _Batch( _bare( base, base.argtypes or () ), base.errcheck, base )
+
+def callMany( function, rows ):
+    """Call function once per row of arguments, checking once per batch
+
+    function -- an entry point from OpenGL.GL & co., e.g. glVertex3f or
+        glVertex3fv
+    rows -- argument rows: a sequence of tuples or a 2D array for scalar
+        entry points, an (n, size) array for single-array ones
+
+    returns None
+    """
+    batch = _PREPARED.get( function )
+    if batch is None:
+        # not cached when None, the entry point may only be unresolved yet
+        batch = _prepare( function )
+        if batch is None:
+            for row in rows:
+                function( *row )
+            return None
+        _PREPARED[function] = batch
+    if batch.arrayType is not None:
+        arrayType = batch.arrayType
+        array = arrayType.asArray( rows )
+        dimensions = arrayType.dimensions( array )
+        if len( dimensions ) < 2:
+            raise ValueError( """Expected an array of rows, got dimensions %s"""%( dimensions, ))
+        count = dimensions[0]
+        if not count:
+            return None
+        function( array[0] )
+        stride = arrayType.arrayByteCount( array ) // count
+        address = arrayType.dataPointer( array )
+        collections.deque( map( batch.bare, range( address + stride, address + stride * count, stride )), 0 )
+    else:
+        rows = iter( rows.tolist() if hasattr( rows, 'tolist' ) else rows )
+        for first in rows:
+            function( *first )
+            break
+        else:
+            return None
+        collections.deque( itertools.starmap( batch.bare, rows ), 0 )
+    if batch.errcheck is not None:
+        batch.errcheck( None, batch.base, None )
+    return None
+
+if __name__ == "__main__":
+    import os, timeit
+    import numpy
+    from OpenGL.EGL.pbuffer import pbufferContext
+    from OpenGL import GL
+    os.environ.setdefault( 'EGL_PLATFORM', 'surfaceless' )
+    pbufferContext()
+    count = 10000
+    vectors = numpy.random.random( (count,3) ).astype( 'f' )
+    matrices = numpy.tile( numpy.identity( 4, 'f' ), (count,1,1) )
+    cases = [
+        ('glVertex3f', GL.GL_POINTS, vectors),
+        ('glColor3f', GL.GL_POINTS, vectors),
+        ('glVertex3fv', GL.GL_POINTS, vectors),
+        ('glTranslatef', None, vectors * 0),
+        ('glMultMatrixf', None, matrices),
+    ]
+    def run( name, mode, rows, many ):
+        function = getattr( GL, name )
+        def loop():
+            if mode is not None:
+                GL.glBegin( mode )
+            if many:
+                callMany( function, rows )
+            elif rows.ndim == 2 and name[-1] != 'v':
+                for row in rows.tolist():
+                    function( *row )
+            else:
+                for row in rows:
+                    function( row )
+            if mode is not None:
+                GL.glEnd()
+        return min( timeit.repeat( loop, number=1, repeat=5 ))/count * 1e6
+    print( '%-16s %10s %10s %8s'%( 'entry point', 'per-call', 'callMany', 'speedup' ))
+    for name, mode, rows in cases:
+        single, many = run( name, mode, rows, False ), run( name, mode, rows, True )
+        print( '%-16s %7.3f us %7.3f us %7.1fx'%( name, single, many, single/many ))
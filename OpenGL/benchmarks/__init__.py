@@ -0,0 +1,74 @@
+"""Micro-benchmarks for PyOpenGL's hot paths on a headless context
+
+    PYOPENGL_PLATFORM=egl python -m OpenGL.benchmarks --output after.json
+    python -m OpenGL.benchmarks --compare before.json after.json
+
+Each benchmark times one operation in nanoseconds per call:
+
+    calls.*    scalar entry points (glColor3f, glBindBuffer...)
+    output.*   entry points that allocate an output array (glGetFloatv,
+               glGenBuffers...)
+    arrays.*   array conversion by format handler (numpy, lists, tuples,
+               ctypes, bytes...), through asArray and through glLoadMatrixf
+    vbo.*      buffer upload paths (glBufferData, glBufferSubData,
+               vbo.VBO, mapped ranges)
+    startup.*  imports in a fresh interpreter (the import alone, timed
+               inside the child)
+
+The flags that shape the dispatch path are read at import, so the runner
+re-executes itself once per combination of ERROR_CHECKING and
+CONTEXT_CHECKING (see CONFIGS) with the PYOPENGL_* variables set, and
+each worker makes its own OpenGL.headless context: an EGL pbuffer, or an
+OSMesa buffer with PYOPENGL_PLATFORM=osmesa.  The runner defaults
+PYOPENGL_PLATFORM to egl.
+
+Results are written as JSON keyed by configuration and benchmark name,
+with the interpreter, platform and renderer alongside, so --compare can
+line up two runs taken before and after a change.
+"""
+import timeit
+
+FORMAT = 1
+
+class Benchmark( object ):
+    """One registered benchmark
+
+    factory -- called once on the context, returns the callable to time
+    number -- calls per timing run
+    batch -- operations per call of the callable, the result is per operation
+    selfTimed -- the callable returns its own time in seconds (startup)
+    """
+    def __init__( self, name, factory, number=10000, batch=1, selfTimed=False ):
+        self.name = name
+        self.factory = factory
+        self.number = number
+        self.batch = batch
+        self.selfTimed = selfTimed
+    def run( self, repeat=5, scale=1.0 ):
+        """Best of repeat runs, returns a result dictionary"""
+        function = self.factory()
+        if self.selfTimed:
+            times = [function() for i in range( repeat )]
+            return {'ns': min( times ) * 1e9, 'number': 1, 'repeat': repeat}
+        number = max( 1, int( self.number * scale ))
+        function()
+        times = timeit.repeat( function, number=number, repeat=repeat )
+        return {
+            'ns': min( times ) / (number * self.batch) * 1e9,
+            'number': number * self.batch,
+            'repeat': repeat,
+        }
+
+BENCHMARKS = {}
+
+def benchmark( name, number=10000, batch=1, selfTimed=False ):
+    """Register the decorated factory under name"""
+    def register( factory ):
+        BENCHMARKS[name] = Benchmark( name, factory, number, batch, selfTimed )
+        return factory
+    return register
+
+def load( ):
+    """Import the benchmark modules, registering their benchmarks"""
+    from OpenGL.benchmarks import calls, arrays, buffers, startup
+    return BENCHMARKS
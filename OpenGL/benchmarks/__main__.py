@@ -0,0 +1,160 @@
+"""Run the benchmarks once per configuration, or compare two result files
+
+    python -m OpenGL.benchmarks [--output results.json] [--only calls,arrays]
+        [--configs default,no-error-checking] [--repeat 5] [--scale 1.0]
+    python -m OpenGL.benchmarks --compare before.json after.json
+"""
+import argparse, json, os, platform, subprocess, sys, tempfile
+import OpenGL
+from OpenGL import benchmarks
+
+# name -> PYOPENGL_* settings for the worker
+CONFIGS = {
+    'default': {'ERROR_CHECKING': '1', 'CONTEXT_CHECKING': '0'},
+    'no-error-checking': {'ERROR_CHECKING': '0', 'CONTEXT_CHECKING': '0'},
+    'context-checking': {'ERROR_CHECKING': '1', 'CONTEXT_CHECKING': '1'},
+    'no-error-checking+context-checking': {'ERROR_CHECKING': '0', 'CONTEXT_CHECKING': '1'},
+    'immediate-emulation': {'ERROR_CHECKING': '1', 'CONTEXT_CHECKING': '0', 'IMMEDIATE_EMULATION': '1'},
+}
+
+def selected( names, only ):
+    if not only:
+        return sorted( names )
+    prefixes = tuple( prefix.strip() for prefix in only.split( ',' ))
+    return sorted( name for name in names if name.startswith( prefixes ))
+
+def worker( options ):
+    """Run the benchmarks in this process, on a fresh headless context"""
+    from OpenGL import headless
+    context = headless.createContext()
+    from OpenGL import GL
+    registry = benchmarks.load()
+    results, failures = {}, {}
+    for name in selected( registry, options.only ):
+        try:
+            results[name] = registry[name].run( options.repeat, options.scale )
+        except Exception as err:
+            failures[name] = '%s: %s'%( type( err ).__name__, err )
+        GL.glGetError()
+    from OpenGL import acceleratesupport
+    with open( options.worker, 'w' ) as handle:
+        json.dump( {
+            'renderer': GL.glGetString( GL.GL_RENDERER ).decode( 'latin-1' ),
+            'version': GL.glGetString( GL.GL_VERSION ).decode( 'latin-1' ),
+            'accelerate': bool( acceleratesupport.ACCELERATE_AVAILABLE ),
+            'results': results,
+            'failures': failures,
+        }, handle )
+
+def runner( options ):
+    """Re-execute as a worker per configuration and gather the results"""
+    configs = options.configs.split( ',' ) if options.configs else list( CONFIGS )
+    environment = dict( os.environ )
+    environment.setdefault( 'PYOPENGL_PLATFORM', 'egl' )
+    environment.setdefault( 'EGL_PLATFORM', 'surfaceless' )
+    root = os.path.dirname( os.path.dirname( os.path.abspath( OpenGL.__file__ )))
+    environment['PYTHONPATH'] = os.pathsep.join( filter( None, [root, environment.get( 'PYTHONPATH' )] ))
+    document = {
+        'format': benchmarks.FORMAT,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'pyopengl': OpenGL.__version__,
+        'platform': environment['PYOPENGL_PLATFORM'],
+        'configs': {},
+    }
+    for config in configs:
+        env = dict( environment )
+        for key, value in CONFIGS[config].items():
+            env['PYOPENGL_%s'%( key, )] = value
+        handle, path = tempfile.mkstemp( suffix='.json' )
+        os.close( handle )
+        try:
+            command = [
+                sys.executable, '-m', 'OpenGL.benchmarks', '--worker', path,
+                '--repeat', str( options.repeat ), '--scale', str( options.scale ),
+            ]
+            if options.only:
+                command += ['--only', options.only]
+            subprocess.run( command, env=env, check=True, stderr=subprocess.DEVNULL )
+            with open( path ) as source:
+                result = json.load( source )
+        finally:
+            os.remove( path )
+        for key in ('renderer','version','accelerate'):
+            document[key] = result.pop( key )
+        result['flags'] = CONFIGS[config]
+        document['configs'][config] = result
+        print( 'config %s: %d benchmarks, %d failed'%(
+            config, len( result['results'] ), len( result['failures'] ),
+        ))
+        for name, failure in sorted( result['failures'].items() ):
+            print( '  %s failed: %s'%( name, failure ))
+    print( table( document ))
+    if options.output:
+        with open( options.output, 'w' ) as handle:
+            json.dump( document, handle, indent=1, sort_keys=True )
+    return document
+
+def table( document ):
+    """ns per call, one column per configuration"""
+    configs = list( document['configs'] )
+    names = sorted( set(
+        name for config in configs for name in document['configs'][config]['results']
+    ))
+    width = max( [len( name ) for name in names] + [9] )
+    lines = [
+        '%s on %s, Python %s'%( document['renderer'], document['platform'], document['python'] ),
+        ' '.join( ['%-*s'%( width, 'benchmark' )] + ['%14s'%( config[:14], ) for config in configs] ),
+    ]
+    for name in names:
+        row = ['%-*s'%( width, name )]
+        for config in configs:
+            result = document['configs'][config]['results'].get( name )
+            row.append( '%14s'%( _format( result['ns'] ) if result else '-', ))
+        lines.append( ' '.join( row ))
+    return '\n'.join( lines )
+
+def _format( ns ):
+    if ns >= 1e6:
+        return '%.2f ms'%( ns / 1e6, )
+    if ns >= 1e4:
+        return '%.2f us'%( ns / 1e3, )
+    return '%.0f ns'%( ns, )
+
+def compare( before, after ):
+    """Ratio of after to before for every benchmark both ran"""
+    lines = []
+    for config, result in sorted( after['configs'].items() ):
+        old = before['configs'].get( config )
+        if old is None:
+            continue
+        lines.append( 'config %s'%( config, ))
+        for name in sorted( set( result['results'] ) & set( old['results'] )):
+            was, now = old['results'][name]['ns'], result['results'][name]['ns']
+            lines.append( '  %-48s %12s %12s %7.2fx'%( name, _format( was ), _format( now ), now / was ))
+    return '\n'.join( lines )
+
+def main( ):
+    parser = argparse.ArgumentParser( description='PyOpenGL micro-benchmarks' )
+    parser.add_argument( '--output', help='write the JSON results here' )
+    parser.add_argument( '--only', help='comma-separated benchmark name prefixes, e.g. calls,vbo' )
+    parser.add_argument( '--configs', help='comma-separated names from %s'%( ', '.join( CONFIGS ), ))
+    parser.add_argument( '--repeat', type=int, default=5, help='timing runs, the best is kept' )
+    parser.add_argument( '--scale', type=float, default=1.0, help='multiplier for calls per run' )
+    parser.add_argument( '--compare', nargs=2, metavar=('BEFORE','AFTER'), help='compare two result files' )
+    parser.add_argument( '--worker', help=argparse.SUPPRESS )
+    options = parser.parse_args()
+    if options.compare:
+        documents = []
+        for path in options.compare:
+            with open( path ) as handle:
+                documents.append( json.load( handle ))
+        print( compare( *documents ))
+    elif options.worker:
+        worker( options )
+    else:
+        runner( options )
+
+if __name__ == "__main__":
+    main()
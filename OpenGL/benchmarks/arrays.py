@@ -0,0 +1,37 @@
+"""Array conversion cost per format handler
+
+Each source holds the 16 floats of an identity matrix, so the same value
+goes through GLfloatArray.asArray (the handler's conversion alone) and
+glLoadMatrixf (conversion, size check and call).
+"""
+import ctypes
+import numpy
+from OpenGL import GL
+from OpenGL.arrays import GLfloatArray
+from OpenGL.benchmarks import benchmark
+
+_IDENTITY = [float( i % 5 == 0 ) for i in range( 16 )]
+
+SOURCES = {
+    'numpy.float32': lambda: numpy.array( _IDENTITY, 'f' ),
+    'numpy.float64': lambda: numpy.array( _IDENTITY, 'd' ),
+    'numpy.float32.4x4': lambda: numpy.array( _IDENTITY, 'f' ).reshape( (4,4) ),
+    'list': lambda: list( _IDENTITY ),
+    'list.4x4': lambda: [_IDENTITY[i:i+4] for i in range( 0, 16, 4 )],
+    'tuple': lambda: tuple( _IDENTITY ),
+    'ctypes': lambda: (ctypes.c_float * 16)( *_IDENTITY ),
+    'bytes': lambda: numpy.array( _IDENTITY, 'f' ).tobytes(),
+}
+
+def _register( kind, make ):
+    @benchmark( 'arrays.asArray.%s'%( kind, ))
+    def asArray( ):
+        source = make()
+        return lambda: GLfloatArray.asArray( source )
+    @benchmark( 'arrays.glLoadMatrixf.%s'%( kind, ))
+    def loadMatrixf( ):
+        source = make()
+        return lambda: GL.glLoadMatrixf( source )
+
+for kind, make in SOURCES.items():
+    _register( kind, make )
@@ -0,0 +1,63 @@
+"""Buffer upload paths, 64 KiB of float32 per upload unless named otherwise"""
+import ctypes
+import numpy
+from OpenGL import GL
+from OpenGL.arrays import vbo
+from OpenGL.benchmarks import benchmark
+
+SIZE = 64 * 1024
+
+def _buffer( size=SIZE ):
+    buffer = GL.glGenBuffers( 1 )
+    GL.glBindBuffer( GL.GL_ARRAY_BUFFER, buffer )
+    GL.glBufferData( GL.GL_ARRAY_BUFFER, size, None, GL.GL_STREAM_DRAW )
+    return buffer
+
+def _data( size=SIZE ):
+    return numpy.arange( size // 4, dtype='f' )
+
+@benchmark( 'vbo.glBufferData.numpy', number=2000 )
+def bufferData( ):
+    data = _data()
+    _buffer()
+    return lambda: GL.glBufferData( GL.GL_ARRAY_BUFFER, data, GL.GL_STREAM_DRAW )
+
+@benchmark( 'vbo.glBufferData.numpy.1MiB', number=200 )
+def bufferDataLarge( ):
+    data = _data( 1 << 20 )
+    _buffer( 1 << 20 )
+    return lambda: GL.glBufferData( GL.GL_ARRAY_BUFFER, data, GL.GL_STREAM_DRAW )
+
+@benchmark( 'vbo.glBufferData.bytes', number=2000 )
+def bufferDataBytes( ):
+    data = _data().tobytes()
+    _buffer()
+    return lambda: GL.glBufferData( GL.GL_ARRAY_BUFFER, data, GL.GL_STREAM_DRAW )
+
+@benchmark( 'vbo.glBufferSubData.numpy', number=2000 )
+def bufferSubData( ):
+    data = _data()
+    _buffer()
+    return lambda: GL.glBufferSubData( GL.GL_ARRAY_BUFFER, 0, data )
+
+@benchmark( 'vbo.VBO.set_array+bind', number=2000 )
+def vboSetArray( ):
+    data = _data()
+    buffer = vbo.VBO( data, usage=GL.GL_STREAM_DRAW )
+    buffer.bind()
+    def upload():
+        buffer.set_array( data )
+        buffer.bind()
+    return upload
+
+@benchmark( 'vbo.glMapBufferRange+memmove', number=2000 )
+def mapBufferRange( ):
+    data = _data()
+    source = data.ctypes.data
+    _buffer()
+    access = GL.GL_MAP_WRITE_BIT | GL.GL_MAP_INVALIDATE_BUFFER_BIT
+    def upload():
+        pointer = GL.glMapBufferRange( GL.GL_ARRAY_BUFFER, 0, SIZE, access )
+        ctypes.memmove( pointer, source, SIZE )
+        GL.glUnmapBuffer( GL.GL_ARRAY_BUFFER )
+    return upload
@@ -0,0 +1,63 @@
+"""Per-call overhead of scalar and output-array entry points"""
+import numpy
+from OpenGL import GL
+from OpenGL.benchmarks import benchmark
+
+@benchmark( 'calls.glColor3f' )
+def color3f( ):
+    return lambda: GL.glColor3f( 0.5, 0.25, 1.0 )
+
+@benchmark( 'calls.glTranslatef' )
+def translatef( ):
+    return lambda: GL.glTranslatef( 0.0, 0.0, 0.0 )
+
+@benchmark( 'calls.glLoadIdentity' )
+def loadIdentity( ):
+    return GL.glLoadIdentity
+
+@benchmark( 'calls.glBindBuffer' )
+def bindBuffer( ):
+    return lambda: GL.glBindBuffer( GL.GL_ARRAY_BUFFER, 0 )
+
+@benchmark( 'calls.glIsEnabled' )
+def isEnabled( ):
+    return lambda: GL.glIsEnabled( GL.GL_BLEND )
+
+@benchmark( 'calls.glGetError' )
+def getError( ):
+    return GL.glGetError
+
+@benchmark( 'calls.glVertex3f', number=200, batch=100 )
+def vertex3f( ):
+    # error checks are skipped between glBegin and glEnd, so time a run of them
+    glBegin, glEnd, glVertex3f, mode = GL.glBegin, GL.glEnd, GL.glVertex3f, GL.GL_POINTS
+    points = range( 100 )
+    def draw():
+        glBegin( mode )
+        for i in points:
+            glVertex3f( 1.0, 2.0, 3.0 )
+        glEnd()
+    return draw
+
+@benchmark( 'output.glGetFloatv.MODELVIEW_MATRIX' )
+def getFloatv( ):
+    return lambda: GL.glGetFloatv( GL.GL_MODELVIEW_MATRIX )
+
+@benchmark( 'output.glGetFloatv.MODELVIEW_MATRIX.passed' )
+def getFloatvPassed( ):
+    matrix = numpy.zeros( (4,4), 'f' )
+    return lambda: GL.glGetFloatv( GL.GL_MODELVIEW_MATRIX, matrix )
+
+@benchmark( 'output.glGetIntegerv.VIEWPORT' )
+def getIntegerv( ):
+    return lambda: GL.glGetIntegerv( GL.GL_VIEWPORT )
+
+@benchmark( 'output.glGetString.VERSION' )
+def getString( ):
+    return lambda: GL.glGetString( GL.GL_VERSION )
+
+@benchmark( 'output.glGenBuffers+glDeleteBuffers' )
+def genBuffers( ):
+    def cycle():
+        GL.glDeleteBuffers( 1, [GL.glGenBuffers( 1 )] )
+    return cycle
@@ -0,0 +1,35 @@
+"""Import cost in a fresh interpreter, timed inside the child
+
+The children inherit the worker's environment, so the configuration's
+PYOPENGL_* flags and the extension cache apply to them as well.
+"""
+import os, subprocess, sys
+from OpenGL.benchmarks import benchmark
+
+_CHILD = """import time
+start = time.perf_counter()
+%s
+print( time.perf_counter() - start )
+"""
+
+IMPORTS = {
+    'startup.OpenGL.platform': 'import OpenGL.platform',
+    'startup.OpenGL.GL': 'import OpenGL.GL',
+    'startup.OpenGL.GL.names': 'from OpenGL.GL import glVertex3f, glGetFloatv, glBufferData, GL_FLOAT',
+    'startup.OpenGL.GLU+GLUT': 'import OpenGL.GLU, OpenGL.GLUT',
+    'startup.OpenGL.arrays.vbo': 'from OpenGL.arrays import vbo',
+}
+
+def _register( name, statement ):
+    @benchmark( name, selfTimed=True )
+    def child( ):
+        def run():
+            output = subprocess.run(
+                [sys.executable, '-c', _CHILD%( statement, )],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=os.environ, check=True,
+            ).stdout
+            return float( output.split()[-1] )
+        return run
+
+for name, statement in IMPORTS.items():
+    _register( name, statement )
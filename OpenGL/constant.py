@@ -1,8 +1,20 @@
-"""Implementation of OpenGL constant objects"""
+"""Implementation of OpenGL constant objects
+
+The raw modules declare tens of thousands of constants, many of them the
+same name and value repeated across GL, GLES and EGL versions and
+extensions.  Constants are therefore interned: declaring one that already
+exists returns the existing object, and names live in a module-level table
+rather than an instance ``__dict__``, so each constant costs an int.  With
+MODULE_ANNOTATIONS on, constants are interned per declaring module and keep
+a ``__dict__`` to carry their ``__module__``.
+"""
 import sys
 from OpenGL._bytes import bytes,unicode,as_8_bit, long, integer_types, maxsize
 from OpenGL import _configflags
 
+_NAMES = {}     # id(constant) -> name; constants are never released
+_INTERNED = {}  # name (or (name,module) when annotating) -> constant
+
 class Constant( object ):
     """OpenGL constant that displays itself as a name rather than a value
 
@@ -11,61 +23,165 @@ class Constant( object ):
     human-readable form, rather than as a bald number that requires
     lookup and disambiguation in the header file.
     """
+    if not _configflags.MODULE_ANNOTATIONS:
+        __slots__ = ()
     def __new__( cls, name, value=None ):
         """Initialise the constant with the given name and value"""
+        if value.__class__ is int and not _configflags.MODULE_ANNOTATIONS:
+            # the raw modules' case, kept as short as possible
+            if value > maxsize:
+                value = - (value & maxsize)
+            constant = _INTERNED.get( name )
+            if constant is not None and constant.__class__ is IntConstant and constant == value:
+                return constant
+            return _intern( IntConstant, name, value, name )
         if not isinstance( value, Constant ):
-            if isinstance( value, float ) and cls is not FloatConstant:
-                return FloatConstant( name, value )
-            elif isinstance( value, int ) and cls is not IntConstant:
-                return IntConstant( name, value )
-            elif isinstance( value, long ) and cls is not LongConstant:
-                return LongConstant( name, value )
-            elif isinstance( value, (bytes,unicode) ) and cls is not StringConstant:
-                return StringConstant( name, as_8_bit(value) )
+            if isinstance( value, float ):
+                cls = FloatConstant
+            elif isinstance( value, integer_types ):
+                cls = IntConstant
+            elif isinstance( value, (bytes,unicode) ):
+                cls, value = StringConstant, as_8_bit(value)
         if isinstance( value, integer_types ):
             if value > maxsize: # TODO: I'm guessing this should really by sizeof GLint, not 
                 value = - (value & maxsize)
-        base = super(Constant,cls).__new__( cls, value )
-        base.name = name
+        module = None
         if _configflags.MODULE_ANNOTATIONS:
-            frame = sys._getframe().f_back
-            if frame and frame.f_back and '__name__' in frame.f_back.f_globals:
-                base.__module__ = frame.f_back.f_globals['__name__']
-        return base
+            frame = sys._getframe(1)
+            module = frame.f_globals.get( '__name__' )
+            key = (name,module)
+        else:
+            key = name
+        constant = _INTERNED.get( key )
+        if constant is not None and constant.__class__ is cls and constant == value:
+            return constant
+        return _intern( cls, name, value, key, module )
+    @property
+    def name( self ):
+        return _NAMES[id(self)]
+    @name.setter
+    def name( self, name ):
+        _NAMES[id(self)] = name
     def __repr__( self ):
         """Return the name, rather than the bald value"""
         return self.name
-    def __getnewargs__( self ):
-        """Produce the new arguments for recreating the instance"""
-        return (self.name,) + super( Constant, self ).__getnewargs__()
+    def __reduce__( self ):
+        """Unpickle and copy to the interned constant, for every protocol"""
+        (value,) = super( Constant, self ).__getnewargs__()
+        return (_restore, (self.__class__, self.name, value, getattr( self, '__module__', None )))
+    def __setstate__( self, state ):
+        """Name the copies made from pickles of earlier versions"""
+        self.name = state
+
+def _intern( cls, name, value, key, module=None ):
+    """Create the constant, registering it under key if that is still free
+
+    Name clashes (the same name with another value or type) are rare,
+    they get a key of their own so that repeated declarations still
+    share one object.
+    """
+    if key in _INTERNED:
+        key = (key, cls, value)
+        constant = _INTERNED.get( key )
+        if constant is not None:
+            return constant
+    constant = super( Constant, cls ).__new__( cls, value )
+    _NAMES[id(constant)] = name
+    if module is not None:
+        constant.__module__ = module
+    _INTERNED[key] = constant
+    return constant
+
+def _restore( cls, name, value, module=None ):
+    """The interned constant a pickled or copied one stands for"""
+    if _configflags.MODULE_ANNOTATIONS:
+        key = (name,module)
+    else:
+        key, module = name, None
+    constant = _INTERNED.get( key )
+    if constant is None or constant.__class__ is not cls or constant != value:
+        constant = _intern( cls, name, value, key, module )
+    return constant
 
 class NumericConstant( Constant ):
     """Base class for numeric-value constants"""
+    if not _configflags.MODULE_ANNOTATIONS:
+        __slots__ = ()
     def __str__( self ):
         """Return the value as a human-friendly string"""
         return '%s (%s)'%(self.name,super(Constant,self).__str__())
-    def __getstate__(self):
-        """Retrieve state for pickle and the like"""
-        return self.name
-    def __setstate__( self, state ):
-        self.name = state
 
 class IntConstant( NumericConstant, int ):
     """Integer constant"""
+    if not _configflags.MODULE_ANNOTATIONS:
+        __slots__ = ()
 if int is not long:
     class LongConstant( NumericConstant, long ):
         """Long integer constant"""
+        if not _configflags.MODULE_ANNOTATIONS:
+            __slots__ = ()
 else:
     LongConstant = IntConstant
 class FloatConstant( NumericConstant, float ):
     """Float constant"""
+    if not _configflags.MODULE_ANNOTATIONS:
+        __slots__ = ()
 
 class StringConstant( Constant, bytes ):
     """String constants"""
+    if not _configflags.MODULE_ANNOTATIONS:
+        __slots__ = ()
     def __repr__( self ):
         """Return the value as a human-friendly string"""
         return '%s (%s)'%(self.name,super(Constant,self).__str__())
 
+_BENCHMARK = """
+from OpenGL.constant import Constant
+import importlib, pkgutil, re, sys, time, tracemalloc
+mode, package = sys.argv[1:]
+package = importlib.import_module( package )
+infos = list( pkgutil.walk_packages( package.__path__, package.__name__+'.' ))
+if mode == 'declare':
+    # only the NAME=_C('NAME',value) lines, each module into its own namespace
+    declaration = re.compile( r'^[A-Za-z_][A-Za-z_0-9]*=_C[(].*$', re.M )
+    sources = []
+    for info in infos:
+        with open( info.module_finder.find_spec( info.name ).origin ) as handle:
+            sources.append( compile( '\\n'.join( declaration.findall( handle.read() )), info.name, 'exec' ))
+tracemalloc.start()
+start = time.perf_counter()
+namespaces = []
+for position, info in enumerate( infos ):
+    if mode == 'declare':
+        namespace = {'_C': Constant}
+        exec( sources[position], namespace )
+    else:
+        try:
+            namespace = vars( importlib.import_module( info.name ))
+        except Exception: # a few extension modules need types their API lacks
+            continue
+    namespaces.append( namespace )
+elapsed = time.perf_counter() - start
+declared = [v for namespace in namespaces for v in namespace.values() if isinstance( v, Constant )]
+print( '%-7s %-17s %4d modules %7.1f ms %6.2f MB %6d constants %6d objects'%(
+    mode, package.__name__, len(namespaces), elapsed*1000,
+    tracemalloc.get_traced_memory()[0]/2.**20, len(declared), len(set(map(id,declared))),
+))
+"""
+
+def benchmark( packages=('OpenGL.raw.GL','OpenGL.raw.GLES2','OpenGL.raw.EGL') ):
+    """Report startup time and (tracemalloc) memory for the raw packages
+
+    Each package is measured in a fresh interpreter twice: executing just
+    the modules' constant declarations, then importing every module, of
+    which the declarations are one part.  Fewer objects than constants
+    is the interning at work.
+    """
+    import subprocess
+    for package in packages:
+        for mode in ('declare','import'):
+            subprocess.check_call( [sys.executable, '-c', _BENCHMARK, mode, package] )
+
 if __name__ == "__main__":
     x = IntConstant( 'testint', 3 )
     y = FloatConstant( 'testfloat', 3.0 )
@@ -76,3 +192,7 @@ if __name__ == "__main__":
         restored = pickle.loads( pickle.dumps( val ))
         assert restored == val, (str(restored),str(val))
         assert restored.name == val.name, (restored.name,val.name)
+        for protocol in range( pickle.HIGHEST_PROTOCOL + 1 ):
+            assert pickle.loads( pickle.dumps( val, protocol )) is val, protocol
+
+    benchmark( sys.argv[1:] or benchmark.__defaults__[0] )
@@ -0,0 +1,190 @@
+"""Per-entry-point call counters for profiling live frames
+
+With PYOPENGL_PROFILING=1 (or OpenGL.PROFILING = True before the first
+OpenGL.GL import) the platform wraps each function it builds so that a
+Counter per entry point accumulates:
+
+    calls -- number of calls
+    time -- seconds spent in the ctypes call, error check included
+    maxTime -- longest single call
+    bytes -- bytes passed in array (pointer) arguments
+    wrappedTime -- seconds spent in the entry point's Python wrapper
+        (argument conversion, output arrays...), the ctypes call
+        included; 0 for entry points without a wrapper
+
+so glVertex3f and glBufferData cost a couple of clock reads, not the
+argument reprs of FULL_LOGGING.  Without the flag nothing is wrapped.
+
+EVENTS counts occurrences that are not calls, such as the driver's
+performance warnings routed by OpenGL.GL.debugoutput; event() adds to
+it whether or not PROFILING is set.
+
+    from OpenGL import counters
+    ...
+    glutSwapBuffers()
+    print( counters.frame( top=10 ))
+
+frame() reports the counters since its previous call and resets them;
+snapshot(), events() and reset() give the raw figures.
+"""
+import collections, ctypes, time
+
+__all__ = ('Counter','COUNTERS','EVENTS','event','snapshot','events','reset','report','frame')
+
+class Counter( object ):
+    """Accumulated figures for one entry point"""
+    __slots__ = ('name','calls','time','maxTime','bytes','wrappedTime')
+    def __init__( self, name ):
+        self.name = name
+        self.clear()
+    def clear( self ):
+        self.calls = 0
+        self.time = self.maxTime = self.wrappedTime = 0.0
+        self.bytes = 0
+    def values( self ):
+        """(calls, time, maxTime, bytes, wrappedTime)"""
+        return (self.calls, self.time, self.maxTime, self.bytes, self.wrappedTime)
+    def __repr__( self ):
+        return '<Counter %s calls=%d time=%.6f>'%( self.name, self.calls, self.time )
+
+COUNTERS = {}
+EVENTS = collections.Counter()
+
+def counter( name ):
+    """The Counter for entry point name, created on first use"""
+    found = COUNTERS.get( name )
+    if found is None:
+        found = COUNTERS[name] = Counter( name )
+    return found
+
+def snapshot( ):
+    """Copy of the counters, {name: (calls, time, maxTime, bytes, wrappedTime)}
+
+    entry points not called since the last reset() are left out
+    """
+    return dict(
+        (name, found.values()) for name, found in COUNTERS.items() if found.calls
+    )
+
+def event( name, count=1 ):
+    """Count an occurrence of name, e.g. a driver performance warning"""
+    EVENTS[name] += count
+
+def events( ):
+    """Copy of EVENTS, {name: count}"""
+    return dict( EVENTS )
+
+def reset( ):
+    """Zero every counter and event count"""
+    for found in COUNTERS.values():
+        found.clear()
+    EVENTS.clear()
+
+def report( figures=None, top=10, occurrences=None ):
+    """Text table of the top entry points by time in figures (a snapshot())
+
+    occurrences -- an events() result listed after the table, defaults
+        to the current events when figures is None
+    """
+    if figures is None:
+        figures = snapshot()
+        if occurrences is None:
+            occurrences = events()
+    ranked = sorted(
+        figures.items(), key=lambda item: max( item[1][1], item[1][4] ), reverse=True,
+    )
+    lines = [
+        '%d calls, %.3f ms in GL calls, %.1f KiB in arrays'%(
+            sum( values[0] for values in figures.values() ),
+            1000 * sum( values[1] for values in figures.values() ),
+            sum( values[3] for values in figures.values() ) / 1024.,
+        ),
+        '%-32s %8s %10s %10s %10s %10s'%(
+            'entry point', 'calls', 'ms', 'max us', 'wrapped ms', 'KiB',
+        ),
+    ]
+    for name, (calls, spent, longest, size, wrapped) in ranked[:top]:
+        lines.append( '%-32s %8d %10.3f %10.1f %10.3f %10.1f'%(
+            name, calls, 1000 * spent, 1e6 * longest, 1000 * wrapped, size / 1024.,
+        ))
+    if occurrences:
+        lines.append( '%-32s %8s'%( 'event', 'count' ))
+        for name, count in collections.Counter( occurrences ).most_common( top ):
+            lines.append( '%-32s %8d'%( name, count ))
+    return '\n'.join( lines )
+
+def frame( top=10 ):
+    """Report the counters since the previous frame() (or reset()) and reset them"""
+    text = report( top=top )
+    reset()
+    return text
+
+class _Counted( object ):
+    """Counts calls to func, their time and the bytes passed in arrays"""
+    __slots__ = ('func','counter','arrays')
+    def __init__( self, func ):
+        object.__setattr__( self, 'func', func )
+        object.__setattr__( self, 'counter', counter( func.__name__ ))
+        object.__setattr__( self, 'arrays', tuple([
+            index for index, argType in enumerate( getattr( func, 'argtypes', None ) or () )
+            if not _isScalar( argType )
+        ]))
+    def __setattr__( self, key, value ):
+        if key not in self.__slots__:
+            return setattr( self.func, key, value )
+        else:
+            object.__setattr__( self, key, value )
+    def __repr__( self ):
+        return repr( self.func )
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr( self.func, key )
+        raise AttributeError( key )
+    def __call__( self, *args ):
+        found = self.counter
+        if self.arrays:
+            for index in self.arrays:
+                if index < len( args ):
+                    found.bytes += _byteCount( args[index] )
+        start = time.perf_counter()
+        try:
+            return self.func( *args )
+        finally:
+            spent = time.perf_counter() - start
+            found.calls += 1
+            found.time += spent
+            if spent > found.maxTime:
+                found.maxTime = spent
+
+def _isScalar( argType ):
+    return (
+        isinstance( argType, type ) and issubclass( argType, ctypes._SimpleCData )
+        and argType not in (ctypes.c_void_p, ctypes.c_char_p, ctypes.c_wchar_p)
+    )
+
+def _byteCount( arg ):
+    """Size of an array argument, 0 for None, offsets and opaque pointers"""
+    if arg is None or isinstance( arg, int ):
+        return 0
+    try:
+        return memoryview( arg ).nbytes
+    except TypeError:
+        return len( arg ) + 1 if isinstance( arg, str ) else 0
+
+def counted( func ):
+    """Wrap a platform function (ctypes level) with its entry point's Counter"""
+    return _Counted( func )
+
+def countedWrapper( name, call ):
+    """Wrap a finalised Wrapper call, adding its time to name's wrappedTime"""
+    found = counter( name )
+    clock = time.perf_counter
+    def countedCall( *args ):
+        start = clock()
+        try:
+            return call( *args )
+        finally:
+            found.wrappedTime += clock() - start
+    countedCall.__name__ = getattr( call, '__name__', name )
+    countedCall.__wrapped__ = call
+    return countedCall
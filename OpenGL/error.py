@@ -7,13 +7,14 @@ ErrorChecker is an _ErrorChecker instance that allows you
 to register a new error-checking function for use 
 throughout the system.
 """
-import logging
+import logging, collections, contextlib
 _log = logging.getLogger( 'OpenGL.error' )
-from OpenGL import platform, _configflags
+from OpenGL import platform, _configflags, logs
 from ctypes import ArgumentError
 __all__ = (
     "Error",'GLError','GLUError','GLUTError',
     'GLerror','GLUerror','GLUTerror','ArgumentError',
+    'checkpoint','error_scope',
 )
 
 class Error( Exception ):
@@ -57,6 +58,10 @@ class GLError( Error ):
         cArguments -- ctypes-level arguments to the operation,
             often raw integers for pointers and the like
         description -- OpenGL description of the error (textual)
+        recentOperations -- with deferred error checking, names of
+            the calls made since the last check (oldest first), one
+            of which raised the error; baseOperation is then the
+            most recent of them
     """
     def __init__( 
         self, 
@@ -67,16 +72,17 @@ class GLError( Error ):
         pyArgs=None, 
         cArgs=None,
         description=None,
+        recentOperations=None,
     ):
         """Initialise the GLError, storing metadata for later display"""
         (
             self.err, self.result, self.cArguments, 
             self.baseOperation, self.pyArgs, self.cArgs,
-            self.description
+            self.description, self.recentOperations,
         ) = (
             err, result, cArguments,
             baseOperation, pyArgs, cArgs,
-            description
+            description, recentOperations,
         )
     DISPLAY_ORDER = (
         'err', 
@@ -86,6 +92,7 @@ class GLError( Error ):
         'cArgs',
         'cArguments',
         'result', 
+        'recentOperations',
     )
     def __str__( self ):
         """Create a fully formatted representation of the error"""
@@ -178,6 +185,7 @@ if _configflags.ERROR_CHECKING:
                 _currentChecker -- currently active checking function
             """
             _getErrors = None
+            _deferred = False
             def __init__( self, platform, baseOperation=None, noErrorResult=0, errorClass=GLError ):
                 """Initialize from a platform module/reference"""
                 self._isValid = platform.CurrentContextIsValid
@@ -192,6 +200,52 @@ if _configflags.ERROR_CHECKING:
                 else:
                     self._registeredChecker = self.nullGetError
                 self._currentChecker = self._registeredChecker
+                if _configflags.DEFERRED_ERROR_CHECKING and self._getErrors and errorClass is GLError:
+                    self.defer( _configflags.ERROR_CHECK_INTERVAL )
+            def defer( self, interval=0, history=32 ):
+                """Stop calling glGetError after every call, poll at checkpoints instead
+
+                interval -- poll automatically every interval calls, 0 to
+                    poll only at checkpoint()/error_scope()/buffer swaps
+                history -- number of recent call names kept to report
+                    with an error
+                """
+                self._interval = interval
+                self._calls = 0
+                self._recent = collections.deque( maxlen=history )
+                self._deferred = True
+                if self not in _deferredCheckers:
+                    _deferredCheckers.append( self )
+            def immediate( self ):
+                """Return to checking for errors after every call"""
+                self._deferred = False
+                if self in _deferredCheckers:
+                    _deferredCheckers.remove( self )
+            def check( self ):
+                """Poll for an error now, raising it with the calls made since the last check"""
+                if self._currentChecker == self.nullGetError:
+                    # inside glBegin/glEnd, try again at the next checkpoint
+                    return None
+                err = self._currentChecker()
+                if not self._deferred:
+                    if err != self._noErrorResult:
+                        raise self._errorClass( err )
+                    return None
+                self._calls = 0
+                recent = [
+                    getattr( operation, '__name__', operation )
+                    for operation in self._recent
+                ]
+                self._recent.clear()
+                if err != self._noErrorResult:
+                    failure = self._errorClass(
+                        err,
+                        baseOperation = recent[-1] if recent else None,
+                        recentOperations = recent,
+                    )
+                    logs.logFailure( failure.baseOperation, failure )
+                    raise failure
+                return None
             def __bool__( self ):
                 """We are "true" if we actually do anything"""
                 if self._registeredChecker is self.nullGetError:
@@ -201,7 +255,7 @@ if _configflags.ERROR_CHECKING:
                 """Check for error, testing for context before operation"""
                 if self._isValid():
                     return self._getErrors()
-                return None 
+                return self._noErrorResult
             def nullGetError( self ):
                 """Used as error-checker when no error checking should be done"""
                 return self._noErrorResult
@@ -225,14 +279,23 @@ if _configflags.ERROR_CHECKING:
                     sequence.  If you are calling glBegin/glEnd in C you 
                     should call onBegin and onEnd appropriately.
                 """
+                if self._deferred:
+                    self._recent.append( baseOperation )
+                    self._calls += 1
+                    # >=, polls that fall inside glBegin/glEnd are retried until one runs
+                    if self._interval and self._calls >= self._interval:
+                        self.check()
+                    return result
                 err = self._currentChecker()
                 if err != self._noErrorResult:
-                    raise self._errorClass(
+                    failure = self._errorClass(
                         err,
                         result,
                         cArguments = cArguments,
                         baseOperation = baseOperation,
                     )
+                    logs.logFailure( baseOperation, failure )
+                    raise failure
                 return result
             def onBegin( self ):
                 """Called by glBegin to record the fact that glGetError won't work"""
@@ -242,6 +305,29 @@ if _configflags.ERROR_CHECKING:
                 self._currentChecker = self._registeredChecker
 else:
     _ErrorChecker = None
+
+_deferredCheckers = []
+def checkpoint( ):
+    """Poll every deferred error checker, raising any pending GL error
+
+    A no-op unless deferred error checking is on, see
+    OpenGL.DEFERRED_ERROR_CHECKING.  Called before buffer swaps.
+    """
+    for checker in _deferredCheckers:
+        checker.check()
+
+@contextlib.contextmanager
+def error_scope( ):
+    """Check for GL errors on entry to and exit from the block
+
+    With deferred error checking an error raised on exit is known to
+    come from a call inside the block (errors from before it are
+    raised on entry); use nested scopes to narrow down a culprit.
+    """
+    checkpoint()
+    yield
+    checkpoint()
+
 # Compatibility with PyOpenGL 2.x series
 GLUerror = GLUError
 GLerror = GLError 
@@ -124,8 +124,14 @@ class ExtensionQuerier( object ):
             self.version = self.pullVersion()
         return self.version 
     def getExtensions( self ):
+        """Retrieve the extension names as a frozenset (False if not loaded)"""
         if not self.extensions:
-            self.extensions = self.pullExtensions()
+            extensions = self.pullExtensions()
+            if extensions:
+                if isinstance( extensions, bytes ):
+                    extensions = extensions.split()
+                extensions = frozenset( extensions )
+            self.extensions = extensions
         return self.extensions
 
 class _GLQuerier( ExtensionQuerier ):
@@ -140,7 +146,7 @@ class _GLQuerier( ExtensionQuerier ):
         from OpenGL import platform
         if not platform.PLATFORM.CurrentContextIsValid():
             return False
-        from OpenGL.raw.GL.VERSION.GL_1_1 import glGetString 
+        from OpenGL.GL.glget import glGetString # sets the raw function's c_char_p restype
         from OpenGL.raw.GL.VERSION.GL_1_1 import GL_VERSION
         new = glGetString( GL_VERSION )
         
@@ -152,13 +158,26 @@ class _GLQuerier( ExtensionQuerier ):
         else:
             return False # not yet loaded/supported
     def pullExtensions( self ):
+        """Retrieve the extension set, from the on-disk cache when it knows the driver"""
         from OpenGL import platform
         if not platform.PLATFORM.CurrentContextIsValid():
             return False
         from OpenGL.raw.GL._types import GLint
-        from OpenGL.raw.GL.VERSION.GL_1_1 import glGetString, glGetError
-        from OpenGL.raw.GL.VERSION.GL_1_1 import GL_EXTENSIONS
-        from OpenGL import error
+        from OpenGL.GL.glget import glGetString
+        from OpenGL.raw.GL.VERSION.GL_1_1 import glGetError
+        from OpenGL.raw.GL.VERSION.GL_1_1 import GL_EXTENSIONS, GL_VENDOR, GL_RENDERER
+        from OpenGL import error, _extensioncache
+        version = self.getVersion()
+        if not version:
+            # should not be possible?
+            return version 
+        key = _extensioncache.driverKey(
+            glGetString( GL_VENDOR ), glGetString( GL_RENDERER ),
+            self.version_string, platform.PLATFORM,
+        )
+        cached = _extensioncache.load( key )
+        if cached is not None:
+            return cached.extensions
         try:
             extensions = glGetString( GL_EXTENSIONS )
             if glGetError():
@@ -169,7 +188,7 @@ class _GLQuerier( ExtensionQuerier ):
                 return False
         except (AttributeError, error.GLError):
             # OpenGL 3.0 deprecates glGetString( GL_EXTENSIONS )
-            from OpenGL.raw.GL.VERSION.GL_3_0 import GL_NUM_EXTENSIONS, glGetStringi
+            from OpenGL.GL.VERSION.GL_3_0 import GL_NUM_EXTENSIONS, glGetStringi
             from OpenGL.raw.GL.VERSION.GL_1_1 import glGetIntegerv
             count = GLint()
             glGetIntegerv( GL_NUM_EXTENSIONS, count )
@@ -180,10 +199,6 @@ class _GLQuerier( ExtensionQuerier ):
                     extension
                 )
         # Add included-by-reference extensions...
-        version = self.getVersion()
-        if not version:
-            # should not be possible?
-            return version 
         check = tuple( version[:2] )
         for (v,v_exts) in VERSION_EXTENSIONS:
             if v <= check:
@@ -192,7 +207,7 @@ class _GLQuerier( ExtensionQuerier ):
                         extensions.append( as_8_bit(v_ext) )
             else:
                 break
-        return extensions
+        return _extensioncache.store( key, extensions ).extensions
 GLQuerier = _GLQuerier()
 class _GLUQuerier( ExtensionQuerier ):
     prefix = as_8_bit('GLU_')
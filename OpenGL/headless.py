@@ -0,0 +1,30 @@
+"""Offscreen contexts for tools that run without a window
+
+    context = createContext( width, height )
+
+makes a GL context current on whichever platform PyOpenGL loaded: an
+OSMesa buffer with PYOPENGL_PLATFORM=osmesa, an EGL pbuffer otherwise
+(run with PYOPENGL_PLATFORM=egl).  EGL_PLATFORM defaults to surfaceless
+here so that Mesa does not look for a display server.
+"""
+import os
+
+__all__ = ('createContext',)
+
+def createContext( width=64, height=64 ):
+    """Create and make current an offscreen context of the given size
+
+    returns an opaque tuple which must be kept alive with the context
+    """
+    os.environ.setdefault( 'EGL_PLATFORM', 'surfaceless' )
+    from OpenGL import platform
+    if platform.PLATFORM.__class__.__module__ == 'OpenGL.platform.osmesa':
+        from OpenGL import osmesa, arrays
+        from OpenGL.raw.GL.VERSION.GL_1_1 import GL_UNSIGNED_BYTE
+        context = osmesa.OSMesaCreateContextExt( osmesa.OSMESA_RGBA, 24, 0, 0, None )
+        buffer = arrays.GLubyteArray.zeros( (height, width, 4) )
+        if not context or not osmesa.OSMesaMakeCurrent( context, buffer, GL_UNSIGNED_BYTE, width, height ):
+            raise RuntimeError( 'Unable to make an OSMesa context current' )
+        return context, buffer
+    from OpenGL.EGL.pbuffer import pbufferContext
+    return pbufferContext( width, height )
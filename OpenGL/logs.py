@@ -60,7 +60,10 @@ class _FullLoggedFunction( _LoggedFunction ):
             )
             raise
 class _ErrorLoggedFunction ( _LoggedFunction ):
-    """On-error-logged function wrapper"""
+    """On-error-logged function wrapper
+
+    No longer used by logOnFail, see logFailure
+    """
     def __call__( self, *args, **named ):
         function = getattr( self, '' )
         try:
@@ -78,14 +81,29 @@ def logOnFail( function, log ):
     function -- callable object to be wrapped
     log -- the log to which to log information
     
-    Uses ERROR_LOGGING and FULL_LOGGING
-    to determine whether/how to wrap the function.
+    Only FULL_LOGGING wraps the function; with ERROR_LOGGING the
+    failures are logged where they are raised (the error checker,
+    context checks and the wrapper's ArgumentError handling, see
+    logFailure) so successful calls go straight to the ctypes function.
     """
-    if ERROR_LOGGING or FULL_LOGGING:
-        if FULL_LOGGING:
-            loggedFunction = _FullLoggedFunction( function, log )
-        else:
-            loggedFunction = _ErrorLoggedFunction( function, log )
-        return loggedFunction
+    if FULL_LOGGING:
+        return _FullLoggedFunction( function, log )
     else:
         return function
+
+def logFailure( function, err, log=None ):
+    """Log err raised by (ctypes-level) function as _ErrorLoggedFunction did
+
+    Called on the failure paths only, does nothing unless ERROR_LOGGING
+    is set (FULL_LOGGING wrappers log failures themselves).
+    """
+    if ERROR_LOGGING and not FULL_LOGGING:
+        log = log or getLog( 'OpenGL.errors' )
+        if err.__traceback__ is None:
+            detail = ''.join( traceback.format_stack( limit=10 )[:-1] )
+            detail += ''.join( traceback.format_exception_only( type(err), err ) )
+        else:
+            detail = log.getException( err )
+        log.warning(
+            """Failure on %s: %s""", getattr( function, '__name__', function ), detail
+        )
@@ -3,7 +3,7 @@
 import ctypes
 from OpenGL.platform import ctypesloader
 from OpenGL._bytes import as_8_bit
-import sys, logging
+import sys, logging, operator, threading
 from OpenGL import _configflags
 from OpenGL import logs, MODULE_ANNOTATIONS
 log = logging.getLogger(__name__)
@@ -16,6 +16,125 @@ class lazy_property( object ):
         setattr( obj, self.fget.__name__, value)
         return value 
 
+UNTRACKED = object()
+
+class _ContextState( threading.local ):
+    """Per-thread record of the context made current through PyOpenGL
+
+    current is UNTRACKED until the thread calls one of the platform's
+    CONTEXT_TRACKERS entry points, from then on it holds the handle of the
+    current context (GLUT: window), or None if there is none.
+    """
+    current = UNTRACKED
+_contextState = _ContextState()
+
+class _DeferredWork( threading.local ):
+    """Per-thread GL work held back on the Python side
+
+    flush is None, or a callable set by code batching calls (see
+    OpenGL.GL.immediate) which issues the held-back work; with
+    IMMEDIATE_EMULATION every GL/GLU/GLUT entry point, buffer swap and
+    make-current calls it first.  The callable clears it.
+    """
+    flush = None
+deferredWork = _DeferredWork()
+
+def _handle( value ):
+    """Comparable integer for a context/window handle, None for NULL"""
+    if value is None or isinstance( value, int ):
+        return value or None
+    try:
+        return ctypes.cast( value, ctypes.c_void_p ).value
+    except (TypeError, ctypes.ArgumentError):
+        return getattr( value, 'value', value ) or None
+
+def _trackMakeCurrent( index ):
+    """Tracker for entry points making args[index] current, returning success"""
+    def track( args, result ):
+        if result is not None and not result:
+            return UNTRACKED
+        return _handle( args[index] ) if len(args) > index else None
+    return track
+def _trackCreated( args, result ):
+    """Tracker for GLUT window creation, the new window (result) is current"""
+    return result or None
+def _trackReleased( args, result ):
+    return None
+def _trackDestroyed( index ):
+    """Tracker for entry points destroying args[index], un-current-ing it"""
+    def track( args, result ):
+        current = _contextState.current
+        if current is not UNTRACKED and current == _handle( args[index] ):
+            return None
+        return current
+    return track
+
+class _TrackContext( object ):
+    """Updates the thread's current-context record after a make-current/destroy call"""
+    def __init__( self, func, tracker ):
+        self.func = func
+        self.tracker = tracker
+    def __setattr__( self, key, value ):
+        if key not in ('func','tracker'):
+            return setattr( self.func, key, value )
+        else:
+            self.__dict__[key] = value
+    def __repr__( self ):
+        return repr( self.func )
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr(self.func, key )
+        raise AttributeError( key )
+    def __call__( self, *args ):
+        try:
+            result = self.func( *args )
+        except Exception:
+            _contextState.current = UNTRACKED
+            raise
+        _contextState.current = self.tracker( args, result )
+        return result
+
+class _Checkpoint( object ):
+    """Polls deferred GL error checkers before calling func (a buffer swap)"""
+    def __init__( self, func ):
+        self.func = func
+    def __setattr__( self, key, value ):
+        if key != 'func':
+            return setattr( self.func, key, value )
+        else:
+            self.__dict__[key] = value
+    def __repr__( self ):
+        return repr( self.func )
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr(self.func, key )
+        raise AttributeError( key )
+    def __call__( self, *args ):
+        from OpenGL import error
+        error.checkpoint()
+        return self.func( *args )
+
+class _FlushDeferred( object ):
+    """Runs the thread's deferred GL work (if any) before calling func"""
+    def __init__( self, func ):
+        self.func = func
+    def __setattr__( self, key, value ):
+        if key != 'func':
+            return setattr( self.func, key, value )
+        else:
+            self.__dict__[key] = value
+    def __repr__( self ):
+        return repr( self.func )
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr(self.func, key )
+        raise AttributeError( key )
+    def __call__( self, *args ):
+        flush = deferredWork.flush
+        if flush is not None:
+            flush()
+        return self.func( *args )
+
 class _CheckContext( object ):
     def __init__( self, func, ccisvalid ):
         self.func = func 
@@ -35,9 +154,14 @@ class _CheckContext( object ):
             return getattr(self.func, key )
         raise AttributeError( key )
     def __call__( self, *args, **named ):
-        if not self.ccisvalid():
+        current = _contextState.current
+        if current is UNTRACKED:
+            current = self.ccisvalid()
+        if not current:
             from OpenGL import error
-            raise error.NoContext( self.func.__name__, args, named )
+            failure = error.NoContext( self.func.__name__, args, named )
+            logs.logFailure( self.func, failure )
+            raise failure
         return self.func( *args, **named )
 
 def _find_module( exclude = (__name__,)):
@@ -73,11 +197,24 @@ class BasePlatform( object ):
         EXTENSIONS_USE_BASE_FUNCTIONS -- if True, uses regular
             dll attribute-based lookup to retrieve extension 
             function pointers.
+
+        CONTEXT_TRACKERS -- entry points that make a context (or GLUT
+            window) current or destroy it, mapped to a function of
+            (args, result) giving the thread's new current context,
+            lets CurrentContextIsValid answer without asking the driver
+
+        ERROR_CHECKPOINTS -- entry points (buffer swaps) before which
+            deferred GL error checkers are polled
+
+        With IMMEDIATE_EMULATION, the GL/GLU/GLUT entry points, the
+        ERROR_CHECKPOINTS and the CONTEXT_TRACKERS run deferredWork
+        first.
     """
     
     EXPORTED_NAMES = [
         'GetCurrentContext',
         'CurrentContextIsValid',
+        'forgetCurrentContext',
         'createBaseFunction', 
         'createExtensionFunction', 
         'copyBaseFunction',
@@ -90,6 +227,28 @@ class BasePlatform( object ):
     DEFAULT_FUNCTION_TYPE = None
     GLUT_GUARD_CALLBACKS = False
     EXTENSIONS_USE_BASE_FUNCTIONS = False
+    CONTEXT_TRACKERS = {
+        'eglMakeCurrent': _trackMakeCurrent( 3 ),
+        'eglReleaseThread': _trackReleased,
+        'glXMakeCurrent': _trackMakeCurrent( 2 ),
+        'glXMakeContextCurrent': _trackMakeCurrent( 3 ),
+        'glXMakeCurrentReadSGI': _trackMakeCurrent( 3 ),
+        'OSMesaMakeCurrent': _trackMakeCurrent( 0 ),
+        'OSMesaDestroyContext': _trackDestroyed( 0 ),
+        'wglMakeCurrent': _trackMakeCurrent( 1 ),
+        'wglDeleteContext': _trackDestroyed( 0 ),
+        'glutCreateWindow': _trackCreated,
+        'glutCreateSubWindow': _trackCreated,
+        '__glutCreateWindowWithExit': _trackCreated,
+        'glutSetWindow': _trackMakeCurrent( 0 ),
+        'glutDestroyWindow': _trackDestroyed( 0 ),
+    }
+    ERROR_CHECKPOINTS = (
+        'glutSwapBuffers',
+        'eglSwapBuffers',
+        'glXSwapBuffers',
+        'wglSwapBuffers',
+    )
     
     def install( self, namespace ):
         """Install this platform instance into the platform module"""
@@ -123,6 +282,38 @@ class BasePlatform( object ):
         ) and not func.__name__.startswith( 'glX' ):
             return _CheckContext( func, self.CurrentContextIsValid )
         return func 
+    def wrapErrorCheckpoint( self, func ):
+        """Wrap buffer swaps to poll deferred error checkers first"""
+        if _configflags.ERROR_CHECKING and func.__name__ in self.ERROR_CHECKPOINTS:
+            return _Checkpoint( func )
+        return func
+    def wrapContextTracking( self, func ):
+        """Wrap make-current/destroy functions to keep the current-context record"""
+        tracker = self.CONTEXT_TRACKERS.get( func.__name__ )
+        if tracker is not None:
+            return _TrackContext( func, tracker )
+        return func
+    def wrapFlushDeferred( self, func, dll ):
+        """Wrap function to flush batched immediate-mode work first if IMMEDIATE_EMULATION is set"""
+        if _configflags.IMMEDIATE_EMULATION and (
+            dll in (self.GL, self.GLU, self.GLUT)
+            or func.__name__ in self.ERROR_CHECKPOINTS
+            or func.__name__ in self.CONTEXT_TRACKERS
+        ):
+            return _FlushDeferred( func )
+        return func
+    def wrapCounting( self, func ):
+        """Wrap function with its OpenGL.counters Counter if PROFILING is set"""
+        if _configflags.PROFILING:
+            from OpenGL import counters
+            return counters.counted( func )
+        return func
+    def wrapTracing( self, func ):
+        """Wrap function to record its calls if PYOPENGL_TRACE is set"""
+        if _configflags.TRACE_FILE:
+            from OpenGL import trace
+            return trace.traced( func )
+        return func
     def wrapLogging( self, func ):
         """Wrap function with logging operations if appropriate"""
         return logs.logOnFail( func, logs.getLog( 'OpenGL.errors' ))
@@ -156,7 +347,11 @@ class BasePlatform( object ):
             
         if force_extension or ((not is_core) and (not self.EXTENSIONS_USE_BASE_FUNCTIONS)):
             # what about the VERSION values???
+            from OpenGL import _extensioncache
+            if _extensioncache.available( functionName ) is False:
+                raise AttributeError( """Extension %r available, but no pointer for function %r"""%(extension,functionName))
             pointer = self.getExtensionProcedure( as_8_bit(functionName) )
+            _extensioncache.record( functionName, bool(pointer) )
             if pointer:
                 func = self.functionTypeFor( dll )(
                     resultType,
@@ -182,8 +377,19 @@ class BasePlatform( object ):
         func.extension = extension
         func.deprecated = deprecated
         func = self.wrapLogging( 
-            self.wrapContextCheck(
-                self.errorChecking( func, dll, error_checker=error_checker ),
+            self.wrapFlushDeferred(
+                self.wrapContextCheck(
+                    self.wrapContextTracking(
+                        self.wrapErrorCheckpoint(
+                            self.wrapCounting(
+                                self.wrapTracing(
+                                    self.errorChecking( func, dll, error_checker=error_checker ),
+                                ),
+                            ),
+                        ),
+                    ),
+                    dll,
+                ),
                 dll,
             )
         )
@@ -327,19 +533,16 @@ class BasePlatform( object ):
             base = _DeprecatedFunctionPointer
         else:
             base = _NullFunctionPointer
-        cls = type( functionName, (base,), {
-            '__doc__': doc,
-            'deprecated': deprecated,
-        } )
+        function = base(
+            functionName, dll, resultType, argTypes, argNames, extension=extension, doc=doc,
+            deprecated=deprecated, error_checker = error_checker, force_extension=force_extension,
+        )
         if MODULE_ANNOTATIONS:
             if not module:
                 module = _find_module( )
             if module:
-                cls.__module__ = module
-        return cls(
-            functionName, dll, resultType, argTypes, argNames, extension=extension, doc=doc,
-            error_checker = error_checker, force_extension=force_extension,
-        )
+                function.__module__ = module
+        return function
     def GetCurrentContext( self ):
         """Retrieve opaque pointer for the current context"""
         raise NotImplementedError( 
@@ -350,22 +553,43 @@ class BasePlatform( object ):
         raise NotImplementedError( 
             """Platform does not define a GLUT font retrieval function""" 
         )
-    # names that are normally just references to other items...
-    @lazy_property
     def CurrentContextIsValid( self ):
-        return self.GetCurrentContext
+        """Return the current context (true) or a null/None value (false)
+
+        Once this thread has made a context current through one of the
+        CONTEXT_TRACKERS entry points the answer comes from that record,
+        otherwise the driver is asked via GetCurrentContext.
+        """
+        current = _contextState.current
+        if current is UNTRACKED:
+            return self.GetCurrentContext()
+        return current
+    def forgetCurrentContext( self ):
+        """Go back to asking the driver for this thread's current context
+
+        Call after switching contexts with a toolkit PyOpenGL does not see
+        (SDL, Qt, GLFW...) on a thread that previously used the tracked
+        entry points.
+        """
+        _contextState.current = UNTRACKED
+    # names that are normally just references to other items...
     @lazy_property
     def OpenGL(self): return self.GL
 
 class _NullFunctionPointer( object ):
-    """Function-pointer-like object for undefined functions"""
+    """Function-pointer-like object for undefined functions
+
+    All null functions share this class (or _DeprecatedFunctionPointer);
+    calls dispatch through the per-instance _call, which starts out as the
+    method below and is replaced by the real function once load() finds it.
+    """
     def __init__( 
         self, name, dll, resultType, argTypes, argNames, 
         extension=None, doc=None, deprecated=False,
         error_checker = None, force_extension=None,
     ):
-        from OpenGL import error
         self.__name__ = name
+        self.__doc__ = doc
         self.DLL = dll
         self.argNames = argNames
         self.argtypes = argTypes
@@ -377,6 +601,9 @@ class _NullFunctionPointer( object ):
         self.error_checker = error_checker
         self.force_extension = force_extension
     resolved = False
+    __call__ = property( operator.attrgetter( '_call' ))
+    def __repr__( self ):
+        return '<%s %s at 0x%x>'%( self.__class__.__name__, self.__name__, id(self) )
     def __nonzero__( self ):
         """Make this object appear to be NULL"""
         if (not self.resolved) and (self.extension or self.force_extension):
@@ -406,11 +633,11 @@ class _NullFunctionPointer( object ):
             return None 
         else:
             # now short-circuit so that we don't need to check again...
-            self.__class__.__call__ = staticmethod( func.__call__ )
+            self._call = func
             self.resolved = True
             return func
         return None
-    def __call__( self, *args, **named ):
+    def _call( self, *args, **named ):
         if self.load():
             return self( *args, **named )
         else:
@@ -428,7 +655,7 @@ class _NullFunctionPointer( object ):
 
 class _DeprecatedFunctionPointer( _NullFunctionPointer ):
     deprecated = True
-    def __call__( self, *args, **named ):
+    def _call( self, *args, **named ):
         from OpenGL import error
         raise error.NullFunctionError(
             """Attempt to call a deprecated function %s while OpenGL in FORWARD_COMPATIBLE_ONLY mode.  Set OpenGL.FORWARD_COMPATIBLE_ONLY to False to use legacy entry points"""%(
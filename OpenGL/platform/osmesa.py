@@ -66,8 +66,6 @@ class OSMesaPlatform( baseplatform.BasePlatform ):
         function = self.OSMesa.OSMesaGetCurrentContext
         function.restype = _types.OSMesaContext
         return function
-    @baseplatform.lazy_property
-    def CurrentContextIsValid( self ): return self.GetCurrentContext
     
     @baseplatform.lazy_property
     def getExtensionProcedure( self ):
@@ -0,0 +1,452 @@
+"""Recording and replaying the calls PyOpenGL makes into the driver
+
+With PYOPENGL_TRACE=path set before the platform is imported, every
+function the platform builds is wrapped so that each call is appended to
+a compact binary trace at path.  A call record holds the entry point (as a
+small integer id), a nanosecond timestamp, scalar arguments by value and
+array arguments by content hash, i.e. what reaches the driver after
+PyOpenGL's own conversions.  Array contents up to
+PYOPENGL_TRACE_COPY_LIMIT bytes (default 64 KiB) are stored as well, once
+per distinct content, so re-sending the same data costs a hash; larger
+arrays are only hashed, and replay them as zeros.
+
+    python -m OpenGL.trace summary trace.gltr [--top N]
+    PYOPENGL_PLATFORM=egl python -m OpenGL.trace replay trace.gltr [--size 800x600]
+
+summary reports calls per frame and the bytes passed in arrays, per entry
+point.  replay re-issues the calls through bare ctypes functions on a
+headless context (see OpenGL.headless) and times the frames next to the
+recorded ones, separating the driver's share of a frame from the
+Python side's.  Window-system and GLUT calls
+are not replayed, buffer swaps mark the frames, and calls with an argument
+that could not be recorded (byref() pointers, callbacks, structures,
+arrays of pointers such as glShaderSource's strings) are skipped.  Integers given for pointer parameters replay as-is, which is
+right for buffer offsets but not for raw client addresses, and object
+names are not remapped, so a replay expects a fresh context.
+
+File layout, little-endian:
+
+    header  magic b"GLTR", version u16
+    NAME    u8 1, id u16, result code 1s, argument count u8, codes, name length u8, name
+    BLOB    u8 2, hash 8s, size u32, data
+    CALL    u8 3, id u16, time u64 ns since the trace started, then per argument
+            b"n" | b"i" q | b"u" Q | b"f" d | b"a" hash 8s, size u32 | b"p"
+
+Codes are ctypes type codes ("f", "i", "I", ...), "P" for any pointer or
+array parameter and "v" for a void result.
+"""
+import atexit, collections, ctypes, hashlib, struct, time
+from OpenGL import _configflags
+
+MAGIC, VERSION = b"GLTR", 1
+NAME, BLOB, CALL = 1, 2, 3
+_HEADER = struct.Struct( '<4sH' )
+_NAME = struct.Struct( '<BHcB' )
+_BLOB = struct.Struct( '<B8sI' )
+_CALL = struct.Struct( '<BHQ' )
+_INT = struct.Struct( '<cq' )
+_UINT = struct.Struct( '<cQ' )
+_FLOAT = struct.Struct( '<cd' )
+_ARRAY = struct.Struct( '<c8sI' )
+_SIZES = {b'n': 0, b'p': 0, b'i': 8, b'u': 8, b'f': 8, b'a': 12}
+
+SWAPS = frozenset( ('glutSwapBuffers','eglSwapBuffers','glXSwapBuffers','wglSwapBuffers') )
+NOT_REPLAYED = ('glut','egl','glX','wgl','OSMesa','CGL')
+
+_CTYPES = dict(
+    (simple._type_, simple) for simple in (
+        ctypes.c_char, ctypes.c_byte, ctypes.c_ubyte, ctypes.c_short, ctypes.c_ushort,
+        ctypes.c_int, ctypes.c_uint, ctypes.c_long, ctypes.c_ulong,
+        ctypes.c_longlong, ctypes.c_ulonglong, ctypes.c_float, ctypes.c_double,
+        ctypes.c_longdouble, ctypes.c_bool, ctypes.c_void_p,
+    )
+)
+
+def typeCode( argType ):
+    """Trace code for a ctypes argument or result type"""
+    if argType is None:
+        return 'v'
+    code = getattr( argType, '_type_', None )
+    if isinstance( code, str ) and code in _CTYPES and issubclass( argType, ctypes._SimpleCData ):
+        return code
+    return 'P'
+
+_ADDRESSES = (ctypes.c_void_p, ctypes.c_char_p, ctypes.c_wchar_p)
+
+def holdsPointers( argType ):
+    """Whether an array for argType holds addresses (char**, void**...)"""
+    target = getattr( argType, 'baseType', None )
+    if target is None and isinstance( argType, type ) and issubclass( argType, ctypes._Pointer ):
+        target = argType._type_
+    return isinstance( target, type ) and (
+        issubclass( target, _ADDRESSES ) or issubclass( target, ctypes._Pointer )
+    )
+
+class TraceWriter( object ):
+    """Appends NAME/BLOB/CALL records to a trace file"""
+    def __init__( self, path, copyLimit=65536 ):
+        self.file = open( path, 'wb', buffering=1<<20 )
+        self.file.write( _HEADER.pack( MAGIC, VERSION ))
+        self.copyLimit = copyLimit
+        self.names = 0
+        self.blobs = set()
+        self.opaque = {}
+        self.start = time.perf_counter_ns()
+        atexit.register( self.close )
+    def close( self ):
+        if not self.file.closed:
+            self.file.close()
+    def declare( self, name, restype, argtypes ):
+        """Write a NAME record, returns (id, argument codes)"""
+        identifier, self.names = self.names, self.names + 1
+        codes = ''.join( [typeCode( argType ) for argType in argtypes] )
+        name = name.encode( 'ascii' ) if isinstance( name, str ) else name
+        self.file.write( b''.join( [
+            _NAME.pack( NAME, identifier, typeCode( restype ).encode( 'ascii' ), len( codes )),
+            codes.encode( 'ascii' ), bytes( [len( name )] ), name,
+        ] ))
+        return identifier, codes
+    def encode( self, code, argType, arg ):
+        """Record form of one argument, and the argument to pass on"""
+        if arg is None:
+            return b'n', arg
+        if code != 'P':
+            value = arg.value if isinstance( arg, ctypes._SimpleCData ) else arg
+            if code in 'fdg':
+                return _FLOAT.pack( b'f', float( value )), arg
+            if isinstance( value, bytes ):
+                value = ord( value )
+            return self.integer( int( value )), arg
+        if isinstance( arg, int ):
+            return self.integer( arg ), arg
+        if isinstance( arg, ctypes.c_void_p ):
+            return (b'n' if arg.value is None else self.integer( arg.value )), arg
+        opaque = self.opaque.get( argType )
+        if opaque is None:
+            opaque = self.opaque[argType] = holdsPointers( argType )
+        if opaque:
+            # the addresses mean nothing outside this process
+            return b'p', arg
+        if isinstance( arg, (str, bytes) ):
+            # passed as a NUL-terminated copy
+            data = arg.encode( 'utf-8' ) if isinstance( arg, str ) else arg
+            return self.blob( memoryview( data + b'\0' )), arg
+        if isinstance( arg, (list, tuple) ) and hasattr( argType, 'asArray' ):
+            arg = argType.asArray( arg )
+        try:
+            view = memoryview( arg )
+        except TypeError:
+            from OpenGL.arrays import vbo
+            if isinstance( arg, (vbo.VBO, vbo.VBOOffset) ):
+                # bound buffer, the handler passes the offset
+                converted = argType.from_param( arg )
+                return (b'n' if converted.value is None else self.integer( converted.value )), arg
+            return b'p', arg
+        return self.blob( view ), arg
+    def blob( self, view ):
+        """Record form of an array argument, writing its BLOB the first time"""
+        size = view.nbytes
+        digest = hashlib.blake2b( view if view.c_contiguous else view.tobytes(), digest_size=8 ).digest()
+        if digest not in self.blobs:
+            self.blobs.add( digest )
+            if size <= self.copyLimit:
+                self.file.write( _BLOB.pack( BLOB, digest, size ))
+                self.file.write( view.tobytes() )
+        return _ARRAY.pack( b'a', digest, size )
+    def integer( self, value ):
+        if value >= 1<<63:
+            return _UINT.pack( b'u', value )
+        return _INT.pack( b'i', value )
+
+_writer = None
+
+def writer( ):
+    """The process' TraceWriter for PYOPENGL_TRACE, created on first use"""
+    global _writer
+    if _writer is None:
+        _writer = TraceWriter( _configflags.TRACE_FILE, _configflags.TRACE_COPY_LIMIT )
+    return _writer
+
+class _Traced( object ):
+    """Records each call to func in the trace before making it"""
+    __slots__ = ('func','trace','identifier','argTypes','codes','scalar','fields')
+    def __init__( self, func, trace ):
+        for key, value in (('func',func),('trace',trace),('identifier',None),('scalar',None)):
+            object.__setattr__( self, key, value )
+    def __setattr__( self, key, value ):
+        if key not in self.__slots__:
+            return setattr( self.func, key, value )
+        else:
+            object.__setattr__( self, key, value )
+    def __repr__( self ):
+        return repr( self.func )
+    def __getattr__( self, key ):
+        if key != 'func':
+            return getattr( self.func, key )
+        raise AttributeError( key )
+    def declare( self ):
+        """Write the NAME record, precompile the record for all-scalar calls"""
+        self.argTypes = list( getattr( self.func, 'argtypes', None ) or () )
+        self.identifier, self.codes = self.trace.declare(
+            self.func.__name__, getattr( self.func, 'restype', None ), self.argTypes,
+        )
+        if 'P' not in self.codes:
+            self.scalar = struct.Struct( '<BHQ' + ''.join([
+                'cd' if code in 'fdg' else 'cq' for code in self.codes
+            ]))
+            self.fields = []
+            for code in self.codes:
+                self.fields.extend( (b'f' if code in 'fdg' else b'i', None) )
+    def __call__( self, *args ):
+        trace = self.trace
+        if trace.file.closed:
+            # closed at exit, later calls (deleting buffers...) go untraced
+            return self.func( *args )
+        if self.identifier is None:
+            self.declare()
+        if self.scalar is not None and len( args ) * 2 == len( self.fields ):
+            fields = self.fields[:]
+            fields[1::2] = args
+            try:
+                record = self.scalar.pack( CALL, self.identifier, time.perf_counter_ns() - trace.start, *fields )
+            except struct.error:
+                # ctypes instances, bytes, values past 2**63...
+                pass
+            else:
+                trace.file.write( record )
+                return self.func( *args )
+        parts = [_CALL.pack( CALL, self.identifier, time.perf_counter_ns() - trace.start )]
+        argtypes = self.argTypes
+        passed = list( args )
+        for index, arg in enumerate( args ):
+            if index < len( argtypes ):
+                encoded, passed[index] = trace.encode( self.codes[index], argtypes[index], arg )
+            else:
+                encoded = b'p'
+            parts.append( encoded )
+        if len( args ) != len( argtypes ):
+            # keep the record parseable, the replayer skips the call
+            parts[1:] = [b'p'] * len( argtypes )
+        trace.file.write( b''.join( parts ))
+        return self.func( *passed )
+
+def traced( func ):
+    """Wrap func to record its calls into the PYOPENGL_TRACE file"""
+    return _Traced( func, writer() )
+
+class Trace( object ):
+    """Parsed view of a trace file
+
+    records() yields, in file order:
+
+        ('name', id, name, result code, argument codes)
+        ('blob', hash, data)
+        ('call', id, time in ns, [(kind, value), ...])
+
+    where an array argument's value is (hash, size).
+    """
+    def __init__( self, path ):
+        with open( path, 'rb' ) as handle:
+            self.data = handle.read()
+        magic, version = _HEADER.unpack_from( self.data )
+        if magic != MAGIC:
+            raise ValueError( "Not a PyOpenGL trace" )
+        if version != VERSION:
+            raise ValueError( "Trace version %d, expected %d"%( version, VERSION ))
+    def records( self ):
+        data, offset = self.data, _HEADER.size
+        codes = {}
+        while offset < len( data ):
+            tag = data[offset]
+            if tag == CALL:
+                _, identifier, when = _CALL.unpack_from( data, offset )
+                offset += _CALL.size
+                args = []
+                for _ in codes[identifier]:
+                    kind = data[offset:offset+1]
+                    if kind == b'a':
+                        _, digest, size = _ARRAY.unpack_from( data, offset )
+                        args.append( (kind, (digest, size)) )
+                    elif kind == b'i':
+                        args.append( (kind, _INT.unpack_from( data, offset )[1]) )
+                    elif kind == b'u':
+                        args.append( (kind, _UINT.unpack_from( data, offset )[1]) )
+                    elif kind == b'f':
+                        args.append( (kind, _FLOAT.unpack_from( data, offset )[1]) )
+                    else:
+                        args.append( (kind, None) )
+                    offset += 1 + _SIZES[kind]
+                yield 'call', identifier, when, args
+            elif tag == NAME:
+                _, identifier, result, count = _NAME.unpack_from( data, offset )
+                offset += _NAME.size
+                argCodes = data[offset:offset+count].decode( 'ascii' )
+                offset += count
+                size = data[offset]
+                name = data[offset+1:offset+1+size].decode( 'ascii' )
+                offset += 1 + size
+                codes[identifier] = argCodes
+                yield 'name', identifier, name, result.decode( 'ascii' ), argCodes
+            elif tag == BLOB:
+                _, digest, size = _BLOB.unpack_from( data, offset )
+                offset += _BLOB.size
+                yield 'blob', digest, data[offset:offset+size]
+                offset += size
+            else:
+                raise ValueError( "Corrupt trace record %r at offset %d"%( tag, offset ))
+
+def summary( path, top=10 ):
+    """Text report: calls per frame, array bytes per entry point"""
+    names = {}
+    calls = collections.Counter()
+    arrayBytes = collections.Counter()
+    copied = copiedBytes = 0
+    frames = []
+    current = first = last = None
+    for record in Trace( path ).records():
+        if record[0] == 'call':
+            _, identifier, when, args = record
+            first = when if first is None else first
+            last = when
+            name = names[identifier]
+            calls[name] += 1
+            arrayBytes[name] += sum( value[1] for kind, value in args if kind == b'a' )
+            current = (current or 0) + 1
+            if name in SWAPS:
+                frames.append( current )
+                current = 0
+        elif record[0] == 'name':
+            names[record[1]] = record[2]
+        else:
+            copied += 1
+            copiedBytes += len( record[2] )
+    total = sum( calls.values() )
+    lines = [
+        '%s: %d calls to %d entry points over %.3f s'%(
+            path, total, len( calls ), ((last or 0) - (first or 0)) / 1e9,
+        ),
+    ]
+    if frames:
+        lines.append( '%d frames, calls/frame mean %.1f max %d, array bytes/frame %.1f KiB'%(
+            len( frames ), sum( frames ) / len( frames ), max( frames ),
+            sum( arrayBytes.values() ) / len( frames ) / 1024.,
+        ))
+    lines.append( 'array bytes %.1f KiB, %d distinct arrays copied (%.1f KiB)'%(
+        sum( arrayBytes.values() ) / 1024., copied, copiedBytes / 1024.,
+    ))
+    lines.append( '%-32s %10s %12s'%( 'entry point', 'calls', 'array KiB' ))
+    for name, count in calls.most_common( top ):
+        lines.append( '%-32s %10d %12.1f'%( name, count, arrayBytes[name] / 1024. ))
+    byBytes = [item for item in arrayBytes.most_common( top ) if item[1]]
+    if byBytes:
+        lines.append( 'by array bytes:' )
+        for name, size in byBytes:
+            lines.append( '%-32s %10d %12.1f'%( name, calls[name], size / 1024. ))
+    return '\n'.join( lines )
+
+def _replayFunction( name, result, codes ):
+    """Bare ctypes function for name on the current platform, None to skip it"""
+    if name.startswith( NOT_REPLAYED ) or 'p' in codes:
+        return None
+    from OpenGL import platform
+    PLATFORM = platform.PLATFORM
+    address = None
+    for dll in (PLATFORM.GL, PLATFORM.GLU):
+        if dll is not None and address is None:
+            try:
+                address = ctypes.cast( getattr( dll, name ), ctypes.c_void_p ).value
+            except AttributeError:
+                pass
+    if address is None:
+        address = PLATFORM.getExtensionProcedure( name.encode( 'ascii' ))
+    if not address:
+        return None
+    prototype = PLATFORM.functionTypeFor( PLATFORM.GL )(
+        None if result == 'v' else _CTYPES.get( result, ctypes.c_void_p ),
+        *[_CTYPES.get( code, ctypes.c_void_p ) for code in codes]
+    )
+    return prototype( address )
+
+def replay( path ):
+    """Re-issue the trace's calls on the current context
+
+    The whole trace is decoded (functions resolved, array arguments
+    built) before the first call, so the frame times cover the calls
+    alone.
+
+    returns (replayed frame times, recorded frame times, calls made,
+    Counter of skipped names), times in seconds
+    """
+    from OpenGL.raw.GL.VERSION.GL_1_0 import glFinish
+    names, functions, blobs = {}, {}, {}
+    skipped = collections.Counter()
+    calls = []
+    for record in Trace( path ).records():
+        if record[0] == 'call':
+            _, identifier, when, args = record
+            name = names[identifier]
+            if name in SWAPS:
+                calls.append( (None, when) )
+                continue
+            function = functions[identifier]
+            if function is None or any( kind == b'p' for kind, value in args ):
+                skipped[name] += 1
+                continue
+            passed = []
+            for kind, value in args:
+                if kind == b'a':
+                    # a fresh copy per call, output arguments write into it
+                    digest, size = value
+                    data = blobs.get( digest )
+                    value = ctypes.create_string_buffer( data, size ) if data is not None else (ctypes.c_char * size)()
+                passed.append( value )
+            calls.append( (function, passed) )
+        elif record[0] == 'name':
+            _, identifier, name, result, codes = record
+            names[identifier] = name
+            functions[identifier] = _replayFunction( name, result, codes )
+        else:
+            blobs[record[1]] = record[2]
+    frames, recorded = [], []
+    start, recordedStart = time.perf_counter(), None
+    for function, passed in calls:
+        if function is None:
+            glFinish()
+            now = time.perf_counter()
+            frames.append( now - start )
+            start = now
+            if recordedStart is not None:
+                recorded.append( (passed - recordedStart) / 1e9 )
+            recordedStart = passed
+        else:
+            function( *passed )
+    glFinish()
+    made = len( calls ) - len( frames )
+    # the first frame's recording start is unknown, drop it from both
+    return frames[1:], recorded, made, skipped
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser( description = 'Summarise or replay a PYOPENGL_TRACE file' )
+    parser.add_argument( 'command', choices=('summary','replay') )
+    parser.add_argument( 'trace' )
+    parser.add_argument( '--top', type=int, default=10, help='entry points to list' )
+    parser.add_argument( '--size', default='800x600', help='replay context size' )
+    options = parser.parse_args()
+    if options.command == 'summary':
+        print( summary( options.trace, options.top ))
+    else:
+        from OpenGL import headless
+        width, height = [int( x ) for x in options.size.split( 'x' )]
+        context = headless.createContext( width, height )
+        frames, recorded, made, skipped = replay( options.trace )
+        print( 'replayed %d calls, skipped %d'%( made, sum( skipped.values() )))
+        for label, times in (('replayed',frames),('recorded',recorded)):
+            if times:
+                times.sort()
+                print( '%s %d frames, ms/frame mean %.3f median %.3f max %.3f'%(
+                    label, len( times ), 1000 * sum( times ) / len( times ),
+                    1000 * times[len( times ) // 2], 1000 * times[-1],
+                ))
+        for name, count in skipped.most_common( options.top ):
+            print( 'skipped %-32s %d'%( name, count ))
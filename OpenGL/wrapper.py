@@ -1,8 +1,10 @@
 """The wrapping code for providing natural ctypes-based OpenGL interface"""
-import ctypes, logging
-from OpenGL import platform, error
+import ctypes, linecache, logging, operator
+from OpenGL import platform, error, logs
 assert platform
-from OpenGL._configflags import STORE_POINTERS, ERROR_ON_COPY, SIZE_1_ARRAY_UNPACK
+from OpenGL._configflags import STORE_POINTERS, ERROR_ON_COPY, SIZE_1_ARRAY_UNPACK, PROFILING
+if PROFILING:
+    from OpenGL import counters
 from OpenGL import converters
 from OpenGL.converters import DefaultCConverter
 from OpenGL.converters import returnCArgument,returnPyArgument
@@ -396,6 +398,8 @@ class Wrapper( LateBind ):
         if not callFunction:
             raise RuntimeError( """Missing finalised call type for %s"""%( self, ))
         else:
+            if PROFILING:
+                callFunction = counters.countedWrapper( self.__name__, callFunction )
             #self.__class__.finalize = lambda *args: callFunction
             #self.__call__ = callFunction
             #self.__class__.__call__ = callFunction
@@ -403,6 +407,9 @@ class Wrapper( LateBind ):
             #self.__class__.__dict__[ '__call__' ] = callFunction
             #print 'setting class call', callFunction
             self.setFinalCall( callFunction )
+            if not cWrapper:
+                # bypass LateBind.__call__ from now on
+                object.__setattr__( self, '__class__', _boundCallClass( self.__class__ ) )
             return callFunction
         #return self
     def finaliseCall( self ):
@@ -411,8 +418,9 @@ class Wrapper( LateBind ):
         This returns a version of __call__ that only does that work which is
         required by the particular wrapper object
 
-        This is essentially a huge set of expanded nested functions, very
-        inelegant...
+        With OpenGL_accelerate this is the Cython Wrapper, otherwise it is a
+        straight-line function generated for the wrapper's signature, see
+        _callFactory
         """
         pyConverters = getattr( self, 'pyConverters', None )
         cConverters = getattr( self, 'cConverters', None )
@@ -420,978 +428,37 @@ class Wrapper( LateBind ):
         wrappedOperation = self.wrappedOperation
         storeValues = getattr( self, 'storeValues', None )
         returnValues = getattr( self, 'returnValues', None )
+        if not cWrapper:
+            factory = _callFactory(
+                _callSignature( pyConverters, cConverters, cResolvers, storeValues, returnValues )
+            )
+            return factory(
+                self, wrappedOperation,
+                pyConverters, cConverters, cResolvers,
+                storeValues, returnValues,
+            )
         if pyConverters:
-            if cWrapper:
-                calculate_pyArgs = PyArgCalculator(
-                    self,pyConverters,
-                )
-            else:
-                pyConverters_mapped = [
-                    (i,converter,(converter is None))
-                    for (i,converter) in enumerate( pyConverters )
-                ]
-                pyConverters_length = len([p for p in pyConverters if not getattr( p, 'optional', False)])
-                def calculate_pyArgs( args ):
-                    if pyConverters_length > len(args):
-                        raise ValueError(
-                            """%s requires %r arguments (%s), received %s: %r"""%(
-                                wrappedOperation.__name__,
-                                pyConverters_length,
-                                ", ".join( self.pyConverterNames ),
-                                len(args),
-                                args
-                            )
-                        )
-                    for index,converter,isNone in pyConverters_mapped:
-                        if isNone:
-                            yield args[index]
-                        else:
-                            try:
-                                yield converter(args[index], self, args)
-                            except IndexError as err:
-                                yield NULL
-                            except Exception as err:
-                                if hasattr( err, 'args' ):
-                                    err.args += ( converter, )
-                                raise
+            calculate_pyArgs = PyArgCalculator(
+                self,pyConverters,
+            )
         else:
             calculate_pyArgs = None
         if cConverters:
-            if cWrapper:
-                calculate_cArgs = CArgCalculator( self, cConverters )
-            else:
-                cConverters_mapped = [
-                    (i,converter,hasattr(converter,'__call__'))
-                    for (i,converter) in enumerate( cConverters )
-                ]
-                def calculate_cArgs( pyArgs ):
-                    for index,converter,canCall in cConverters_mapped:
-                        if canCall:
-                            try:
-                                yield converter( pyArgs, index, self )
-                            except Exception as err:
-                                if hasattr( err, 'args' ):
-                                    err.args += (
-                                        """Failure in cConverter %r"""%(converter),
-                                        pyArgs, index, self,
-                                    )
-                                raise
-                        else:
-                            yield converter
+            calculate_cArgs = CArgCalculator( self, cConverters )
         else:
             calculate_cArgs = None
         if cResolvers:
-            if cWrapper:
-                calculate_cArguments = CArgumentCalculator( cResolvers )
-            else:
-                cResolvers_mapped = list(enumerate(cResolvers))
-                def calculate_cArguments( cArgs ):
-                    for i,converter in cResolvers_mapped:
-                        if converter is None:
-                            yield cArgs[i]
-                        else:
-                            try:
-                                yield converter( cArgs[i] )
-                            except Exception as err:
-                                err.args += (converter,)
-                                raise
+            calculate_cArguments = CArgumentCalculator( cResolvers )
         else:
             calculate_cArguments = None
-        if cWrapper:
-            return cWrapper(
-                wrappedOperation,
-                calculate_pyArgs=calculate_pyArgs,
-                calculate_cArgs=calculate_cArgs,
-                calculate_cArguments=calculate_cArguments,
-                storeValues=storeValues,
-                returnValues=returnValues,
-            )
-        if pyConverters:
-            if cConverters:
-                # create a map of index,converter, callable
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-                else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-            else:
-                # null cConverters
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-                else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-        else:
-            # null pyConverters
-            if cConverters:
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-                else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-            else:
-                # null cConverters
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                return result
-                            return wrapperCall
-                else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                return result
-                            return wrapperCall
+        return cWrapper(
+            wrappedOperation,
+            calculate_pyArgs=calculate_pyArgs,
+            calculate_cArgs=calculate_cArgs,
+            calculate_cArguments=calculate_cArguments,
+            storeValues=storeValues,
+            returnValues=returnValues,
+        )
 #    def __call__( self, *args, **named ):
 #        """Finalise the wrapper before calling it"""
 #        try:
@@ -1455,6 +522,7 @@ class Wrapper( LateBind ):
             result = self.wrappedOperation( *cArguments )
         except ctypes.ArgumentError as err:
             err.args = err.args + (cArguments,)
+            logs.logFailure( self.wrappedOperation, err )
             raise err
         except error.GLError as err:
             err.cArgs = cArgs
@@ -1480,6 +548,233 @@ class Wrapper( LateBind ):
         else:
             return result
 
+def _argumentCountError( wrapper, required, args ):
+    """ValueError for a call with fewer than required arguments"""
+    names = getattr( wrapper, 'pyConverterNames', None ) or wrapper.wrappedOperation.argNames
+    return ValueError(
+        """%s requires %r arguments (%s), received %s: %r"""%(
+            wrapper.wrappedOperation.__name__,
+            required,
+            ", ".join( names ),
+            len(args),
+            args
+        )
+    )
+
+def _callSignature( pyConverters, cConverters, cResolvers, storeValues, returnValues ):
+    """Hashable description of the work a finalised wrapper's call does
+
+    pyConverters become 'n' (pass through), 'c' (convert) or 'o' (convert,
+    optional argument); cConverters become the index of the Python argument
+    they pass through (DefaultCConverter, getPyArgsName), 'c' (convert) or
+    'k' (constant); cResolvers become 'n' or 'c'.  None where the wrapper has
+    no such converters.
+    """
+    if pyConverters:
+        pyKinds = tuple([
+            'n' if converter is None else (
+                'o' if getattr( converter, 'optional', False ) else 'c'
+            )
+            for converter in pyConverters
+        ])
+    else:
+        pyKinds = None
+    if cConverters:
+        cKinds = []
+        for converter in cConverters:
+            index = None
+            if isinstance( converter, (DefaultCConverter, converters.getPyArgsName) ):
+                index = getattr( converter, 'index', None )
+            if index is not None and (pyKinds is None or index < len(pyKinds)):
+                cKinds.append( index )
+            elif hasattr( converter, '__call__' ):
+                cKinds.append( 'c' )
+            else:
+                cKinds.append( 'k' )
+        cKinds = tuple( cKinds )
+    else:
+        cKinds = None
+    if cResolvers:
+        rKinds = tuple([ 'n' if converter is None else 'c' for converter in cResolvers ])
+    else:
+        rKinds = None
+    return (pyKinds, cKinds, rKinds, storeValues is not None, returnValues is not None)
+
+def _tupleSource( expressions ):
+    if expressions is None:
+        return 'args'
+    return '(%s)'%( ''.join([ '%s, '%(e,) for e in expressions ]) )
+
+def _callSource( signature ):
+    """Python source of the call factory for signature (see _callSignature)
+
+    Every converter is bound to a local of the factory and called inline on
+    its argument index, so the generated wrapperCall has no loops or
+    generators and only builds the pyArgs/cArgs tuples that a cConverter,
+    storeValues or returnValues actually receives (or that an error reports).
+    """
+    pyKinds, cKinds, rKinds, store, ret = signature
+    setup = []
+    body = []
+    # Python arguments: p<i>, or args itself without pyConverters
+    pyArgs = None
+    if pyKinds is not None:
+        required = len([ kind for kind in pyKinds if kind != 'o' ])
+        if required:
+            body += [
+                'if len(args) < %d:'%( required, ),
+                '    raise _argumentCountError(self, %d, args)'%( required, ),
+            ]
+        pyArgs = []
+        for i,kind in enumerate( pyKinds ):
+            if kind == 'n':
+                body.append( 'p%d = args[%d]'%( i, i ) )
+            else:
+                setup.append( 'py%d = pyConverters[%d]'%( i, i ) )
+                body += [
+                    'try:',
+                    '    p%d = py%d(args[%d], self, args)'%( i, i, i ),
+                    'except IndexError:',
+                    '    p%d = NULL'%( i, ),
+                    'except Exception as err:',
+                    '    if hasattr(err, "args"):',
+                    '        err.args += (py%d,)'%( i, ),
+                    '    raise',
+                ]
+            pyArgs.append( 'p%d'%( i, ) )
+    pyTuple = _tupleSource( pyArgs )
+    # C-level arguments: c<i>/k<i>, passed-through Python arguments, or as pyArgs
+    if cKinds is not None:
+        indices = [ kind for kind in cKinds if not isinstance( kind, str ) ]
+        if pyKinds is None and indices:
+            body += [
+                'if len(args) < %d:'%( max(indices)+1, ),
+                '    raise _argumentCountError(self, %d, args)'%( max(indices)+1, ),
+            ]
+        if 'c' in cKinds and pyArgs is not None:
+            body.append( 'pyArgs = %s'%( pyTuple, ) )
+            pyTuple = 'pyArgs'
+        cArgs = []
+        for i,kind in enumerate( cKinds ):
+            if kind == 'c':
+                setup.append( 'cc%d = cConverters[%d]'%( i, i ) )
+                body += [
+                    'try:',
+                    '    c%d = cc%d(%s, %d, self)'%( i, i, pyTuple, i ),
+                    'except Exception as err:',
+                    '    if hasattr(err, "args"):',
+                    '        err.args += ("Failure in cConverter %%r"%%(cc%d,), %s, %d, self)'%( i, pyTuple, i ),
+                    '    raise',
+                ]
+                cArgs.append( 'c%d'%( i, ) )
+            elif kind == 'k':
+                setup.append( 'k%d = cConverters[%d]'%( i, i ) )
+                cArgs.append( 'k%d'%( i, ) )
+            elif pyArgs is not None:
+                cArgs.append( pyArgs[kind] )
+            else:
+                cArgs.append( 'args[%d]'%( kind, ) )
+        cTuple = _tupleSource( cArgs )
+    else:
+        cArgs = pyArgs
+        cTuple = pyTuple
+    # ctypes-level arguments: a<i>, or the cArgs themselves
+    if rKinds is not None:
+        cArguments = []
+        for i,kind in enumerate( rKinds ):
+            value = cArgs[i] if cArgs is not None else 'args[%d]'%( i, )
+            if kind == 'n':
+                cArguments.append( value )
+            else:
+                setup.append( 'r%d = cResolvers[%d]'%( i, i ) )
+                body += [
+                    'try:',
+                    '    a%d = r%d(%s)'%( i, i, value ),
+                    'except Exception as err:',
+                    '    err.args += (r%d,)'%( i, ),
+                    '    raise',
+                ]
+                cArguments.append( 'a%d'%( i, ) )
+    else:
+        cArguments = cArgs
+    if cArguments is None:
+        call = 'wrappedOperation(*args)'
+    else:
+        call = 'wrappedOperation(%s)'%( ', '.join( cArguments ), )
+    body += [
+        'try:',
+        '    result = %s'%( call, ),
+        'except ArgumentError as err:',
+        '    err.args = err.args + (%s,)'%( _tupleSource( cArguments ), ),
+        '    logFailure(wrappedOperation, err)',
+        '    raise err',
+        'except GLError as err:',
+        '    err.cArgs = %s'%( cTuple, ),
+        '    err.pyArgs = %s'%( pyTuple, ),
+        '    raise err',
+    ]
+    if store or ret:
+        if pyTuple != 'pyArgs' and pyTuple != 'args':
+            body.append( 'pyArgs = %s'%( pyTuple, ) )
+            pyTuple = 'pyArgs'
+        if cArgs is pyArgs:
+            cTuple = pyTuple
+        else:
+            body.append( 'cArgs = %s'%( cTuple, ) )
+            cTuple = 'cArgs'
+        if store:
+            body.append( 'storeValues(result, self, %s, %s)'%( pyTuple, cTuple ) )
+        if ret:
+            body.append( 'return returnValues(result, self, %s, %s)'%( pyTuple, cTuple ) )
+    if not ret:
+        body.append( 'return result' )
+    return '\n'.join(
+        [ 'def factory(self, wrappedOperation, pyConverters, cConverters, cResolvers, storeValues, returnValues):' ]
+        + [ '    '+line for line in setup ]
+        + [ '    def wrapperCall(*args):' ]
+        + [ '        '+line for line in body ]
+        + [ '    return wrapperCall', '' ]
+    )
+
+_callFactories = {}
+def _callFactory( signature ):
+    """Compile (once per signature) the factory returning a wrapper's call"""
+    factory = _callFactories.get( signature )
+    if factory is None:
+        source = _callSource( signature )
+        filename = '<OpenGL.wrapper call %d>'%( len(_callFactories), )
+        # Register the source so tracebacks through generated calls show it
+        linecache.cache[filename] = ( len(source), None, source.splitlines(True), filename )
+        namespace = {
+            'NULL': NULL,
+            'ArgumentError': ctypes.ArgumentError,
+            'GLError': error.GLError,
+            'logFailure': logs.logFailure,
+            '_argumentCountError': _argumentCountError,
+        }
+        exec( compile( source, filename, 'exec' ), namespace )
+        factory = _callFactories[signature] = namespace['factory']
+    return factory
+
+_boundCallClasses = {}
+def _boundCallClass( cls ):
+    """Subclass of Wrapper class cls whose instances are called as their _finalCall
+
+    Python looks __call__ up on the type, so a property returning the
+    instance's _finalCall lets wrapper(...) go straight to the generated
+    call without the LateBind.__call__ frame in between.
+    """
+    bound = _boundCallClasses.get( cls )
+    if bound is None:
+        bound = _boundCallClasses[cls] = type( cls.__name__, (cls,), {
+            '__slots__': (),
+            '__doc__': cls.__doc__,
+            '__module__': cls.__module__,
+            '__call__': property( operator.attrgetter( '_finalCall' ) ),
+        })
+        _boundCallClasses[bound] = bound
+    return bound
+
 class MultiReturn(object):
     def __init__(self,*children):
         self.children = list(children)
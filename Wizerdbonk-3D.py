@@ -2,17 +2,30 @@ import os
 # Force GLX platform for Linux/X11
 os.environ['PYOPENGL_PLATFORM'] = 'glx'
 
-from OpenGL.GL import *
+from OpenGL.GL import (
+    GL_COLOR_BUFFER_BIT, GL_COMPILE_AND_EXECUTE, GL_DEPTH_BUFFER_BIT, GL_DEPTH_TEST, GL_MODELVIEW, GL_PROJECTION,
+    GL_QUADS, GL_TRIANGLES, GL_TRIANGLE_FAN, glBegin, glCallList, glClear, glClearColor, glColor3f, glEnable, glEnd,
+    glEndList, glGenLists, glLoadIdentity, glMatrixMode, glNewList, glNormal3f, glPopMatrix, glPushMatrix,
+    glRasterPos3f, glVertex3f,
+)  # Named, not *, so OpenGL.GL only loads the modules these come from
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
 import sys
 import math
+import numpy as np
+from wizardbonk.crowd import separation
+from wizardbonk import gpu_timer, snapshot
+from wizardbonk.gpu_timer import gpu_scope
+from wizardbonk.quality import TIER_NAMES, TIERS, QualityGovernor
+from wizardbonk.rng import Streams
+from wizardbonk.terrain import ChunkedTerrain
+from wizardbonk.workqueue import WorkQueue
 
 # --- GLOBALS & CONFIG ---
 window = None
 frame = 0
 keys = {}
-rng_state = 123456
+rng = Streams(123456) # Named LCG streams: world (layout), spawns, particles, spells
 
 # Game State
 enemies = []
@@ -38,17 +51,29 @@ bullet_hell_charges = 0
 bullet_hell_cooldown = 0
 rock_armour_rocks = []
 
+# Experimental shared-memory horde (WIZARDBONK_HORDE_WORKERS=N enables it)
+horde = None
+# Transform-feedback particle backend (WIZARDBONK_PARTICLES=gpu enables it)
+gpu_particles = None
+# World-state snapshot: K saves (memory + file), L rolls back to it
+snapshot_path = os.environ.get('WIZARDBONK_SNAPSHOT', 'snapshot.wbs')
+saved_snapshot = None
+# Render quality tiers, stepped down when frames run over budget (WIZARDBONK_QUALITY=<tier> pins one)
+quality = QualityGovernor()
+hud_list = None
+# Waves and new arenas are built a slice per frame within this budget, then go live at once
+work = WorkQueue(budget_ms=2.0)
+
 # --- RANDOMNESS (LCG) ---
+# Shorthands for the world stream; spawns, particles and spells draw from their own streams
 def lcg_random():
-    global rng_state
-    rng_state = (1103515245 * rng_state + 12345) % 2147483648
-    return rng_state / 2147483648.0
+    return rng.world.random()
 
 def lcg_randint(a, b):
-    return a + int(lcg_random() * (b - a + 1))
+    return rng.world.randint(a, b)
 
 def lcg_uniform(a, b):
-    return a + lcg_random() * (b - a)
+    return rng.world.uniform(a, b)
 
 # --- RENDERING HELPERS ---
 
@@ -79,7 +104,8 @@ def draw_box(x, y, z, sx, sy, sz, color, angle=0):
         glVertex3f(wc[i1][0], wc[i1][1], top_z)
     glEnd()
 
-def draw_cylinder_approx(x, y, z, radius, height, color, segments=12):
+def draw_cylinder_approx(x, y, z, radius, height, color, segments=None):
+    if segments is None: segments = quality.tier.cylinder_segments
     glColor3f(*color)
     glBegin(GL_TRIANGLES)
     for i in range(segments):
@@ -109,7 +135,8 @@ def draw_cylinder_approx(x, y, z, radius, height, color, segments=12):
         glVertex3f(x + x1, y + y1, z + height)
     glEnd()
 
-def draw_cone_approx(x, y, z, radius, height, color, segments=8):
+def draw_cone_approx(x, y, z, radius, height, color, segments=None):
+    if segments is None: segments = quality.tier.cone_segments
     glColor3f(*color)
     # Cone sides
     glBegin(GL_TRIANGLES)
@@ -130,6 +157,18 @@ def draw_cone_approx(x, y, z, radius, height, color, segments=8):
         glVertex3f(x + radius * math.cos(theta), y + radius * math.sin(theta), z)
     glEnd()
 
+# --- LEVEL OF DETAIL ---
+# Past the tier's LOD distance from the player, things are drawn with the lowest tier's detail
+LOD_COLORS = {"zombie": (0, 0.5, 0.5), "skeleton": (0.9, 0.9, 0.9), "creeper": (0.0, 0.8, 0.0)}
+
+def is_far(pos):
+    dx, dy = pos[0] - player.pos[0], pos[1] - player.pos[1]
+    return dx*dx + dy*dy > quality.tier.lod_distance ** 2
+
+def draw_enemy(e):
+    if e.active and e.e_type in LOD_COLORS and is_far(e.pos): draw_box(e.pos[0], e.pos[1], 38, 16, 16, 76, LOD_COLORS[e.e_type], e.facing)
+    else: e.draw()
+
 # --- UTILS ---
 def check_aabb_collision(box1, box2):
     return (box1[0] <= box2[1] and box1[1] >= box2[0] and
@@ -200,58 +239,58 @@ class Camera:
 # --- WORLD ---
 class World:
     def __init__(self):
-        self.grid_size = 40
-        self.grid_length = 50
+        self.grid_length = 50 # Tile size; the floor streams in chunks of 10x10 tiles
         self.zone = "overworld"
+        self.terrain = ChunkedTerrain(tile=self.grid_length, chunk_tiles=10, radius=2)
     def draw(self):
-        start_x = -(self.grid_size * self.grid_length) / 2
-        start_y = -(self.grid_size * self.grid_length) / 2
-        glBegin(GL_QUADS)
-        for i in range(self.grid_size):
-            for j in range(self.grid_size):
-                if self.zone == "overworld": 
-                    col = (0.1, 0.6, 0.1) if (i + j) % 2 == 0 else (0.2, 0.8, 0.2)
-                else: 
-                    # Nether Design: Black rock + Glowing Lava cracks
-                    col = (0.1, 0.1, 0.1) if (i + j) % 2 == 0 else (0.8, 0.2, 0.0)
-                glColor3f(*col)
-                x, y, z = start_x + i * self.grid_length, start_y + j * self.grid_length, 0
-                glVertex3f(x, y, z); glVertex3f(x + self.grid_length, y, z)
-                glVertex3f(x + self.grid_length, y + self.grid_length, z); glVertex3f(x, y + self.grid_length, z)
-        glEnd()
+        self.terrain.draw(self.zone, quality.tier.floor_step)
 
 # --- OBSTACLE ---
 class Obstacle:
-    def __init__(self, x, y, o_type):
+    def __init__(self, x, y, o_type, rng=None):
+        randint, random = (rng.randint, rng.random) if rng else (lcg_randint, lcg_random)
         self.pos = [x, y, 0]
         self.o_type = o_type
-        self.size = lcg_randint(30, 60)
-        self.height = lcg_randint(40, 100)
-        if o_type == "spike": self.height = lcg_randint(80, 150); self.size = 20
-        self.color = (0.5, 0.5, 0.5) if lcg_random() > 0.5 else (0.4, 0.4, 0.4)
+        self.size = randint(30, 60)
+        self.height = randint(40, 100)
+        if o_type == "spike": self.height = randint(80, 150); self.size = 20
+        self.color = (0.5, 0.5, 0.5) if random() > 0.5 else (0.4, 0.4, 0.4)
         if o_type == "spike": self.color = (0.3, 0.0, 0.0) # Dark red spikes
 
     def draw(self):
+        lod = TIERS[-1] if self.o_type != "cube" and is_far(self.pos) else quality.tier
         if self.o_type == "cube": draw_box(self.pos[0], self.pos[1], self.height/2, self.size, self.size, self.height, self.color)
-        elif self.o_type == "cylinder": draw_cylinder_approx(self.pos[0], self.pos[1], 0, self.size/2, self.height, self.color)
+        elif self.o_type == "cylinder": draw_cylinder_approx(self.pos[0], self.pos[1], 0, self.size/2, self.height, self.color, lod.cylinder_segments)
         elif self.o_type == "spike": # Cone shape
-             draw_cone_approx(self.pos[0], self.pos[1], 0, self.size, self.height, self.color)
+             draw_cone_approx(self.pos[0], self.pos[1], 0, self.size, self.height, self.color, lod.cone_segments)
 
     def get_aabb(self):
         r = self.size / 2
         return (self.pos[0]-r, self.pos[0]+r, self.pos[1]-r, self.pos[1]+r, 0, self.height)
 
-def spawn_obstacles(count):
-    obstacles.clear()
-    global world
-    for _ in range(count):
-        while True:
-            x = lcg_randint(-900, 900); y = lcg_randint(-900, 900)
-            if math.sqrt(x*x + y*y) > 200:
-                type_pool = ["cube", "cylinder"]
-                if world.zone != "overworld": type_pool.append("spike"); type_pool.append("spike") # More spikes in Nether
-                obstacles.append(Obstacle(x, y, type_pool[lcg_randint(0, len(type_pool)-1)]))
-                break
+def spawn_obstacles(count, respawn=False, zone=None):
+    # New arena layout: count obstacles per 1800x1800 area, placed chunk by chunk as the player roams.
+    # The area around the (re)spawn point is built off the work queue and swapped in whole;
+    # with respawn the player moves to the origin, a "transition" portal wakes up and the world
+    # enters zone (default: the current one) at that moment, so the old floor keeps its colours meanwhile.
+    zone = zone or world.zone
+    old = world.terrain
+    terrain = ChunkedTerrain(tile=old.tile, chunk_tiles=old.chunk_tiles, radius=old.radius, density=count / (1800.0 * 1800.0))
+    terrain.reset(lcg_randint(0, 2147483647), zone, Obstacle)
+    def commit():
+        if respawn:
+            player.pos = [0, 0, 0]
+            if portal and portal.state == "transition": portal.state = "inactive"
+        world.zone = zone
+        terrain.graveyard += old.discard()
+        world.terrain = terrain
+        obstacles[:] = terrain.obstacles()
+    work.cancel("arena") # A newer layout replaces one still being built
+    work.submit(terrain.build([0, 0] if respawn else player.pos, zone, quality.tier.floor_step), commit, "arena")
+
+def update_terrain():
+    if world.terrain.make_obstacle is None: return # First arena still being built
+    if world.terrain.update(player.pos): obstacles[:] = world.terrain.obstacles()
 
 # --- PORTAL ---
 class Portal:
@@ -270,10 +309,10 @@ class Portal:
              if not player.boss_active: self.state = "open"
         elif self.state == "open":
             if dist < 50:
-                player.pos = [0, 0, 0]
-                self.state = "inactive"
-                enemies.clear(); spawn_obstacles(20)
-                if world.zone == "overworld": world.zone = "nether"
+                self.state = "transition" # Inert until the new arena is in and the player is back at the origin
+                enemies.clear(); work.cancel("wave")
+                if horde: horde.clear()
+                spawn_obstacles(20, respawn=True, zone="nether" if world.zone == "overworld" else world.zone)
                 return True
         return False
     def draw(self):
@@ -304,7 +343,7 @@ class Projectile:
 
     def update(self):
         self.pos[0] += self.dir[0] * self.speed; self.pos[1] += self.dir[1] * self.speed; self.pos[2] += self.dir[2] * self.speed
-        if abs(self.pos[0]) > 2000 or abs(self.pos[1]) > 2000: self.active = False
+        if abs(self.pos[0] - player.pos[0]) > 2000 or abs(self.pos[1] - player.pos[1]) > 2000: self.active = False
             
     def draw(self):
         if self.active: draw_box(self.pos[0], self.pos[1], self.pos[2], self.size*2, self.size*2, self.size*2, self.color)
@@ -521,20 +560,72 @@ player = Player()
 world = World()
 portal = Portal(0, 400)
 
+WAVE_LOW, WAVE_SPAN = np.array([0, 600, 0]), np.array([6.28, 400, 1]) # Angle, distance, type roll
+
 def spawn_wave(count):
-    for i in range(count):
-        while True:
-            angle = lcg_uniform(0, 6.28); dist = lcg_uniform(600, 1000)
-            ex, ey = player.pos[0] + math.cos(angle) * dist, player.pos[1] + math.sin(angle) * dist
-            rtype = lcg_random()
-            if rtype < 0.5: enemies.append(Zombie(ex, ey))
-            elif rtype < 0.8: enemies.append(Skeleton(ex, ey))
-            else: enemies.append(Creeper(ex, ey))
-            break
+    # Roll the whole wave now (keeps the spawns stream in order), build it off the work queue, release it at once
+    rolls = (WAVE_LOW + rng.spawns.random((count, 3)) * WAVE_SPAN).tolist()
+    origin, staged = list(player.pos), []
+    def build():
+        for angle, dist, rtype in rolls:
+            ex, ey = origin[0] + math.cos(angle) * dist, origin[1] + math.sin(angle) * dist
+            if horde: staged.append((ex, ey, horde.ZOMBIE if rtype < 0.5 else horde.SKELETON if rtype < 0.8 else horde.CREEPER))
+            elif rtype < 0.5: staged.append(Zombie(ex, ey))
+            elif rtype < 0.8: staged.append(Skeleton(ex, ey))
+            else: staged.append(Creeper(ex, ey))
+            yield
+    def commit():
+        if horde:
+            for args in staged: horde.spawn(*args)
+        else: enemies.extend(staged)
+    work.submit(build(), commit, "wave")
+
+# Regular enemies push each other apart so hordes spread out instead of stacking
+CROWD_TYPES = ("zombie", "skeleton", "creeper")
+
+def separate_crowd():
+    crowd = [e for e in enemies if e.active and e.e_type in CROWD_TYPES]
+    if len(crowd) < 2: return
+    push = separation([(e.pos[0], e.pos[1]) for e in crowd]).tolist()
+    for e, (px, py) in zip(crowd, push): e.pos[0] += px; e.pos[1] += py
+
+# --- HORDE (experimental) ---
+# One flyweight per kind so horde enemies reuse the class draw() methods
+HORDE_PROTOS = (Zombie(0, 0), Skeleton(0, 0), Creeper(0, 0))
+
+def draw_horde():
+    live = horde.live()
+    for i in live.nonzero()[0]:
+        e = HORDE_PROTOS[horde.kind[i]]
+        e.pos = [horde.pos[i, 0], horde.pos[i, 1], 0]; e.facing = horde.facing[i]
+        if e.e_type == "creeper": e.exploding, e.fuse = bool(horde.flags[i] & horde.EXPLODING), horde.fuse[i]
+        draw_enemy(e)
+
+def horde_defeated(i):
+    global defeated_count
+    pos = [horde.pos[i, 0], horde.pos[i, 1], 0]
+    defeated_count += 1
+    xp_orbs.append({'pos': list(pos), 'value': 20, 'angle': 0})
+    spawn_particles(pos[0], pos[1], pos[2], 15, (1, 0, 0))
+
+def update_horde():
+    horde.step(player.pos)
+    for i in horde.fired():
+        rad = math.radians(horde.facing[i] + 90)
+        projectiles.append(Projectile(horde.pos[i, 0], horde.pos[i, 1], 50, math.cos(rad), math.sin(rad), 0, "arrow", "enemy"))
+    for i in horde.contacts(player.get_aabb()):
+        if horde.kind[i] == horde.CREEPER:
+            if horde.flags[i] & horde.EXPLODED:
+                player.take_damage(30 * difficulty_multiplier)
+                dx, dy = player.pos[0] - horde.pos[i, 0], player.pos[1] - horde.pos[i, 1]
+                mag = math.sqrt(dx*dx + dy*dy)
+                if mag > 0: player.apply_knockback(dx/mag * 15, dy/mag * 15)
+                spawn_particles(horde.pos[i, 0], horde.pos[i, 1], 0, 20, (1, 0.5, 0))
+        else: player.take_damage(0.5 * difficulty_multiplier)
 
 def spawn_boss(b_type):
     global current_boss
-    angle = lcg_uniform(0, 6.28); dist = 500
+    angle = rng.spawns.uniform(0, 6.28); dist = 500
     ex, ey = player.pos[0] + math.cos(angle) * dist, player.pos[1] + math.sin(angle) * dist
     if b_type == "slime": current_boss = GiantSlime(ex, ey)
     elif b_type == "golem": current_boss = GiantIronGolem(ex, ey)
@@ -542,12 +633,12 @@ def spawn_boss(b_type):
 
 # --- PARTICLES ---
 class Particle:
-    def __init__(self, x, y, z, color):
+    def __init__(self, x, y, z, color, vx, vy, vz, life, size):
         self.pos = [x, y, z]
-        self.vel = [lcg_uniform(-2, 2), lcg_uniform(-2, 2), lcg_uniform(2, 5)]
+        self.vel = [vx, vy, vz]
         self.color = color
-        self.life = lcg_randint(20, 40)
-        self.size = lcg_uniform(1, 3)
+        self.life = life
+        self.size = size
 
     def update(self):
         self.pos[0] += self.vel[0]
@@ -561,9 +652,17 @@ class Particle:
 
 particles = []
 
+# Per particle: vx, vy, vz, life, size
+PARTICLE_LOW, PARTICLE_SPAN = np.array([-2, -2, 2, 20, 1]), np.array([4, 4, 3, 21, 2])
+
 def spawn_particles(x, y, z, count, color):
-    for _ in range(count):
-        particles.append(Particle(x, y, z, color))
+    count = quality.particles(count)
+    if gpu_particles: gpu_particles.emit(x, y, z, count, color, rng.particles.randint(0, 2147483647)); return
+    r = rng.particles.random((count, 5)) * PARTICLE_SPAN
+    r[:, 3] = np.floor(r[:, 3]) # Life is randint(20, 40)
+    r += PARTICLE_LOW
+    for vx, vy, vz, life, size in r.tolist():
+        particles.append(Particle(x, y, z, color, vx, vy, vz, int(life), size))
 
 def load_high_score():
     try:
@@ -587,14 +686,121 @@ def restart_game():
     global game_over, defeated_count, level_up_pending, bullet_hell_charges, bullet_hell_cooldown
     global portal, current_boss, game_won
     
-    player.health, player.pos, player.level, player.xp = player.max_health, [0,0,0], 1, 0
+    if horde: horde.clear()
+    work.cancel("wave")
+    player.health, player.level, player.xp = player.max_health, 1, 0
     player.current_spell, player.boss_active, player.bosses_defeated = "fireball", False, {}
     enemies, projectiles, slime_trails, fire_trails, xp_orbs, particles = [], [], [], [], [], []
     game_over, defeated_count, level_up_pending, game_won = False, 0, False, False
-    bullet_hell_charges, bullet_hell_cooldown, world.zone = 0, 0, "overworld"
-    portal = Portal(0, 400)
+    bullet_hell_charges, bullet_hell_cooldown = 0, 0
+    portal = Portal(0, 400); portal.state = "transition"
     current_boss = None
-    spawn_obstacles(20)
+    spawn_obstacles(20, respawn=True, zone="overworld")
+
+# --- SNAPSHOTS ---
+def capture_snapshot():
+    # Full simulation state as compact binary (wizardbonk/snapshot.py); GPU particles are not included
+    work.flush() # Queued waves and arenas land first so the snapshot is complete
+    st = snapshot.empty("state", 1); s = st[0]
+    s['frame'], s['defeated_count'], s['difficulty_multiplier'] = frame, defeated_count, difficulty_multiplier
+    s['game_over'], s['game_won'], s['paused'], s['level_up_pending'] = game_over, game_won, paused, level_up_pending
+    s['spell_choices'] = [snapshot.SPELLS.index(c) for c in spell_choices] + [-1] * (3 - len(spell_choices))
+    s['bullet_hell_charges'], s['bullet_hell_cooldown'] = bullet_hell_charges, bullet_hell_cooldown
+    s['current_boss'] = next((i for i, e in enumerate(enemies) if e is current_boss), -1)
+    p = player
+    s['pos'], s['knockback'], s['facing_angle'], s['speed'] = p.pos, p.vel_knockback, p.facing_angle, p.speed
+    s['max_health'], s['health'], s['xp'], s['level'] = p.max_health, p.health, p.xp, p.level
+    s['boss_active'], s['attack_cooldown'], s['attack_speed'] = p.boss_active, p.attack_cooldown, p.attack_speed
+    s['bosses_defeated'] = sum(1 << i for i, b in enumerate(snapshot.BOSSES) if p.bosses_defeated.get(b))
+    s['current_spell'], s['orbit_angle'], s['rocks'] = snapshot.SPELLS.index(p.current_spell), p.orbit_angle, len(p.rocks)
+    s['camera_angle'], s['camera_distance'] = (camera.angle_x, camera.angle_y), camera.distance
+    s['camera_mode'] = snapshot.CAMERA_MODES.index(camera.mode)
+    s['portal'] = snapshot.PORTAL_STATES.index(portal.state) if portal else -1
+    if portal: s['portal_pos'] = portal.pos
+    t = world.terrain
+    s['zone'], s['terrain_zone'] = snapshot.ZONES.index(world.zone), snapshot.ZONES.index(t.zone)
+    s['terrain_seed'], s['terrain_density'], s['rng_seed'] = t.seed, t.density, rng.seed
+    sections = {
+        "state": st,
+        "enemies": np.array([(snapshot.ENEMY_TYPES.index(e.e_type), e.active, e.pos, e.speed, e.health, e.facing,
+                              getattr(e, 'cooldown', 0), getattr(e, 'fuse', 0), getattr(e, 'exploding', False), getattr(e, 'exploded', False),
+                              snapshot.GOLEM_STATES.index(getattr(e, 'state', "chase")), getattr(e, 'dash_timer', 0)) for e in enemies], snapshot.ENEMY),
+        "projectiles": np.array([(snapshot.PROJECTILE_TYPES.index(pr.p_type), snapshot.OWNERS.index(pr.owner), pr.active, pr.pos, pr.dir)
+                                 for pr in projectiles], snapshot.PROJECTILE),
+        "slime_trails": np.array([(tr['pos'], tr['timer']) for tr in slime_trails], snapshot.SLIME_TRAIL),
+        "fire_trails": np.array([(tr['pos'], tr['timer'], tr['damage']) for tr in fire_trails], snapshot.FIRE_TRAIL),
+        "xp_orbs": np.array([(o['pos'], o['value'], o['angle']) for o in xp_orbs], snapshot.ORB),
+        "particles": np.array([(pa.pos, pa.vel, pa.color, pa.life, pa.size) for pa in particles], snapshot.PARTICLE),
+        "rng": np.array([(name.encode(), state) for name, state in rng.states().items()], snapshot.RNG),
+    }
+    if horde: sections["horde"] = horde.export(); s['horde_ticks'] = horde.ticks
+    return snapshot.pack(sections)
+
+ENEMY_CLASSES = {"zombie": Zombie, "skeleton": Skeleton, "creeper": Creeper, "boss_slime": GiantSlime, "boss_golem": GiantIronGolem}
+
+def restore_snapshot(data):
+    global frame, defeated_count, difficulty_multiplier, game_over, game_won, paused, level_up_pending, spell_choices
+    global bullet_hell_charges, bullet_hell_cooldown, current_boss, portal
+    global enemies, projectiles, slime_trails, fire_trails, xp_orbs, particles
+    sec = snapshot.unpack(data); s = sec['state'][0]
+    work.cancel()
+    frame, defeated_count, difficulty_multiplier = int(s['frame']), int(s['defeated_count']), float(s['difficulty_multiplier'])
+    game_over, game_won, paused, level_up_pending = bool(s['game_over']), bool(s['game_won']), bool(s['paused']), bool(s['level_up_pending'])
+    spell_choices = [snapshot.SPELLS[c] for c in s['spell_choices'].tolist() if c >= 0]
+    bullet_hell_charges, bullet_hell_cooldown = int(s['bullet_hell_charges']), int(s['bullet_hell_cooldown'])
+    p = player
+    p.pos, p.vel_knockback, p.facing_angle, p.speed = s['pos'].tolist(), s['knockback'].tolist(), float(s['facing_angle']), float(s['speed'])
+    p.max_health, p.health, p.xp, p.level = float(s['max_health']), float(s['health']), int(s['xp']), int(s['level'])
+    p.boss_active, p.attack_cooldown, p.attack_speed = bool(s['boss_active']), int(s['attack_cooldown']), int(s['attack_speed'])
+    p.bosses_defeated = {b: True for i, b in enumerate(snapshot.BOSSES) if s['bosses_defeated'] >> i & 1}
+    p.current_spell, p.orbit_angle, p.rocks = snapshot.SPELLS[s['current_spell']], float(s['orbit_angle']), [True] * int(s['rocks'])
+    (camera.angle_x, camera.angle_y), camera.distance = s['camera_angle'].tolist(), float(s['camera_distance'])
+    camera.mode = snapshot.CAMERA_MODES[s['camera_mode']]; camera.update(p.pos)
+    portal = None
+    if s['portal'] >= 0: portal = Portal(*s['portal_pos'].tolist()[:2]); portal.state = snapshot.PORTAL_STATES[s['portal']]
+    rng.restore(int(s['rng_seed']), {n.decode(): st for n, st in sec['rng'].tolist()})
+    world.zone = snapshot.ZONES[s['zone']]
+    t, seed, tzone, density = world.terrain, int(s['terrain_seed']), snapshot.ZONES[s['terrain_zone']], float(s['terrain_density'])
+    if (t.seed, t.zone, t.density) != (seed, tzone, density) or t.make_obstacle is None: # Same arena keeps its cached chunks
+        t.density = density; t.reset(seed, tzone, Obstacle)
+    update_terrain()
+
+    e = sec['enemies']; enemies = []
+    for kind, active, pos, speed, health, facing, cooldown, fuse, exploding, exploded, state, dash_timer in zip(
+            e['type'].tolist(), e['active'].tolist(), e['pos'].tolist(), e['speed'].tolist(), e['health'].tolist(), e['facing'].tolist(),
+            e['cooldown'].tolist(), e['fuse'].tolist(), e['exploding'].tolist(), e['exploded'].tolist(), e['state'].tolist(), e['dash_timer'].tolist()):
+        en = ENEMY_CLASSES[snapshot.ENEMY_TYPES[kind]](pos[0], pos[1])
+        en.pos, en.active, en.speed, en.health, en.facing = pos, active, speed, health, facing
+        if en.e_type == "skeleton": en.cooldown = cooldown
+        elif en.e_type == "creeper": en.fuse, en.exploding, en.exploded = fuse, exploding, exploded
+        elif en.e_type == "boss_golem": en.cooldown, en.state, en.dash_timer = cooldown, snapshot.GOLEM_STATES[state], dash_timer
+        enemies.append(en)
+    current_boss = enemies[s['current_boss']] if s['current_boss'] >= 0 else None
+    pr = sec['projectiles']; projectiles = []
+    for kind, owner, active, pos, d in zip(pr['type'].tolist(), pr['owner'].tolist(), pr['active'].tolist(), pr['pos'].tolist(), pr['dir'].tolist()):
+        proj = Projectile(*pos, *d, snapshot.PROJECTILE_TYPES[kind], snapshot.OWNERS[owner]); proj.active = active
+        projectiles.append(proj)
+    tr = sec['slime_trails']; slime_trails = [{'pos': pos, 'timer': timer} for pos, timer in zip(tr['pos'].tolist(), tr['timer'].tolist())]
+    tr = sec['fire_trails']
+    fire_trails = [{'pos': pos, 'timer': timer, 'damage': dmg} for pos, timer, dmg in zip(tr['pos'].tolist(), tr['timer'].tolist(), tr['damage'].tolist())]
+    o = sec['xp_orbs']; xp_orbs = [{'pos': pos, 'value': v, 'angle': a} for pos, v, a in zip(o['pos'].tolist(), o['value'].tolist(), o['angle'].tolist())]
+    pa = sec['particles']
+    particles = [Particle(*pos, tuple(color), *vel, life, size) for pos, vel, color, life, size in
+                 zip(pa['pos'].tolist(), pa['vel'].tolist(), pa['color'].tolist(), pa['life'].tolist(), pa['size'].tolist())]
+    if horde: horde.restore(sec.get('horde', snapshot.empty("horde", 0)), int(s['horde_ticks']))
+
+def save_snapshot():
+    global saved_snapshot
+    saved_snapshot = capture_snapshot()
+    with open(snapshot_path, "wb") as f: f.write(saved_snapshot)
+
+def load_snapshot():
+    global saved_snapshot
+    if saved_snapshot is None:
+        if not os.path.exists(snapshot_path): return False
+        with open(snapshot_path, "rb") as f: saved_snapshot = f.read()
+    restore_snapshot(saved_snapshot)
+    return True
 
 def draw_hud():
     glMatrixMode(GL_PROJECTION); glPushMatrix(); glLoadIdentity(); gluOrtho2D(0, 800, 0, 600); glMatrixMode(GL_MODELVIEW); glPushMatrix(); glLoadIdentity()
@@ -621,34 +827,52 @@ def draw_hud():
         glRasterPos3f(10, 570, 0)
         for c in f"HP: {int(player.health)} | LVL: {player.level} | XP: {player.xp}/{player.level*100}": glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(c))
         glRasterPos3f(10, 550, 0)
-        for c in f"Spell: {player.current_spell} | Kills: {defeated_count} | HI: {high_score}": glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(c))
+        for c in f"Spell: {player.current_spell} | Kills: {defeated_count} | HI: {high_score}" + (f" | Q: {quality.tier.name}" if quality.level else ""): glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(c))
         if player.boss_active and current_boss:
              glRasterPos3f(350, 550, 0)
              for c in f"BOSS: {int(current_boss.health)}": glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, ord(c))
     glPopMatrix(); glMatrixMode(GL_PROJECTION); glPopMatrix(); glMatrixMode(GL_MODELVIEW)
 
+def draw_hud_cached():
+    # Low tiers replay a display list of the last HUD render for hud_interval frames
+    global hud_list
+    if quality.tier.hud_interval == 1: draw_hud(); return
+    if hud_list is None: hud_list = glGenLists(1)
+    elif not quality.hud_due(): glCallList(hud_list); return
+    glNewList(hud_list, GL_COMPILE_AND_EXECUTE); draw_hud(); glEndList()
+
 def init():
     glClearColor(0.5, 0.7, 1.0, 1.0)
     glEnable(GL_DEPTH_TEST)
 
 def display():
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-    camera.apply(); world.draw()
-    if portal: portal.draw()
-    for o in obstacles: o.draw()
-    for t in slime_trails: draw_box(t['pos'][0], t['pos'][1], 1, 20, 20, 2, (0.0, 0.0, 0.8)) # Blue Trail
-    for ft in fire_trails: draw_box(ft['pos'][0], ft['pos'][1], 2, 16, 16, 6, (1, 0.5, 0))
-    for e in enemies: e.draw()
-    for p in projectiles: p.draw()
-    for part in particles: part.draw()
-    for o in xp_orbs: draw_box(o['pos'][0], o['pos'][1], o['pos'][2], 10, 10, 10, (0, 1, 1), o['angle'])
-    player.draw(); draw_hud(); glutSwapBuffers()
+    # GPU time per scope with WIZARDBONK_GPU_TIMERS=1, no-ops otherwise
+    with gpu_scope("floor"): camera.apply(); world.draw()
+    with gpu_scope("entities"):
+        if portal: portal.draw()
+        for o in obstacles: o.draw()
+        for t in slime_trails: draw_box(t['pos'][0], t['pos'][1], 1, 20, 20, 2, (0.0, 0.0, 0.8)) # Blue Trail
+        for ft in fire_trails: draw_box(ft['pos'][0], ft['pos'][1], 2, 16, 16, 6, (1, 0.5, 0))
+        for e in enemies: draw_enemy(e)
+        if horde: draw_horde()
+        for p in projectiles: p.draw()
+    with gpu_scope("particles"):
+        for part in particles:
+            if not is_far(part.pos): part.draw()
+        if gpu_particles: gpu_particles.draw()
+    with gpu_scope("entities"): # Same scope again, its times add up
+        for o in xp_orbs: draw_box(o['pos'][0], o['pos'][1], o['pos'][2], 10, 10, 10, (0, 1, 1), o['angle'])
+        player.draw()
+    with gpu_scope("hud"): draw_hud_cached()
+    quality.frame_end(); gpu_timer.frame_end(); glutSwapBuffers()
 
 def idle():
     global frame, game_over, level_up_pending, bullet_hell_charges, bullet_hell_cooldown
     global enemies, projectiles, slime_trails, fire_trails, xp_orbs, defeated_count, spell_choices
     global paused, portal, current_boss, game_won, particles, high_score, difficulty_multiplier
     
+    quality.frame_start()
     if paused: return
     frame += 1
     if game_won:
@@ -656,8 +880,9 @@ def idle():
         if b'c' in keys and keys[b'c']:
              game_won = False
              difficulty_multiplier += 0.5
-             portal = Portal(0, 400); player.pos = [0,0,0]; enemies.clear(); spawn_obstacles(20)
-             if world.zone != "overworld": world.zone = "overworld" # Loop back
+             portal = Portal(0, 400); portal.state = "transition"; enemies.clear(); work.cancel("wave")
+             if horde: horde.clear()
+             spawn_obstacles(20, respawn=True, zone="overworld") # Loop back
              player.bosses_defeated = {}; player.boss_active = False; current_boss = None
         glutPostRedisplay(); return
     if game_over:
@@ -667,8 +892,9 @@ def idle():
         if b'r' in keys and keys[b'r']: restart_game()
         glutPostRedisplay(); return
     if level_up_pending: glutPostRedisplay(); return
+    work.run()
 
-    player.update(keys, camera.angle_x); player.update_cooldown(); camera.update(player.pos)
+    player.update(keys, camera.angle_x); player.update_cooldown(); camera.update(player.pos); update_terrain()
     if portal:
         if portal.update(player): pass
     if player.current_spell == "fire_step":
@@ -681,6 +907,9 @@ def idle():
         if d < min_d: min_d = d; nearest = e
     
     target_pos = nearest.pos if nearest and min_d < 600 else None
+    if horde:
+        i, d = horde.nearest(player.pos)
+        if d < min_d and d < 600: target_pos = [horde.pos[i, 0], horde.pos[i, 1], 0]
     if target_pos:
         if player.current_spell == "bullet_hell":
              if bullet_hell_cooldown <= 0 and player.attack_cooldown <= 0: bullet_hell_charges = 3; bullet_hell_cooldown = 90
@@ -713,6 +942,8 @@ def idle():
                  mag = math.sqrt(dx*dx + dy*dy)
                  if mag > 0: player.apply_knockback(dx/mag * 20, dy/mag * 20)
              else: player.take_damage(0.5 * difficulty_multiplier)
+    separate_crowd()
+    if horde: update_horde()
 
     if player.current_spell == "rock_armour":
         for i in range(len(player.rocks) -1, -1, -1):
@@ -722,6 +953,9 @@ def idle():
             r_box = (rx-10, rx+10, ry-10, ry+10, player.pos[2]+20, player.pos[2]+40)
             for e in enemies:
                 if check_aabb_collision(r_box, e.get_aabb()): e.take_damage(25); player.rocks.pop(i); spawn_particles(e.pos[0], e.pos[1], e.pos[2], 5, (0.5, 0.5, 0.5)); break
+            else:
+                j = horde.first_hit(r_box) if horde else -1
+                if j >= 0: horde.damage(j, 25); player.rocks.pop(i); spawn_particles(horde.pos[j, 0], horde.pos[j, 1], 0, 5, (0.5, 0.5, 0.5))
 
     for p in projectiles:
         p.update()
@@ -745,6 +979,13 @@ def idle():
                             if player.bosses_defeated.get('slime') and player.bosses_defeated.get('golem'):
                                 game_won = True
                     break
+            else:
+                j = horde.first_hit(p_box) if horde else -1
+                if j >= 0:
+                    p.active = False
+                    spawn_particles(p.pos[0], p.pos[1], p.pos[2], 5, p.color)
+                    if player.current_spell == "lifesteal": player.health += 1
+                    if horde.damage(j, p.damage): horde_defeated(j)
             for o in obstacles:
                  if check_aabb_collision(p.get_aabb(), o.get_aabb()): p.active = False; spawn_particles(p.pos[0], p.pos[1], p.pos[2], 3, (0.5, 0.5, 0.5))
         elif p.owner == "enemy":
@@ -759,6 +1000,7 @@ def idle():
     for part in particles: 
         part.update()
     particles = [p for p in particles if p.life > 0]
+    if gpu_particles: gpu_particles.update()
     
     player.speed = 5
     for t in slime_trails:
@@ -772,6 +1014,7 @@ def idle():
         for e in enemies:
              dx, dy = e.pos[0] - t['pos'][0], e.pos[1] - t['pos'][1]
              if math.sqrt(dx*dx + dy*dy) < 20: e.take_damage(0.5)
+        if horde: horde.damage_within(t['pos'], 20, 0.5)
     fire_trails = [t for t in fire_trails if t['timer'] > 0]
     
     for o in xp_orbs:
@@ -790,9 +1033,9 @@ def idle():
         pool = list(AVAILABLE_SPELLS)
         for _ in range(3):
             if not pool: break
-            idx = lcg_randint(0, len(pool)-1); spell_choices.append(pool.pop(idx))
+            idx = rng.spells.randint(0, len(pool)-1); spell_choices.append(pool.pop(idx))
 
-    if not player.boss_active and len(enemies) == 0 and (not portal or portal.state != "open"): 
+    if not player.boss_active and len(enemies) == 0 and not (horde and horde.alive()) and not work.pending() and (not portal or portal.state != "open"): 
         count = 5 + player.level
         if world.zone != "overworld": count *= 2 # Double enemies in Nether
         spawn_wave(count)
@@ -802,6 +1045,8 @@ def idle():
 def keyboard_down(key, x, y):
     global level_up_pending, spell_choices, paused
     if key == b'p': paused = not paused
+    if key == b'k': save_snapshot()
+    if key == b'l': load_snapshot()
     if key == b'c' and game_won: pass # handled in idle
     if key == b'v': 
         if camera.mode == "third": 
@@ -825,13 +1070,43 @@ def mouse(button, state, x, y): camera.mouse_listener(button, state, x, y)
 def motion(x, y): camera.mouse_motion(x, y)
 
 def main():
+    global horde, gpu_particles
+    workers = int(os.environ.get('WIZARDBONK_HORDE_WORKERS', '0'))
+    if workers > 0: # Fork the workers before GLUT opens a display connection
+        import atexit
+        from wizardbonk.horde import SharedHorde
+        horde = SharedHorde(workers); atexit.register(horde.close)
     glutInit()
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH) 
     glutInitWindowSize(800, 600)
     glutCreateWindow(b"Wizard Bonk 3D")
     init()
-    spawn_obstacles(20)
-    glutDisplayFunc(display); glutIdleFunc(idle)
+    if os.environ.get('WIZARDBONK_PARTICLES') == 'gpu':
+        from wizardbonk import gpu_particles as gpu
+        if gpu.supported(): gpu_particles = gpu.GPUParticles()
+        else: print("GPU particles need OpenGL 3.0, using CPU particles")
+    spawn_obstacles(20); work.flush() # Nothing to show yet, so build the first arena straight away
+    tier = os.environ.get('WIZARDBONK_QUALITY', 'auto')
+    if tier != 'auto' and tier not in TIER_NAMES:
+        print("Unknown WIZARDBONK_QUALITY %r (tiers: auto, %s), using auto" % (tier, ", ".join(TIER_NAMES))); tier = 'auto'
+    if tier != 'auto': quality.level, quality.adaptive = TIER_NAMES.index(tier), False
+    if os.environ.get('WIZARDBONK_SNAPSHOT'): load_snapshot() # Warm start from the saved moment
+    if os.environ.get('WIZARDBONK_GPU_TIMERS'): # Per-scope GPU times, printed on exit
+        import atexit
+        atexit.register(lambda timer: print(timer.report()), gpu_timer.enable())
+    on_display, on_idle = display, idle
+    profile = os.environ.get('WIZARDBONK_ALLOC_PROFILE')
+    if profile: # Per-frame allocation and GC pause report, printed (or written to the named file) on exit
+        import atexit
+        from wizardbonk.instrument import FrameInstrument
+        instrument = FrameInstrument().start()
+        on_idle, on_display = instrument.wrap('idle', idle), instrument.wrap('display', display, end_frame=True)
+        def write_report():
+            if profile == '1': print(instrument.report())
+            else:
+                with open(profile, 'w') as f: f.write(instrument.report() + '\n')
+        atexit.register(write_report)
+    glutDisplayFunc(on_display); glutIdleFunc(on_idle)
     glutKeyboardFunc(keyboard_down); glutKeyboardUpFunc(keyboard_up)
     glutMouseFunc(mouse); glutMotionFunc(motion)
     glutMainLoop()
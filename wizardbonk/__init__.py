@@ -0,0 +1 @@
+"""Simulation support modules for Wizard Bonk 3D (Wizerdbonk-3D.py)"""
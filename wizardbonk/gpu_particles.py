@@ -0,0 +1,251 @@
+"""GPU-simulated particles using transform feedback
+
+Particle state lives in two ``arrays.vbo.VBO`` buffers used ping-pong: each
+tick a vertex shader reads every particle from one buffer and writes its
+next state into the other through ``GL_TRANSFORM_FEEDBACK_BUFFER`` with
+rasterisation discarded.  Spawning, gravity and lifetime all happen in that
+shader; the CPU only hands over compact burst requests (origin, colour,
+first slot, count, seed), which claim slots from a ring so the oldest
+particles are recycled first.  A second, tiny program draws the current
+buffer as point sprites.
+
+Needs OpenGL 3.0 / GLSL 1.30 in a compatibility context (the game's
+fixed-function matrices feed the draw shader); Mesa llvmpipe is enough.
+"""
+import ctypes
+
+import numpy as np
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER, GL_DYNAMIC_COPY, GL_FALSE, GL_FLOAT, GL_FRAGMENT_SHADER,
+    GL_INTERLEAVED_ATTRIBS, GL_LINK_STATUS, GL_POINTS, GL_PROGRAM_POINT_SIZE,
+    GL_RASTERIZER_DISCARD, GL_TRANSFORM_FEEDBACK_BUFFER, GL_VERTEX_SHADER, GL_VIEWPORT,
+    glAttachShader, glBeginTransformFeedback, glBindAttribLocation, glBindBufferBase,
+    glCreateProgram, glDeleteProgram, glDisable, glDisableVertexAttribArray, glDrawArrays,
+    glEnable, glEnableVertexAttribArray, glEndTransformFeedback, glGetIntegerv,
+    glGetProgramInfoLog, glGetProgramiv, glGetString, glGetUniformLocation, glLinkProgram,
+    glTransformFeedbackVaryings, glUniform1f, glUniform1i, glUniform1uiv, glUniform2iv,
+    glUniform3fv, glUseProgram, glVertexAttribPointer, GL_VERSION,
+)
+from OpenGL.GL.shaders import ShaderLinkError, compileShader
+from OpenGL.arrays import vbo
+
+FLOATS = 11  # pos.xyz + life, vel.xyz + size, color.rgb
+STRIDE = FLOATS * 4
+MAX_BURSTS = 32  # Spawn requests consumed per update pass
+GRAVITY = 0.2
+
+UPDATE_SHADER = """#version 130
+#define MAX_BURSTS %(max_bursts)d
+in vec4 pos_life;
+in vec4 vel_size;
+in vec3 color;
+out vec4 out_pos_life;
+out vec4 out_vel_size;
+out vec3 out_color;
+
+uniform int burst_count;
+uniform vec3 burst_origin[MAX_BURSTS];
+uniform vec3 burst_color[MAX_BURSTS];
+uniform ivec2 burst_range[MAX_BURSTS];  // first slot, count
+uniform uint burst_seed[MAX_BURSTS];
+uniform float gravity;
+
+uint hash(uint x) {
+    x ^= x >> 16u; x *= 0x7feb352du;
+    x ^= x >> 15u; x *= 0x846ca68bu;
+    x ^= x >> 16u;
+    return x;
+}
+float rand(inout uint state) {
+    state = hash(state);
+    return float(state >> 8u) / 16777216.0;
+}
+
+void main() {
+    gl_Position = vec4(0.0);  // Rasterisation is discarded, but GLSL 1.30 wants it written
+    uint slot = uint(gl_VertexID);
+    for (int i = 0; i < burst_count; ++i) {
+        if (slot - uint(burst_range[i].x) < uint(burst_range[i].y)) {
+            // Same distributions as the CPU Particle class
+            uint state = burst_seed[i] ^ (slot * 0x9e3779b9u);
+            vec3 vel = vec3(-2.0 + 4.0 * rand(state), -2.0 + 4.0 * rand(state), 2.0 + 3.0 * rand(state));
+            out_pos_life = vec4(burst_origin[i], floor(20.0 + 21.0 * rand(state)));
+            out_vel_size = vec4(vel, 1.0 + 2.0 * rand(state));
+            out_color = burst_color[i];
+            return;
+        }
+    }
+    if (pos_life.w > 0.0) {
+        out_pos_life = vec4(pos_life.xyz + vel_size.xyz, pos_life.w - 1.0);
+        out_vel_size = vec4(vel_size.xy, vel_size.z - gravity, vel_size.w);
+    } else {
+        out_pos_life = pos_life;
+        out_vel_size = vel_size;
+    }
+    out_color = color;
+}
+"""
+
+DRAW_VERTEX_SHADER = """#version 130
+in vec4 pos_life;
+in vec4 vel_size;
+in vec3 color;
+out vec3 frag_color;
+uniform float point_scale;
+void main() {
+    if (pos_life.w <= 0.0) {
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);  // Dead: outside the clip volume
+        gl_PointSize = 0.0;
+    } else {
+        gl_Position = gl_ModelViewProjectionMatrix * vec4(pos_life.xyz, 1.0);
+        gl_PointSize = max(1.0, vel_size.w * point_scale / gl_Position.w);
+    }
+    frag_color = color;
+}
+"""
+
+DRAW_FRAGMENT_SHADER = """#version 130
+in vec3 frag_color;
+out vec4 out_color;
+void main() {
+    out_color = vec4(frag_color, 1.0);
+}
+"""
+
+ATTRIBUTES = (("pos_life", 4, 0), ("vel_size", 4, 16), ("color", 3, 32))
+
+def supported():
+    """True when the current context can run transform feedback particles"""
+    version = glGetString(GL_VERSION) or b"0"
+    major = int(version.split(b".")[0])
+    return major >= 3
+
+def _link(shaders, varyings=None):
+    program = glCreateProgram()
+    for shader in shaders:
+        glAttachShader(program, shader)
+    for location, (name, _, _) in enumerate(ATTRIBUTES):
+        glBindAttribLocation(program, location, name)
+    if varyings:
+        # The wrapper wants a char** rather than a sequence of names
+        names = (ctypes.c_char_p * len(varyings))(*varyings)
+        glTransformFeedbackVaryings(
+            program, len(varyings), ctypes.cast(names, ctypes.POINTER(ctypes.POINTER(ctypes.c_char))),
+            GL_INTERLEAVED_ATTRIBS,
+        )
+    glLinkProgram(program)
+    if glGetProgramiv(program, GL_LINK_STATUS) == GL_FALSE:
+        log = glGetProgramInfoLog(program)
+        glDeleteProgram(program)
+        raise ShaderLinkError(log)
+    return program
+
+class GPUParticles:
+    """Up to ``capacity`` particles simulated and drawn on the GPU
+
+    Create with a current GL context.  ``emit`` only queues a burst; the
+    next ``update`` spawns it.
+    """
+    def __init__(self, capacity=1 << 18):
+        self.capacity = capacity
+        self.cursor = 0  # Next ring slot to hand out
+        self.used = 0  # High-water mark; slots past it are still empty
+        self.pending = []
+        self.update_program = _link(
+            [compileShader(UPDATE_SHADER % {"max_bursts": MAX_BURSTS}, GL_VERTEX_SHADER)],
+            varyings=[b"out_pos_life", b"out_vel_size", b"out_color"],
+        )
+        self.draw_program = _link([
+            compileShader(DRAW_VERTEX_SHADER, GL_VERTEX_SHADER),
+            compileShader(DRAW_FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
+        ])
+        self.uniforms = {
+            name: glGetUniformLocation(self.update_program, name)
+            for name in ("burst_count", "burst_origin", "burst_color", "burst_range", "burst_seed", "gravity")
+        }
+        self.point_scale = glGetUniformLocation(self.draw_program, "point_scale")
+        empty = np.zeros((capacity, FLOATS), np.float32)
+        self.buffers = [vbo.VBO(empty, usage=GL_DYNAMIC_COPY, target=GL_ARRAY_BUFFER) for _ in range(2)]
+        for buffer in self.buffers:
+            buffer.bind(); buffer.unbind()
+            buffer.data = None  # Uploaded; the GPU copy is the only one now
+        self.current = 0
+
+    def emit(self, x, y, z, count, color, seed):
+        """Queue a burst of ``count`` particles at (x, y, z); ``seed`` varies the spray"""
+        count = min(int(count), self.capacity)
+        while count > 0:
+            first = self.cursor
+            n = min(count, self.capacity - first)
+            self.pending.append((x, y, z, color, first, n, seed & 0xFFFFFFFF))
+            self.cursor = (first + n) % self.capacity
+            self.used = max(self.used, first + n)
+            count -= n
+
+    def _bind_attributes(self, buffer):
+        buffer.bind()
+        for location, (_, size, offset) in enumerate(ATTRIBUTES):
+            glEnableVertexAttribArray(location)
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, STRIDE, buffer + offset)
+
+    def _unbind_attributes(self, buffer):
+        for location in range(len(ATTRIBUTES)):
+            glDisableVertexAttribArray(location)
+        buffer.unbind()
+
+    def update(self):
+        """Advance every particle one tick, spawning up to MAX_BURSTS queued bursts"""
+        if not self.used:
+            return
+        bursts, self.pending = self.pending[:MAX_BURSTS], self.pending[MAX_BURSTS:]
+        source, target = self.buffers[self.current], self.buffers[1 - self.current]
+        glUseProgram(self.update_program)
+        u = self.uniforms
+        glUniform1i(u["burst_count"], len(bursts))
+        glUniform1f(u["gravity"], GRAVITY)
+        if bursts:
+            glUniform3fv(u["burst_origin"], len(bursts), np.array([b[0:3] for b in bursts], np.float32))
+            glUniform3fv(u["burst_color"], len(bursts), np.array([b[3] for b in bursts], np.float32))
+            glUniform2iv(u["burst_range"], len(bursts), np.array([b[4:6] for b in bursts], np.int32))
+            glUniform1uiv(u["burst_seed"], len(bursts), np.array([b[6] for b in bursts], np.uint32))
+        self._bind_attributes(source)
+        glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, int(target))
+        glEnable(GL_RASTERIZER_DISCARD)
+        glBeginTransformFeedback(GL_POINTS)
+        glDrawArrays(GL_POINTS, 0, self.used)
+        glEndTransformFeedback()
+        glDisable(GL_RASTERIZER_DISCARD)
+        glBindBufferBase(GL_TRANSFORM_FEEDBACK_BUFFER, 0, 0)
+        self._unbind_attributes(source)
+        glUseProgram(0)
+        self.current = 1 - self.current
+
+    def draw(self):
+        if not self.used:
+            return
+        viewport = glGetIntegerv(GL_VIEWPORT)
+        glUseProgram(self.draw_program)
+        # Pixels per world unit at distance 1 for the 60 degree fov used by Camera
+        glUniform1f(self.point_scale, viewport[3] / (2.0 * np.tan(np.radians(30.0))))
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        buffer = self.buffers[self.current]
+        self._bind_attributes(buffer)
+        glDrawArrays(GL_POINTS, 0, self.used)
+        self._unbind_attributes(buffer)
+        glDisable(GL_PROGRAM_POINT_SIZE)
+        glUseProgram(0)
+
+    def read(self):
+        """Copy the current particle state back as a (used, FLOATS) array (slow, for tests)"""
+        from OpenGL.GL import glGetBufferSubData
+        buffer = self.buffers[self.current]
+        buffer.bind()
+        data = glGetBufferSubData(GL_ARRAY_BUFFER, 0, self.used * STRIDE)
+        buffer.unbind()
+        return np.frombuffer(data, np.float32).reshape(-1, FLOATS).copy()
+
+    def release(self):
+        for buffer in self.buffers:
+            buffer.delete()
+        glDeleteProgram(self.update_program)
+        glDeleteProgram(self.draw_program)
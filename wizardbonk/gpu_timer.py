@@ -0,0 +1,123 @@
+"""GPU time per named scope from ARB_timer_query timestamps
+
+``with gpu_scope("entities"):`` brackets the draw calls inside with two
+``glQueryCounter(GL_TIMESTAMP)`` queries, so scopes may nest and repeat
+within a frame (repeats are summed).  ``frame_end()`` hands the frame's
+queries over to a pending queue and reads back whichever earlier frames
+the GPU has finished, checking ``GL_QUERY_RESULT_AVAILABLE`` first so it
+never waits on the pipeline; results usually arrive a frame or two late.
+Query objects come from a free pool and return to it once read.  Should
+the GPU fall ``max_pending`` frames behind, new scopes are skipped rather
+than growing the pool.
+
+``averages()`` gives each scope's mean GPU milliseconds per frame over the
+last ``window`` frames.  Without the extension (or before ``enable()``)
+every scope is a shared no-op context manager.
+"""
+import collections
+import ctypes
+from OpenGL.GL import GL_QUERY_RESULT, GL_QUERY_RESULT_AVAILABLE, glGenQueries, glGetQueryObjectiv
+from OpenGL.GL.ARB.timer_query import GL_TIMESTAMP, glInitTimerQueryARB, glQueryCounter
+from OpenGL.raw.GL.ARB.timer_query import glGetQueryObjectui64v
+
+POOL_STEP = 32  # Query objects generated at a time when the pool runs dry
+
+def supported():
+    """True when the current context has timestamp queries"""
+    return bool(glInitTimerQueryARB() and glQueryCounter)
+
+class _NullScope:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NULL_SCOPE = _NullScope()
+
+class _Scope:
+    __slots__ = ("timer", "name", "begin")
+    def __init__(self, timer, name):
+        self.timer, self.name = timer, name
+
+    def __enter__(self):
+        self.begin = self.timer._stamp()
+        return self
+
+    def __exit__(self, *exc):
+        timer = self.timer
+        timer.current.append((self.name, self.begin, timer._stamp()))
+        return False
+
+class GPUTimer:
+    def __init__(self, window=120, max_pending=6):
+        self.enabled = supported()
+        self.max_pending = max_pending
+        self.free = []
+        self.current = []  # (name, begin query, end query) for the frame being drawn
+        self.pending = collections.deque()  # earlier frames awaiting results
+        self.samples = collections.defaultdict(lambda: collections.deque(maxlen=window))  # name -> [ms]
+        self.skipped = 0  # frames not timed because the GPU was too far behind
+        self.skipping = False
+        self.result = (ctypes.c_uint64 * 1)()  # Raw call: the wrapper has no size or array type for GL_QUERY_RESULT
+
+    def scope(self, name):
+        if not self.enabled: return NULL_SCOPE
+        if len(self.pending) >= self.max_pending:
+            self.skipping = True
+            return NULL_SCOPE
+        return _Scope(self, name)
+
+    def _stamp(self):
+        if not self.free:
+            ids = glGenQueries(POOL_STEP)
+            self.free.extend(int(query) for query in ids)
+        query = self.free.pop()
+        glQueryCounter(query, GL_TIMESTAMP)
+        return query
+
+    def frame_end(self):
+        if self.skipping: self.skipped += 1; self.skipping = False
+        if self.current:
+            self.pending.append(self.current)
+            self.current = []
+        while self.pending:
+            frame = self.pending[0]
+            # Timestamps complete in order, so the frame's last one being ready covers the rest
+            if not glGetQueryObjectiv(frame[-1][2], GL_QUERY_RESULT_AVAILABLE): break
+            self.pending.popleft()
+            totals = {}
+            for name, begin, end in frame:
+                totals[name] = totals.get(name, 0) + self._read(end) - self._read(begin)
+                self.free.append(begin); self.free.append(end)
+            for name, ns in totals.items():
+                self.samples[name].append(ns / 1e6)
+
+    def _read(self, query):
+        glGetQueryObjectui64v(query, GL_QUERY_RESULT, self.result)
+        return self.result[0]
+
+    def averages(self):
+        return {name: sum(ms) / len(ms) for name, ms in self.samples.items() if ms}
+
+    def report(self):
+        if not self.enabled: return "GPU timers: GL_ARB_timer_query not available"
+        averages = self.averages()
+        if not averages: return "GPU timers: no frames read back yet"
+        lines = ["GPU ms per frame, mean of the last %d frames:" % max(len(ms) for ms in self.samples.values())]
+        for name, ms in sorted(averages.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<12} {ms:8.3f}")
+        if self.skipped: lines.append(f"  {self.skipped} frames untimed, the GPU was {self.max_pending} frames behind")
+        return "\n".join(lines)
+
+timer = None
+
+def enable(**options):
+    """Start timing scopes on the current context, returns the GPUTimer"""
+    global timer
+    timer = GPUTimer(**options)
+    return timer
+
+def gpu_scope(name):
+    return timer.scope(name) if timer is not None else NULL_SCOPE
+
+def frame_end():
+    if timer is not None: timer.frame_end()
@@ -0,0 +1,166 @@
+"""Per-frame allocation and GC pause instrumentation
+
+``FrameInstrument`` wraps the per-frame callbacks (``idle`` and ``display``
+in the game) as named phases.  For every frame it records each phase's
+wall time, net allocated blocks (``sys.getallocatedblocks``) and traced
+bytes, including the transient peak, plus every garbage-collector pause
+reported through ``gc.callbacks`` with its generation.  Every
+``snapshot_every`` frames it also diffs ``tracemalloc`` snapshots taken
+around each phase to find the source lines doing the allocating.  Frames
+over ``budget_ms`` are flagged, and ``report()`` sums it all up.
+
+Snapshot time is measured and left out of the frame times, so sampled
+frames are not flagged just for being sampled.
+"""
+import collections
+import contextlib
+import gc
+import sys
+import time
+import tracemalloc
+
+PhaseRecord = collections.namedtuple("PhaseRecord", "ms blocks bytes peak_bytes")
+
+class FrameRecord:
+    __slots__ = ("index", "ms", "phases", "gc", "sampled")
+    def __init__(self, index):
+        self.index, self.ms, self.phases, self.gc, self.sampled = index, 0.0, {}, [], False
+
+    @property
+    def gc_ms(self):
+        return sum(ms for _, ms, _ in self.gc)
+
+class FrameInstrument:
+    def __init__(self, budget_ms=1000.0 / 60, snapshot_every=60, depth=1, history=3600):
+        self.budget_ms, self.snapshot_every, self.depth = budget_ms, snapshot_every, depth
+        self.frames = collections.deque(maxlen=history)
+        self.over_budget = collections.deque(maxlen=history)
+        self.gc_pauses = collections.defaultdict(list)  # generation -> [ms]
+        self.sites = collections.defaultdict(collections.Counter)  # phase -> {site: bytes}
+        self.site_blocks = collections.defaultdict(collections.Counter)
+        self.count = 0
+        self._frame = FrameRecord(0)
+        self._phase = None
+        self._gc_start = None
+        self._overhead = 0.0
+        self._frame_start = None
+        self._owns_tracing = False
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self._owns_tracing = True
+        gc.callbacks.append(self._on_gc)
+        self._frame_start = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def _on_gc(self, phase, info):
+        now = time.perf_counter()
+        if phase == "start":
+            self._gc_start = now
+        elif self._gc_start is not None:
+            ms = (now - self._gc_start) * 1000.0
+            self._frame.gc.append((info["generation"], ms, self._phase))
+            self.gc_pauses[info["generation"]].append(ms)
+            self._gc_start = None
+
+    def _snapshot(self):
+        t0 = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        self._overhead += time.perf_counter() - t0
+        return snapshot
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Measure the enclosed code as phase ``name`` of the current frame"""
+        sampled = self.snapshot_every and self.count % self.snapshot_every == 0
+        before = self._snapshot() if sampled else None
+        outer, self._phase = self._phase, name
+        tracemalloc.reset_peak()
+        traced, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            blocks = sys.getallocatedblocks() - blocks
+            current, peak = tracemalloc.get_traced_memory()
+            self._phase = outer
+            self._frame.phases[name] = PhaseRecord(ms, blocks, current - traced, peak - traced)
+            if sampled:
+                self._frame.sampled = True
+                for stat in self._snapshot().compare_to(before, "lineno"):
+                    if stat.size_diff > 0:
+                        site = str(stat.traceback[0])
+                        self.sites[name][site] += stat.size_diff
+                        self.site_blocks[name][site] += max(stat.count_diff, 0)
+
+    def wrap(self, name, func, end_frame=False):
+        """``func`` measured as phase ``name``; ``end_frame`` closes the frame after it"""
+        def wrapped(*args):
+            with self.phase(name):
+                result = func(*args)
+            if end_frame:
+                self.end_frame()
+            return result
+        wrapped.__name__ = getattr(func, "__name__", name)
+        return wrapped
+
+    def end_frame(self):
+        now = time.perf_counter()
+        frame = self._frame
+        frame.ms = (now - self._frame_start - self._overhead) * 1000.0
+        self.frames.append(frame)
+        if frame.ms > self.budget_ms:
+            self.over_budget.append(frame)
+        self.count += 1
+        self._frame = FrameRecord(self.count)
+        self._frame_start, self._overhead = now, 0.0
+
+    def report(self, top=10, worst=10):
+        frames = list(self.frames)
+        lines = ["Frames: %d recorded, %d over the %.1f ms budget" % (len(frames), len(self.over_budget), self.budget_ms)]
+        if frames:
+            ms = sorted(f.ms for f in frames)
+            lines.append("Frame time: median %.2f ms, p99 %.2f ms, max %.2f ms" % (
+                ms[len(ms) // 2], ms[min(len(ms) - 1, int(len(ms) * 0.99))], ms[-1]))
+            for name in sorted({n for f in frames for n in f.phases}):
+                records = [f.phases[name] for f in frames if name in f.phases]
+                lines.append("  %-10s mean %.2f ms, %+.1f blocks/frame, peak %.1f KiB/frame" % (
+                    name, sum(r.ms for r in records) / len(records),
+                    sum(r.blocks for r in records) / len(records),
+                    sum(r.peak_bytes for r in records) / len(records) / 1024.0))
+        lines.append("GC pauses:")
+        for generation in sorted(self.gc_pauses):
+            pauses = self.gc_pauses[generation]
+            lines.append("  gen%d: %d collections, total %.2f ms, max %.2f ms" % (
+                generation, len(pauses), sum(pauses), max(pauses)))
+        if self.over_budget:
+            lines.append("Worst frames over budget:")
+            for frame in sorted(self.over_budget, key=lambda f: -f.ms)[:worst]:
+                phases = ", ".join("%s %.1f ms" % (n, r.ms) for n, r in frame.phases.items())
+                gens = sorted({g for g, _, _ in frame.gc})
+                lines.append("  #%d %.1f ms (%s) gc %.1f ms%s" % (
+                    frame.index, frame.ms, phases, frame.gc_ms,
+                    " gen%s" % "/".join(map(str, gens)) if gens else ""))
+        if self.sites:
+            lines.append("Top allocation sites (every %d frames):" % self.snapshot_every)
+            for name, sites in sorted(self.sites.items()):
+                lines.append("  %s:" % name)
+                for site, size in sites.most_common(top):
+                    lines.append("    %-48s %9.1f KiB %7d blocks" % (site, size / 1024.0, self.site_blocks[name][site]))
+        return "\n".join(lines)
@@ -0,0 +1,91 @@
+"""Adaptive render quality driven by a frame-time budget
+
+``QualityGovernor`` keeps a rolling mean of the time each frame spends in
+the game's callbacks (``frame_start()`` when idle begins, ``frame_end()``
+just before the buffer swap, so vsync waits do not count).  When the mean
+goes over ``budget_ms`` it steps down one ``Tier``; when it falls below
+``headroom * budget_ms`` it steps back up.  After every change it waits for
+a fresh window of frames before judging again, so one spike does not make
+it oscillate.
+
+Each tier sets the particle emission rate, the distance past which
+enemies and particles get cheap stand-ins, segment counts for
+``draw_cylinder_approx``/``draw_cone_approx``, how many floor tiles are
+merged into one quad, and how many frames a HUD rendering is reused.
+"""
+import collections
+import time
+
+Tier = collections.namedtuple(
+    "Tier", "name particle_rate lod_distance cylinder_segments cone_segments floor_step hud_interval")
+
+TIERS = (
+    Tier("high", 1.0, 3000.0, 12, 8, 1, 1),
+    Tier("medium", 0.6, 1500.0, 8, 6, 2, 2),
+    Tier("low", 0.35, 1000.0, 6, 4, 5, 4),
+    Tier("minimal", 0.15, 700.0, 4, 3, 10, 8),
+)
+TIER_NAMES = tuple(tier.name for tier in TIERS)
+
+class QualityGovernor:
+    def __init__(self, budget_ms=1000.0 / 60, window=30, headroom=0.6, tiers=TIERS, level=0, adaptive=True):
+        self.budget_ms, self.window, self.headroom = budget_ms, window, headroom
+        self.tiers, self.level, self.adaptive = tiers, level, adaptive
+        self.times = collections.deque(maxlen=window)
+        self.changes = 0
+        self.frames = 0
+        self._start = None
+        self._hud_age = 0
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    @property
+    def mean_ms(self):
+        return sum(self.times) / len(self.times) if self.times else 0.0
+
+    def frame_start(self):
+        self._start = time.perf_counter()
+
+    def frame_end(self):
+        """Close the frame opened by ``frame_start``; returns True when the tier changed"""
+        if self._start is None:
+            return False
+        ms, self._start = (time.perf_counter() - self._start) * 1000.0, None
+        return self.record(ms)
+
+    def record(self, ms):
+        """Add one frame's work time; returns True when the tier changed"""
+        self.frames += 1
+        self.times.append(ms)
+        if not self.adaptive or len(self.times) < self.window:
+            return False
+        mean = self.mean_ms
+        if mean > self.budget_ms and self.level < len(self.tiers) - 1:
+            return self._set(self.level + 1)
+        if mean < self.budget_ms * self.headroom and self.level > 0:
+            return self._set(self.level - 1)
+        return False
+
+    def _set(self, level):
+        self.level = level
+        self.changes += 1
+        self.times.clear()  # Judge the new tier on its own frames
+        return True
+
+    def particles(self, count):
+        """How many of ``count`` requested particles to emit at this tier"""
+        return max(1, int(round(count * self.tier.particle_rate))) if count > 0 else 0
+
+    def hud_due(self):
+        """True once every ``hud_interval`` calls: time to render the HUD afresh"""
+        self._hud_age += 1
+        if self._hud_age < self.tier.hud_interval:
+            return False
+        self._hud_age = 0
+        return True
+
+    def telemetry(self):
+        return {"tier": self.tier.name, "level": self.level, "mean_ms": self.mean_ms,
+                "budget_ms": self.budget_ms, "changes": self.changes}
@@ -0,0 +1,125 @@
+"""Deterministic LCG random numbers
+
+``LCG`` produces exactly the sequence of ``lcg_random``/``lcg_randint``/
+``lcg_uniform`` in Wizerdbonk-3D.py, but keeps its state on the instance so
+independent generators (one per terrain chunk, say) do not disturb each
+other or the game's global sequence.
+
+Passing ``size`` draws a whole NumPy array of the sequence in one call: the
+k-th state is ``(A**k * state + C_k) % M``, and the (A**k, C_k) pairs are
+tabulated once, so a fill costs a few array operations instead of one
+interpreted call per number.  ``advance``/``fill`` do the same for arrays of
+states, one generator per element.
+
+``Streams`` hands out independent, named generators derived from one seed
+(spawns, particles, spell choices...), so a system that draws more or fewer
+numbers does not shift any other system's sequence.
+"""
+import zlib
+
+import numpy as np
+
+A, C, M = 1103515245, 12345, 2147483648
+_MASK = M - 1
+
+# (A**k % M, C_k % M) for k = 0, 1, ...; grown by doubling on demand
+_A_POW = np.array([1, A], np.uint64)
+_C_SUM = np.array([0, C], np.uint64)
+
+def _coefficients(n):
+    global _A_POW, _C_SUM
+    while len(_A_POW) <= n:
+        # k + j steps = j steps after k steps: A**j * (A**k * s + C_k) + C_j
+        a_k, c_k = _A_POW[-1], _C_SUM[-1]
+        a = (_A_POW[1:] * a_k) & np.uint64(_MASK)
+        c = (_A_POW[1:] * c_k + _C_SUM[1:]) & np.uint64(_MASK)
+        _A_POW, _C_SUM = np.concatenate([_A_POW, a]), np.concatenate([_C_SUM, c])
+    return _A_POW[:n + 1], _C_SUM[:n + 1]
+
+def advance(state, n):
+    """State(s) after ``n`` steps; ``state`` and ``n`` broadcast against each other"""
+    n = np.asarray(n, np.int64)
+    a, c = _coefficients(int(n.max(initial=0)))
+    state = np.asarray(state, np.int64).astype(np.uint64)
+    return ((a[n] * state + c[n]) & np.uint64(_MASK)).astype(np.int64)
+
+def fill(state, n):
+    """The next ``n`` states of each generator in ``state``, shape ``state.shape + (n,)``
+
+    Divide by ``M`` for the ``random()`` draws; the last column is the new state.
+    """
+    a, c = _coefficients(n)
+    state = np.asarray(state, np.int64).astype(np.uint64)[..., None]
+    return ((a[1:] * state + c[1:]) & np.uint64(_MASK)).astype(np.int64)
+
+def hash_seed(*values):
+    """Mix integers (a world seed, chunk coordinates...) into one LCG seed"""
+    h = 2166136261
+    for v in values:
+        h = ((h ^ (int(v) & 0xFFFFFFFF)) * 16777619) & 0xFFFFFFFF
+    return h % M
+
+def stream_seed(seed, name):
+    """Seed of the stream called ``name`` under ``seed``"""
+    return hash_seed(seed, zlib.crc32(name.encode()))
+
+class LCG:
+    def __init__(self, seed=123456):
+        self.state = seed % M
+
+    def random(self, size=None):
+        """One draw in [0, 1), or an array of the next ``size`` draws in sequence order"""
+        if size is None:
+            self.state = (A * self.state + C) % M
+            return self.state / M
+        shape = (size,) if np.ndim(size) == 0 else tuple(size)
+        states = fill(self.state, int(np.prod(shape)))
+        if states.size:
+            self.state = int(states[-1])
+        return (states / M).reshape(shape)
+
+    def randint(self, a, b, size=None):
+        if size is None:
+            return a + int(self.random() * (b - a + 1))
+        return a + (self.random(size) * (np.asarray(b) - a + 1)).astype(np.int64)
+
+    def uniform(self, a, b, size=None):
+        if size is None:
+            return a + self.random() * (b - a)
+        return a + self.random(size) * (np.asarray(b) - a)
+
+class Streams:
+    """Named ``LCG`` streams sharing one seed, created on first use
+
+    ``streams.spawns`` is the stream called "spawns".  The ``main`` stream
+    starts from the seed itself, the others from ``stream_seed(seed, name)``.
+    """
+    def __init__(self, seed=123456, main="world"):
+        self.seed, self.main = seed, main
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        stream = LCG(self.seed if name == self.main else stream_seed(self.seed, name))
+        setattr(self, name, stream)
+        return stream
+
+    def names(self):
+        return [name for name, value in vars(self).items() if isinstance(value, LCG)]
+
+    def states(self):
+        """``{name: state}`` of every stream created so far"""
+        return {name: getattr(self, name).state for name in self.names()}
+
+    def restore(self, seed, states):
+        """Return to a ``states()`` capture taken under ``seed``"""
+        self.reset(seed)
+        for name, state in states.items():
+            getattr(self, name).state = state
+
+    def reset(self, seed=None):
+        """Restart every stream, from ``seed`` when given"""
+        if seed is not None:
+            self.seed = seed
+        for name in self.names():
+            delattr(self, name)
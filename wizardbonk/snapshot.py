@@ -0,0 +1,119 @@
+"""Compact binary world-state snapshots
+
+A snapshot is a short header followed by one section per kind of state, each
+a packed NumPy structured array with a fixed dtype:
+
+    magic b"WBSN", version u16, section count u16
+    per section: name length u8, name, row count u32, rows
+
+Strings (enemy types, spells, zones...) are stored as small integer codes
+from the tables below.  ``unpack`` returns read-only views straight into the
+buffer, so decoding costs nothing beyond the header walk and the game only
+pays for rebuilding its objects.  No pickling is involved; a snapshot from
+an untrusted source can at worst fail to unpack.
+
+Wizerdbonk-3D.py builds the arrays in ``capture_snapshot()`` and applies them
+in ``restore_snapshot()``.
+"""
+import struct
+
+import numpy as np
+
+from wizardbonk.horde import ENEMY_DTYPE
+
+MAGIC, VERSION = b"WBSN", 1
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<I")
+
+# Code tables; a name's code is its index
+ENEMY_TYPES = ("base", "zombie", "skeleton", "creeper", "boss_slime", "boss_golem")
+PROJECTILE_TYPES = ("fireball", "bullet", "bullet_hell", "slime", "rock", "arrow", "lifesteal", "fire_step")
+OWNERS = ("player", "enemy")
+SPELLS = ("fireball", "fire_step", "bullet_hell", "lifesteal", "rock_armour")
+ZONES = ("overworld", "nether")
+PORTAL_STATES = ("inactive", "ignited", "open")
+GOLEM_STATES = ("chase", "dash")
+CAMERA_MODES = ("third", "first")
+BOSSES = ("slime", "golem")  # Bits of bosses_defeated
+
+STATE = np.dtype([
+    # Globals
+    ("frame", "<i8"), ("defeated_count", "<i8"), ("difficulty_multiplier", "<f8"),
+    ("game_over", "?"), ("game_won", "?"), ("paused", "?"), ("level_up_pending", "?"),
+    ("spell_choices", "i1", (3,)), ("bullet_hell_charges", "<i4"), ("bullet_hell_cooldown", "<i4"),
+    ("current_boss", "<i4"),  # Index into the enemies section, -1 for none
+    # Player
+    ("pos", "<f8", (3,)), ("knockback", "<f8", (2,)), ("facing_angle", "<f8"), ("speed", "<f8"),
+    ("max_health", "<f8"), ("health", "<f8"), ("xp", "<i8"), ("level", "<i4"),
+    ("boss_active", "?"), ("bosses_defeated", "u1"), ("attack_cooldown", "<i4"), ("attack_speed", "<i4"),
+    ("current_spell", "i1"), ("orbit_angle", "<f8"), ("rocks", "u1"),
+    # Camera (movement is relative to its heading)
+    ("camera_angle", "<f8", (2,)), ("camera_distance", "<f8"), ("camera_mode", "u1"),
+    # Portal and arena
+    ("portal", "i1"), ("portal_pos", "<f8", (3,)),  # portal: state code, -1 for none
+    ("zone", "u1"), ("terrain_zone", "u1"), ("terrain_seed", "<i8"), ("terrain_density", "<f8"),
+    ("rng_seed", "<i8"), ("horde_ticks", "<i8"),
+])
+
+ENEMY = np.dtype([
+    ("type", "u1"), ("active", "?"), ("pos", "<f8", (3,)), ("speed", "<f8"), ("health", "<f8"),
+    ("facing", "<f8"), ("cooldown", "<i4"), ("fuse", "<i4"), ("exploding", "?"), ("exploded", "?"),
+    ("state", "u1"), ("dash_timer", "<i4"),
+])
+PROJECTILE = np.dtype([("type", "u1"), ("owner", "u1"), ("active", "?"), ("pos", "<f8", (3,)), ("dir", "<f8", (3,))])
+SLIME_TRAIL = np.dtype([("pos", "<f8", (3,)), ("timer", "<i4")])
+FIRE_TRAIL = np.dtype([("pos", "<f8", (3,)), ("timer", "<i4"), ("damage", "<f8")])
+ORB = np.dtype([("pos", "<f8", (3,)), ("value", "<i4"), ("angle", "<f8")])
+PARTICLE = np.dtype([("pos", "<f8", (3,)), ("vel", "<f8", (3,)), ("color", "<f8", (3,)), ("life", "<i4"), ("size", "<f8")])
+HORDE = ENEMY_DTYPE
+RNG = np.dtype([("name", "S16"), ("state", "<i8")])
+
+SECTIONS = {
+    "state": STATE, "enemies": ENEMY, "projectiles": PROJECTILE, "slime_trails": SLIME_TRAIL,
+    "fire_trails": FIRE_TRAIL, "xp_orbs": ORB, "particles": PARTICLE, "horde": HORDE, "rng": RNG,
+}
+
+def empty(section, n):
+    return np.zeros(n, SECTIONS[section])
+
+def pack(sections):
+    """Serialise ``{name: structured array}`` into snapshot bytes"""
+    parts = [_HEADER.pack(MAGIC, VERSION, len(sections))]
+    for name, array in sections.items():
+        dtype = SECTIONS[name]
+        array = np.ascontiguousarray(array, dtype)
+        key = name.encode("ascii")
+        parts += [bytes([len(key)]), key, _SECTION.pack(len(array)), array.tobytes()]
+    return b"".join(parts)
+
+def unpack(data):
+    """``{name: structured array}`` views into snapshot bytes"""
+    data = memoryview(data)
+    magic, version, count = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Wizard Bonk snapshot")
+    if version != VERSION:
+        raise ValueError("Snapshot version %d, expected %d" % (version, VERSION))
+    offset, sections = _HEADER.size, {}
+    for _ in range(count):
+        size = data[offset]
+        name = bytes(data[offset + 1:offset + 1 + size]).decode("ascii")
+        offset += 1 + size
+        (rows,) = _SECTION.unpack_from(data, offset)
+        offset += _SECTION.size
+        dtype = SECTIONS.get(name)
+        if dtype is None:
+            raise ValueError("Unknown snapshot section %r" % name)
+        sections[name] = np.frombuffer(data, dtype, rows, offset)
+        offset += rows * dtype.itemsize
+    if offset != len(data):
+        raise ValueError("Snapshot has %d trailing bytes" % (len(data) - offset))
+    return sections
+
+def save(path, sections):
+    with open(path, "wb") as f:
+        f.write(pack(sections))
+
+def load(path):
+    with open(path, "rb") as f:
+        return unpack(f.read())
@@ -0,0 +1,164 @@
+"""Chunked streaming terrain for an unbounded arena
+
+The floor is cut into square chunks of ``chunk_tiles`` x ``chunk_tiles``
+checkerboard tiles.  Chunks within ``radius`` of the player's chunk are
+generated on demand, their floor baked into one interleaved position/colour
+VBO each, and the least recently used ones are evicted once more than
+``capacity`` are cached.  Obstacles are placed per chunk from an LCG seeded
+by (arena seed, chunk x, chunk y), so revisiting a chunk rebuilds the same
+layout.  The loaded set, and with it memory and draw cost, does not grow
+with distance travelled.
+
+``build(pos, zone, step)`` does the same work one chunk per step, for a work
+queue to spread over frames, and ``draw`` rebakes at most ``rebake_limit``
+already-uploaded floors per frame when the zone or tile merging changes,
+drawing the old floor meanwhile.
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+from OpenGL.GL import (
+    GL_COLOR_ARRAY, GL_FLOAT, GL_QUADS, GL_VERTEX_ARRAY,
+    glColorPointer, glDisableClientState, glDrawArrays, glEnableClientState, glVertexPointer,
+)
+from OpenGL.arrays import vbo
+
+from wizardbonk.rng import LCG, hash_seed
+
+# Checkerboard colours per zone: (even tile, odd tile)
+ZONE_COLORS = {
+    "overworld": ((0.1, 0.6, 0.1), (0.2, 0.8, 0.2)),
+    "nether": ((0.1, 0.1, 0.1), (0.8, 0.2, 0.0)),  # Black rock + glowing lava cracks
+}
+VERTEX_STRIDE = 6 * 4  # x, y, z, r, g, b as float32
+SPAWN_CLEARANCE = 200  # No obstacles this close to the origin, where the player respawns
+
+def bake_floor(cx, cy, chunk_tiles, tile, zone, step=1):
+    """Interleaved float32 GL_QUADS vertices for the floor of chunk (cx, cy)
+
+    ``step`` > 1 merges step x step tiles into one quad (a coarser checkerboard
+    for low quality tiers); it should divide ``chunk_tiles``.
+    """
+    i, j = np.meshgrid(np.arange(0, chunk_tiles, step), np.arange(0, chunk_tiles, step), indexing="ij")
+    gi, gj = (cx * chunk_tiles + i).ravel(), (cy * chunk_tiles + j).ravel()
+    x0, y0, size = gi * float(tile), gj * float(tile), float(tile * step)
+    corners = np.stack([
+        np.stack([x0, y0], -1), np.stack([x0 + size, y0], -1),
+        np.stack([x0 + size, y0 + size], -1), np.stack([x0, y0 + size], -1),
+    ], axis=1)  # (tiles, 4, 2)
+    colors = np.array(ZONE_COLORS.get(zone, ZONE_COLORS["nether"]))[(gi // step + gj // step) % 2]
+    out = np.zeros((len(gi), 4, 6), np.float32)
+    out[..., 0:2] = corners
+    out[..., 3:6] = colors[:, None, :]
+    return out.reshape(-1, 6)
+
+class Chunk:
+    def __init__(self, cx, cy, obstacles):
+        self.cx, self.cy, self.obstacles = cx, cy, obstacles
+        self.vbo, self.vbo_zone, self.vbo_step, self.count = None, None, 1, 0
+        self.baked = None  # (zone, step, vertices) baked ahead of the first draw
+
+class ChunkedTerrain:
+    def __init__(self, tile=50, chunk_tiles=10, radius=2, capacity=None, density=20.0 / (1800 * 1800)):
+        self.tile, self.chunk_tiles, self.radius = tile, chunk_tiles, radius
+        self.chunk_size = tile * chunk_tiles
+        self.capacity = capacity or (2 * radius + 3) ** 2
+        self.density = density  # Obstacles per square unit, as spawn_obstacles(20) over +-900
+        self.make_obstacle, self.seed, self.zone = None, 0, "overworld"
+        self.chunks = OrderedDict()
+        self.active = []
+        self.center = None
+        self.graveyard = []  # VBOs of evicted chunks, deleted on the next draw
+        self.rebake_limit = 4  # Stale floors rebaked per draw
+
+    def reset(self, seed, zone, make_obstacle):
+        """Start a new arena layout; ``make_obstacle(x, y, o_type, rng)`` builds obstacles"""
+        for chunk in self.chunks.values():
+            if chunk.vbo is not None: self.graveyard.append(chunk.vbo)
+        self.chunks.clear()
+        self.active, self.center = [], None
+        self.seed, self.zone, self.make_obstacle = seed, zone, make_obstacle
+
+    def discard(self):
+        """Forget every chunk; returns their VBOs (and pending deletions) for another terrain to delete"""
+        vbos = [chunk.vbo for chunk in self.chunks.values() if chunk.vbo is not None] + self.graveyard
+        self.chunks.clear()
+        self.active, self.center, self.graveyard = [], None, []
+        return vbos
+
+    def chunk_of(self, pos):
+        return int(math.floor(pos[0] / self.chunk_size)), int(math.floor(pos[1] / self.chunk_size))
+
+    def generate(self, cx, cy):
+        rng = LCG(hash_seed(self.seed, cx, cy))
+        expected = self.density * self.chunk_size * self.chunk_size
+        count = int(expected) + (1 if rng.random() < expected - int(expected) else 0)
+        type_pool = ["cube", "cylinder"]
+        if self.zone != "overworld": type_pool += ["spike", "spike"] # More spikes in Nether
+        obstacles = []
+        for _ in range(count):
+            x = cx * self.chunk_size + rng.randint(0, self.chunk_size - 1)
+            y = cy * self.chunk_size + rng.randint(0, self.chunk_size - 1)
+            o_type = type_pool[rng.randint(0, len(type_pool) - 1)]
+            if math.sqrt(x*x + y*y) > SPAWN_CLEARANCE:
+                obstacles.append(self.make_obstacle(x, y, o_type, rng))
+        return Chunk(cx, cy, obstacles)
+
+    def update(self, pos):
+        """Stream chunks around ``pos``; True when the active set changed"""
+        center = self.chunk_of(pos)
+        if center == self.center: return False
+        self.center = center
+        self.active = []
+        for dx in range(-self.radius, self.radius + 1):
+            for dy in range(-self.radius, self.radius + 1):
+                key = (center[0] + dx, center[1] + dy)
+                chunk = self.chunks.get(key)
+                if chunk is None: chunk = self.chunks[key] = self.generate(*key)
+                else: self.chunks.move_to_end(key)
+                self.active.append(chunk)
+        while len(self.chunks) > self.capacity:
+            _, old = self.chunks.popitem(last=False)
+            if old.vbo is not None: self.graveyard.append(old.vbo)
+        return True
+
+    def build(self, pos, zone, step=1):
+        """Generator version of ``update(pos)``: one chunk generated and its floor baked per step, nearest first"""
+        center = self.chunk_of(pos)
+        keys = sorted(
+            ((center[0] + dx, center[1] + dy) for dx in range(-self.radius, self.radius + 1)
+             for dy in range(-self.radius, self.radius + 1)),
+            key=lambda k: (k[0] - center[0]) ** 2 + (k[1] - center[1]) ** 2,
+        )
+        for key in keys:
+            if key not in self.chunks:
+                chunk = self.chunks[key] = self.generate(*key)
+                chunk.baked = zone, step, bake_floor(chunk.cx, chunk.cy, self.chunk_tiles, self.tile, zone, step)
+                yield
+        self.update(pos)
+
+    def obstacles(self):
+        return [o for chunk in self.active for o in chunk.obstacles]
+
+    def draw(self, zone, step=1):
+        for buffer in self.graveyard: buffer.delete()
+        self.graveyard = []
+        glEnableClientState(GL_VERTEX_ARRAY); glEnableClientState(GL_COLOR_ARRAY)
+        rebakes = 0
+        for chunk in self.active:
+            if chunk.vbo is None or chunk.vbo_zone != zone or chunk.vbo_step != step:
+                if chunk.baked is not None and chunk.baked[:2] == (zone, step): data = chunk.baked[2]
+                elif chunk.vbo is not None and rebakes >= self.rebake_limit: data = None # Stale floor until a later frame
+                else:
+                    data = bake_floor(chunk.cx, chunk.cy, self.chunk_tiles, self.tile, zone, step)
+                    if chunk.vbo is not None: rebakes += 1
+                if data is not None:
+                    if chunk.vbo is None: chunk.vbo = vbo.VBO(data)
+                    else: chunk.vbo.set_array(data)
+                    chunk.vbo_zone, chunk.vbo_step, chunk.count, chunk.baked = zone, step, len(data), None
+            with chunk.vbo:
+                glVertexPointer(3, GL_FLOAT, VERTEX_STRIDE, chunk.vbo)
+                glColorPointer(3, GL_FLOAT, VERTEX_STRIDE, chunk.vbo + 12)
+                glDrawArrays(GL_QUADS, 0, chunk.count)
+        glDisableClientState(GL_COLOR_ARRAY); glDisableClientState(GL_VERTEX_ARRAY)
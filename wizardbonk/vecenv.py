@@ -0,0 +1,389 @@
+"""Batched, GL-free simulation of the Wizerdbonk-3D.py combat loop
+
+``VecEnv`` holds N game instances in batched NumPy arrays and advances all of
+them with one ``step(actions)`` call, for training bots.  It covers the core
+loop of ``idle()``: movement against obstacles streamed in per chunk as in
+the game (``terrain.ChunkedTerrain``), knockback, auto-targeted fireballs,
+zombie/skeleton/creeper AI (``horde.step_enemies`` plus
+``crowd.separation``), arrows, creeper blasts, contact damage, waves and
+levelling.  Bosses, the portal, spell choices, trails and particles are not
+simulated, and kills award their XP immediately instead of dropping an orb.
+
+Run ``python -m wizardbonk.vecenv`` to compare batched stepping against
+stepping one instance at a time.
+"""
+import numpy as np
+
+from wizardbonk.crowd import separation
+from wizardbonk.horde import ACTIVE, CREEPER, DEPTH, EXPLODED, FIRED, HALF_WIDTH, HEALTH, step_enemies
+from wizardbonk.rng import M, advance, fill, stream_seed
+from wizardbonk.terrain import ChunkedTerrain
+
+# Player constants (Player.__init__)
+PLAYER_SPEED, PLAYER_RADIUS, MAX_HEALTH, ATTACK_SPEED = 5.0, 20.0, 200.0, 30
+SHOT_RANGE, SHOT_HEIGHT = 600.0, 40.0
+# Projectile kinds: speed, size, damage (Projectile.__init__)
+FIREBALL, ARROW = (10.0, 5.0, 20.0), (25.0, 3.0, 5.0)
+FREE, OWNER_PLAYER, OWNER_ENEMY = 0, 1, 2
+PROJECTILE_RANGE = 2000.0  # Projectiles expire this far from the player (Projectile.update)
+# Obstacle rows (x0, x1, y0, y1, height) past a row's own obstacles; nothing overlaps them
+NO_OBSTACLE = (np.inf, -np.inf, np.inf, -np.inf, -np.inf)
+
+# Action n: 0 stands still, 1..8 walk along the compass heading (n - 1) * 45 degrees
+MOVES = np.zeros((9, 2))
+MOVES[1:, 0] = np.cos(np.radians(np.arange(8) * 45.0 + 90.0))
+MOVES[1:, 1] = np.sin(np.radians(np.arange(8) * 45.0 + 90.0))
+MOVES = np.round(MOVES, 12) * PLAYER_SPEED
+
+PLAYER_FEATURES = ("x", "y", "health", "attack_cooldown", "level", "xp")
+ENEMY_FEATURES = ("dx", "dy", "distance", "kind", "health", "present")
+
+def _lcg(state, rows):
+    """Advance the per-instance LCG (lcg_random) for ``rows``, returns [0, 1) draws"""
+    state[rows] = advance(state[rows], 1)
+    return state[rows] / M
+
+def _obstacle_box(x, y, o_type, rng):
+    """Obstacle(x, y, o_type, rng) reduced to its AABB row, making the same draws"""
+    size, height = rng.randint(30, 60), rng.randint(40, 100)
+    if o_type == "spike": height, size = rng.randint(80, 150), 20
+    rng.random()  # colour
+    half = size / 2
+    return (x - half, x + half, y - half, y + half, height)
+
+def _pair_slots(free, want):
+    """Match the k-th True of each row of ``want`` with the k-th True of ``free``
+
+    Returns (rows, want_columns, free_columns); requests beyond a row's free
+    slots are dropped.
+    """
+    wr, wc = np.nonzero(want)
+    fr, fc = np.nonzero(free)
+    rank = np.arange(len(wr)) - np.searchsorted(wr, wr)
+    ok = rank < np.bincount(fr, minlength=free.shape[0])[wr]
+    first = np.searchsorted(fr, wr[ok])
+    return wr[ok], wc[ok], fc[first + rank[ok]]
+
+class VecEnv:
+    """N independent game instances stepped together
+
+    ``reset(seeds)`` and ``step(actions)`` return observation dicts of
+    float32 tensors: ``player`` is (N, len(PLAYER_FEATURES)) and ``enemies``
+    is (N, k_nearest, len(ENEMY_FEATURES)), nearest first, relative to the
+    player.  Instances that die are reset automatically, continuing their
+    own random sequence.
+    """
+    def __init__(self, num_envs, max_enemies=64, max_projectiles=32, obstacles=20, k_nearest=8, difficulty=1.0):
+        """``obstacles`` is the count per 1800 x 1800 area, as ``spawn_obstacles(count)``"""
+        n, e, p = num_envs, max_enemies, max_projectiles
+        self.num_envs, self.max_enemies, self.k_nearest, self.difficulty = n, e, k_nearest, difficulty
+        self.rows = np.arange(n)
+        self.rng = np.zeros(n, np.int64)  # World stream (arena seeds)
+        self.spawn_rng = np.zeros(n, np.int64)  # Spawns stream, as rng.Streams in the game
+        self.frame = np.zeros(n, np.int64)
+        # Player
+        self.player_pos = np.zeros((n, 2))
+        self.knockback = np.zeros((n, 2))
+        self.health = np.zeros(n)
+        self.attack_cooldown = np.zeros(n, np.int64)
+        self.level = np.ones(n, np.int64)
+        self.xp = np.zeros(n, np.int64)
+        # Enemies, same layout as horde.SharedHorde
+        self.enemy_pos = np.zeros((n, e, 2))
+        self.enemy_facing = np.zeros((n, e))
+        self.enemy_health = np.zeros((n, e))
+        self.enemy_cooldown = np.zeros((n, e), np.int32)
+        self.enemy_fuse = np.zeros((n, e), np.int32)
+        self.enemy_kind = np.zeros((n, e), np.int8)
+        self.enemy_flags = np.zeros((n, e), np.uint8)
+        # Projectiles
+        self.proj_pos = np.zeros((n, p, 3))
+        self.proj_dir = np.zeros((n, p, 3))
+        self.proj_stats = np.zeros((n, p, 3))  # speed, size, damage
+        self.proj_owner = np.zeros((n, p), np.int8)
+        # Obstacles of each instance's active chunks as (x0, x1, y0, y1, height), padded with NO_OBSTACLE
+        self.terrains = [
+            ChunkedTerrain(tile=50, chunk_tiles=10, radius=2, density=obstacles / (1800.0 * 1800.0))
+            for _ in range(n)
+        ]
+        self.chunk = np.zeros((n, 2), np.int64)  # Each terrain's centre chunk
+        self.obstacles = np.zeros((n, 0, 5))
+
+    # --- RESET ---
+    def reset(self, seeds=None):
+        """Reset every instance; ``seeds`` defaults to 123456 (the game's seed) for all"""
+        if seeds is None:
+            seeds = np.full(self.num_envs, 123456, np.int64)
+        self._reset_rows(self.rows, np.asarray(seeds, np.int64))
+        return self.observe()
+
+    def _reset_rows(self, rows, seeds=None):
+        if seeds is not None:
+            self.rng[rows] = seeds
+            self.spawn_rng[rows] = [stream_seed(seed, "spawns") for seed in seeds.tolist()]
+        self.frame[rows] = 0
+        self.player_pos[rows] = 0
+        self.knockback[rows] = 0
+        self.health[rows] = MAX_HEALTH
+        self.attack_cooldown[rows] = 0
+        self.level[rows] = 1
+        self.xp[rows] = 0
+        self.enemy_flags[rows] = 0
+        self.proj_owner[rows] = FREE
+        self._spawn_obstacles(rows)
+        self._spawn_wave(rows)
+
+    def _spawn_obstacles(self, rows):
+        # spawn_obstacles(count, respawn=True): a new arena seed from the world stream, chunks around the origin
+        seeds = np.floor(_lcg(self.rng, rows) * 2147483648).astype(np.int64)
+        for row, seed in zip(rows.tolist(), seeds.tolist()):
+            terrain = self.terrains[row]
+            terrain.reset(seed, "overworld", _obstacle_box)
+            terrain.update(self.player_pos[row])
+            self.chunk[row] = terrain.center
+        self._load_obstacles(rows)
+
+    def _update_terrain(self):
+        # update_terrain(): stream chunks for the instances whose player crossed into another chunk
+        chunk = np.floor(self.player_pos / self.terrains[0].chunk_size).astype(np.int64)
+        rows = self.rows[(chunk != self.chunk).any(axis=1)]
+        for row in rows.tolist():
+            self.terrains[row].update(self.player_pos[row])
+        self.chunk[rows] = chunk[rows]
+        self._load_obstacles(rows)
+
+    def _load_obstacles(self, rows):
+        boxes = [self.terrains[row].obstacles() for row in rows.tolist()]
+        width = max(map(len, boxes), default=0)
+        if width > self.obstacles.shape[1]:
+            grown = np.empty((self.num_envs, width, 5))
+            grown[:] = NO_OBSTACLE
+            grown[:, :self.obstacles.shape[1]] = self.obstacles
+            self.obstacles = grown
+        for row, box in zip(rows.tolist(), boxes):
+            self.obstacles[row] = NO_OBSTACLE
+            if box: self.obstacles[row, :len(box)] = box
+
+    def _spawn_wave(self, rows):
+        # spawn_wave(5 + level) around the player, capped at max_enemies
+        count = np.minimum(5 + self.level[rows], self.max_enemies)
+        self.enemy_flags[rows] = 0
+        # Every row's angle/distance/type draws in one fill, then each stream skips exactly what it used
+        most = int(count.max(initial=0))
+        draws = fill(self.spawn_rng[rows], 3 * most).reshape(len(rows), most, 3) / M
+        self.spawn_rng[rows] = advance(self.spawn_rng[rows], 3 * count)
+        r, k = np.nonzero(np.arange(most) < count[:, None])
+        sel = rows[r]
+        angle, dist, rtype = draws[r, k, 0] * 6.28, 600 + draws[r, k, 1] * 400, draws[r, k, 2]
+        kind = np.where(rtype < 0.5, 0, np.where(rtype < 0.8, 1, 2)).astype(np.int8)
+        self.enemy_pos[sel, k, 0] = self.player_pos[sel, 0] + np.cos(angle) * dist
+        self.enemy_pos[sel, k, 1] = self.player_pos[sel, 1] + np.sin(angle) * dist
+        self.enemy_facing[sel, k] = 0
+        self.enemy_health[sel, k] = HEALTH[kind]
+        self.enemy_cooldown[sel, k] = np.where(kind == 1, 100, 0)
+        self.enemy_fuse[sel, k] = 0
+        self.enemy_kind[sel, k] = kind
+        self.enemy_flags[sel, k] = ACTIVE
+
+    # --- STEP ---
+    def step(self, actions):
+        """Advance every instance one tick
+
+        ``actions`` holds one move index (see MOVES) per instance.  Returns
+        (observations, rewards, dones, infos): the reward is kills minus
+        damage taken as a fraction of max health, and ``infos`` is a dict of
+        per-instance arrays.
+        """
+        actions = np.asarray(actions, np.int64)
+        self.frame += 1
+        start_health = self.health.copy()
+        self._move_player(actions)
+        self._update_terrain()
+        self.attack_cooldown[self.attack_cooldown > 0] -= 1
+        self._player_attack()
+        self._update_enemies()
+        kills = self._update_projectiles()
+        self.xp += kills * 20
+        up = self.xp >= self.level * 100
+        self.xp[up] = 0
+        self.level[up] += 1
+        self.health[up] = MAX_HEALTH
+
+        cleared = ~((self.enemy_flags & ACTIVE) != 0).any(axis=1)
+        self._spawn_wave(self.rows[cleared])
+        damage = np.maximum(start_health - self.health, 0)
+        rewards = (kills - damage / MAX_HEALTH).astype(np.float32)
+        dones = self.health <= 0
+        infos = {"kills": kills, "damage": damage, "level": self.level.copy(), "frame": self.frame.copy()}
+        if dones.any():
+            dead = self.rows[dones]
+            self._reset_rows(dead)
+        return self.observe(), rewards, dones, infos
+
+    def _move_player(self, actions):
+        self.player_pos += self.knockback
+        self.knockback *= 0.8
+        moving = actions > 0
+        new = self.player_pos + MOVES[actions]
+        o = self.obstacles
+        r = PLAYER_RADIUS
+        blocked = (
+            (new[:, None, 0] - r <= o[..., 1]) & (new[:, None, 0] + r >= o[..., 0])
+            & (new[:, None, 1] - r <= o[..., 3]) & (new[:, None, 1] + r >= o[..., 2])
+        ).any(axis=1)
+        ok = moving & ~blocked
+        self.player_pos[ok] = new[ok]
+
+    def _enemy_distance(self):
+        d = np.hypot(*(self.enemy_pos - self.player_pos[:, None]).transpose(2, 0, 1))
+        d[(self.enemy_flags & ACTIVE) == 0] = np.inf
+        return d
+
+    def _player_attack(self):
+        d = self._enemy_distance()
+        nearest = np.argmin(d, axis=1)
+        shoot = (d[self.rows, nearest] < SHOT_RANGE) & (self.attack_cooldown <= 0)
+        self.attack_cooldown[shoot] = ATTACK_SPEED
+        rows, _, slots = _pair_slots(self.proj_owner == FREE, shoot[:, None])
+        target = self.enemy_pos[rows, nearest[rows]]
+        origin = np.column_stack([self.player_pos[rows], np.full(len(rows), SHOT_HEIGHT)])
+        delta = np.column_stack([target, np.zeros(len(rows))]) - origin
+        norm = np.linalg.norm(delta, axis=1)
+        norm[norm == 0] = 1
+        self._launch(rows, slots, origin, delta / norm[:, None], FIREBALL, OWNER_PLAYER)
+
+    def _launch(self, rows, slots, origin, direction, stats, owner):
+        self.proj_pos[rows, slots] = origin
+        self.proj_dir[rows, slots] = direction
+        self.proj_stats[rows, slots] = stats
+        self.proj_owner[rows, slots] = owner
+
+    def _update_enemies(self):
+        n, e = self.enemy_flags.shape
+        step_enemies(
+            self.enemy_pos.reshape(-1, 2), self.enemy_facing.reshape(-1), self.enemy_kind.reshape(-1),
+            self.enemy_flags.reshape(-1), self.enemy_cooldown.reshape(-1), self.enemy_fuse.reshape(-1),
+            np.repeat(self.player_pos, e, axis=0),
+        )
+        flags = self.enemy_flags
+        rows, cols = np.nonzero(flags & ACTIVE)
+        self.enemy_pos[rows, cols] += separation(self.enemy_pos[rows, cols], groups=rows)
+        reach = HALF_WIDTH + PLAYER_RADIUS
+        delta = self.player_pos[:, None] - self.enemy_pos
+        touch = (np.abs(delta[..., 0]) <= reach) & (np.abs(delta[..., 1]) <= reach)
+        blast = touch & ((flags & EXPLODED) != 0)
+        contact = touch & ((flags & ACTIVE) != 0) & (self.enemy_kind != CREEPER)
+        self.health -= (30 * blast.sum(axis=1) + 0.5 * contact.sum(axis=1)) * self.difficulty
+        # Knockback from the last creeper to go off, as in the object loop
+        rows = self.rows[blast.any(axis=1)]
+        last = e - 1 - np.argmax(blast[rows, ::-1], axis=1)
+        push = delta[rows, last]
+        mag = np.linalg.norm(push, axis=1)
+        hit = mag > 0
+        self.knockback[rows[hit]] = push[hit] / mag[hit, None] * 15
+        self.health = np.maximum(self.health, 0)
+
+        fired = (flags & FIRED) != 0
+        rows, cols, slots = _pair_slots(self.proj_owner == FREE, fired)
+        rad = np.radians(self.enemy_facing[rows, cols] + 90)
+        origin = np.column_stack([self.enemy_pos[rows, cols], np.full(len(rows), 50.0)])
+        direction = np.column_stack([np.cos(rad), np.sin(rad), np.zeros(len(rows))])
+        self._launch(rows, slots, origin, direction, ARROW, OWNER_ENEMY)
+
+    def _update_projectiles(self):
+        owner = self.proj_owner
+        speed, size, damage = self.proj_stats[..., 0], self.proj_stats[..., 1], self.proj_stats[..., 2]
+        self.proj_pos += self.proj_dir * speed[..., None]
+        pos = self.proj_pos
+        away = np.abs(pos[..., :2] - self.player_pos[:, None])
+        owner[(away[..., 0] > PROJECTILE_RANGE) | (away[..., 1] > PROJECTILE_RANGE)] = FREE
+
+        # Player shots: each hits the first live enemy it overlaps
+        live = (self.enemy_flags & ACTIVE) != 0
+        reach = size[..., None] + HALF_WIDTH
+        hits = (
+            (owner == OWNER_PLAYER)[..., None] & live[:, None, :]
+            & (np.abs(pos[..., None, 0] - self.enemy_pos[:, None, :, 0]) <= reach)
+            & (np.abs(pos[..., None, 1] - self.enemy_pos[:, None, :, 1]) <= reach)
+            & ((pos[..., 2] - size <= DEPTH) & (pos[..., 2] + size >= 0))[..., None]
+        )
+        rows, slots = np.nonzero(hits.any(axis=2))
+        cols = np.argmax(hits[rows, slots], axis=1)
+        np.add.at(self.enemy_health, (rows, cols), -damage[rows, slots])
+        owner[rows, slots] = FREE
+        dead = live & (self.enemy_health <= 0)
+        self.enemy_flags[dead] &= ~ACTIVE
+        kills = dead.sum(axis=1)
+
+        # Arrows against the player
+        reach = size + PLAYER_RADIUS
+        struck = (
+            (owner == OWNER_ENEMY)
+            & (np.abs(pos[..., 0] - self.player_pos[:, None, 0]) <= reach)
+            & (np.abs(pos[..., 1] - self.player_pos[:, None, 1]) <= reach)
+            & (pos[..., 2] - size <= 60) & (pos[..., 2] + size >= 0)
+        )
+        self.health = np.maximum(self.health - (damage * struck).sum(axis=1) * self.difficulty, 0)
+        owner[struck] = FREE
+
+        # Anything still in flight stops at obstacles
+        o = self.obstacles[:, None]
+        blocked = (
+            (pos[..., None, 0] - size[..., None] <= o[..., 1]) & (pos[..., None, 0] + size[..., None] >= o[..., 0])
+            & (pos[..., None, 1] - size[..., None] <= o[..., 3]) & (pos[..., None, 1] + size[..., None] >= o[..., 2])
+            & (pos[..., None, 2] - size[..., None] <= o[..., 4]) & (pos[..., None, 2] + size[..., None] >= 0)
+        ).any(axis=2)
+        owner[blocked] = FREE
+        return kills
+
+    # --- OBSERVATIONS ---
+    def observe(self):
+        n, k = self.num_envs, min(self.k_nearest, self.max_enemies)
+        d = self._enemy_distance()
+        nearest = np.argpartition(d, k - 1, axis=1)[:, :k] if k < d.shape[1] else np.argsort(d, axis=1)
+        nearest = np.take_along_axis(nearest, np.argsort(np.take_along_axis(d, nearest, 1), axis=1), 1)
+        dist = np.take_along_axis(d, nearest, 1)
+        present = np.isfinite(dist)
+        enemies = np.zeros((n, self.k_nearest, len(ENEMY_FEATURES)), np.float32)
+        rel = self.enemy_pos[self.rows[:, None], nearest] - self.player_pos[:, None]
+        enemies[:, :k, 0:2] = rel
+        enemies[:, :k, 2] = np.where(present, dist, 0)
+        enemies[:, :k, 3] = self.enemy_kind[self.rows[:, None], nearest]
+        enemies[:, :k, 4] = self.enemy_health[self.rows[:, None], nearest]
+        enemies[:, :k, 5] = present
+        enemies[:, :k][~present] = 0
+        player = np.column_stack([
+            self.player_pos, self.health / MAX_HEALTH, self.attack_cooldown / ATTACK_SPEED,
+            self.level, self.xp / (self.level * 100),
+        ]).astype(np.float32)
+        return {"player": player, "enemies": enemies}
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Batched vs one-at-a-time VecEnv throughput")
+    parser.add_argument("--envs", type=int, default=256)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args(argv)
+    actions = np.random.default_rng(0).integers(0, 9, (args.steps, args.envs))
+
+    batched = VecEnv(args.envs)
+    batched.reset(np.arange(args.envs) + 1)
+    t0 = time.perf_counter()
+    for a in actions:
+        batched.step(a)
+    batch_rate = args.envs * args.steps / (time.perf_counter() - t0)
+
+    singles = [VecEnv(1) for _ in range(args.envs)]
+    for i, env in enumerate(singles):
+        env.reset([i + 1])
+    t0 = time.perf_counter()
+    for a in actions:
+        for i, env in enumerate(singles):
+            env.step(a[i:i + 1])
+    single_rate = args.envs * args.steps / (time.perf_counter() - t0)
+    print("batched: %.0f steps/s  one-at-a-time: %.0f steps/s  speedup: %.1fx" % (
+        batch_rate, single_rate, batch_rate / single_rate))
+
+if __name__ == "__main__":
+    main()
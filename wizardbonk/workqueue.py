@@ -0,0 +1,69 @@
+"""Frame-budgeted work queue
+
+Bursty jobs (building a wave, generating and baking a new arena) are
+submitted as generators that do one slice of work per step.  ``run()`` is
+called once per frame and steps the oldest job until ``budget_ms`` is used
+up, always taking at least one step so queued work cannot starve.  A job's
+``commit`` callback runs after its last step, which is where staged results
+go live all at once: the player sees a whole wave or a whole arena appear,
+never half of one.
+
+Jobs finish in submission order.  ``tag`` groups jobs so callers can ask
+whether a kind of work is still in flight, or cancel it.
+"""
+import collections
+import time
+
+class Job:
+    __slots__ = ("steps", "commit", "tag")
+    def __init__(self, steps, commit, tag):
+        self.steps, self.commit, self.tag = steps, commit, tag
+
+class WorkQueue:
+    def __init__(self, budget_ms=2.0):
+        self.budget_ms = budget_ms
+        self.jobs = collections.deque()
+        self.last_ms, self.last_steps = 0.0, 0
+
+    def submit(self, steps, commit=None, tag=None):
+        """Queue ``steps`` (an iterable, usually a generator) and its ``commit`` callback"""
+        job = Job(iter(steps), commit, tag)
+        self.jobs.append(job)
+        return job
+
+    def pending(self, tag=None):
+        return any(tag is None or job.tag == tag for job in self.jobs)
+
+    def _step(self, job):
+        """Advance ``job`` one step; True once it has finished and committed"""
+        try:
+            next(job.steps)
+            return False
+        except StopIteration:
+            self.jobs.remove(job)
+            if job.commit is not None:
+                job.commit()
+            return True
+
+    def run(self, budget_ms=None):
+        """Step queued jobs, oldest first, for up to ``budget_ms``; returns the steps taken"""
+        start = time.perf_counter()
+        deadline = start + (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        steps = 0
+        while self.jobs:
+            self._step(self.jobs[0])
+            steps += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.last_ms, self.last_steps = (time.perf_counter() - start) * 1000.0, steps
+        return steps
+
+    def flush(self, tag=None):
+        """Finish every job (with ``tag``) now, committing in order"""
+        for job in [job for job in self.jobs if tag is None or job.tag == tag]:
+            while not self._step(job):
+                pass
+
+    def cancel(self, tag=None):
+        """Drop jobs (with ``tag``) without committing them"""
+        self.jobs = collections.deque(job for job in self.jobs if tag is not None and job.tag != tag)